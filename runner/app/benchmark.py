@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# End to end throughput benchmark of the runner, using the fake rcssserver and base team (app/fake).
+# It drives RunnerManager.add_game through the real entry points:
+#   fastapi  - POST /add_game on the FastApiApp (in process, over an ASGI transport)
+#   rabbitmq - RabbitMQConsumer.process_messages fed by an in memory broker stand-in
+# and records for every game the time from the message to the server process being spawned,
+# from spawn to the server exit and from the exit to the game_finished report.
+# Usage (from runner/app):
+#   python benchmark.py --mode fastapi --games 50 --max-games-count 8 --output fastapi.json
+#   python benchmark.py --mode rabbitmq --games 50 --compare fastapi.json
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import resource
+import shutil
+import tempfile
+import statistics
+from datetime import datetime, timezone
+
+import psutil
+
+from game_runner.runner_manager import RunnerManager
+from game_runner.fake_server import FakeServer
+from utils.messages import *
+
+
+API_KEY = 'benchmark'
+API_KEY_NAME = 'api-key'
+PHASES = ['message_to_spawn', 'spawn_to_exit', 'exit_to_report', 'message_to_report']
+
+
+class RecordingMessageSender:
+    """Stands in for MessageSender and records when each game is reported to the tournament manager."""
+
+    class Response:
+        status_code = 200
+        content = b'{"success": true}'
+
+    def __init__(self, manager_getter):
+        self.manager_getter = manager_getter
+        self.finished: dict[int, dict] = {}
+        self.events: dict[int, asyncio.Event] = {}
+
+    def get_event(self, game_id: int) -> asyncio.Event:
+        return self.events.setdefault(game_id, asyncio.Event())
+
+    async def send_message(self, route, message):
+        if route == 'from_runner/game_finished':
+            reported = time.monotonic()
+            # on_finished_game sends the report before it forgets the game
+            game = self.manager_getter().get_game_by_game_id(message['game_id'])
+            self.finished[message['game_id']] = {
+                'reported': reported,
+                'timestamps': dict(game.timestamps) if game is not None else {},
+            }
+            self.get_event(message['game_id']).set()
+        return RecordingMessageSender.Response()
+
+
+class LocalMessage:
+    """Minimal aio_pika IncomingMessage: process/ack/nack, a requeue goes back to the broker."""
+
+    def __init__(self, broker, body: bytes):
+        self.broker = broker
+        self.body = body
+        self.processed = False
+
+    def process(self, ignore_processed=False):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if not self.processed:
+            await self.ack()
+        return False
+
+    async def ack(self):
+        self.processed = True
+
+    async def nack(self, requeue=True):
+        self.processed = True
+        if requeue:
+            await self.broker.publish(self.body)
+
+
+class LocalBroker:
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def publish(self, body: bytes):
+        await self.queue.put(LocalMessage(self, body))
+
+
+def get_local_consumer_class():
+    from rabit_mq_app import RabbitMQConsumer
+
+    class LocalRabbitMQConsumer(RabbitMQConsumer):
+        def __init__(self, manager, broker: LocalBroker):
+            super().__init__(manager, 'localhost', 5672, 'benchmark', 'guest', 'guest')
+            self.broker = broker
+
+        async def connect(self):
+            pass
+
+        async def start_consuming(self):
+            while True:
+                await self.consume_shared_queue(await self.broker.queue.get())
+
+    return LocalRabbitMQConsumer
+
+
+class RssSampler:
+    """Samples the RSS of the runner process and of all its children (servers and teams)."""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_tree_rss = 0
+
+    def sample(self):
+        rss = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak_tree_rss = max(self.peak_tree_rss, rss)
+
+    async def run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+
+class Benchmark:
+    def __init__(self, args):
+        self.logger = logging.getLogger(__name__)
+        self.args = args
+        # a temporary data dir is removed after the run, the game logs and zips of all the games are in it
+        self.temporary_data_dir = args.data_dir is None
+        self.data_dir = args.data_dir or tempfile.mkdtemp(prefix='runner-benchmark-')
+        self.message_sender = RecordingMessageSender(lambda: self.manager)
+        self.manager = RunnerManager(
+            data_dir=self.data_dir,
+            storage_client=None,
+            message_sender=self.message_sender,
+            runner_id=1,
+            fake_server=FakeServer(duration=args.game_duration, rcg_size=args.rcg_size)
+        )
+        self.manager.set_available_games_count(args.max_games_count)
+        self.sent: dict[int, float] = {}
+        self.rejected = 0
+
+    def get_game_info(self, game_id: int) -> GameInfoMessage:
+        return GameInfoMessage(
+            game_id=game_id,
+            left_team_name=f'left{game_id}',
+            right_team_name=f'right{game_id}',
+            left_base_team_name='fake',
+            right_base_team_name='fake',
+            server_config=f'--server::half_time={self.args.half_time}'
+        )
+
+    async def drive_fastapi(self, game_id: int):
+        import httpx
+        from fast_api_app import FastApiApp
+
+        if not hasattr(self, 'client'):
+            app = FastApiApp(self.manager, API_KEY, API_KEY_NAME)
+            self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app.app), base_url='http://runner',
+                                            headers={API_KEY_NAME: API_KEY}, timeout=None)
+        while True:
+            self.sent[game_id] = time.monotonic()
+            response = await self.client.post('/add_game', json=self.get_game_info(game_id).model_dump())
+            if response.json().get('success'):
+                return
+            # the runner is full, the tournament manager would retry later
+            self.rejected += 1
+            await asyncio.sleep(0.1)
+
+    async def drive_rabbitmq(self, game_id: int):
+        self.sent[game_id] = time.monotonic()
+        await self.broker.publish(json.dumps(self.get_game_info(game_id).model_dump()).encode())
+
+    async def run_game(self, slots: asyncio.Semaphore, drive, game_id: int):
+        async with slots:
+            await drive(game_id)
+            try:
+                await asyncio.wait_for(self.message_sender.get_event(game_id).wait(), self.args.game_timeout)
+            except asyncio.TimeoutError:
+                self.logger.error(f'Game{game_id} was not reported in {self.args.game_timeout} seconds')
+
+    async def run(self) -> dict:
+        try:
+            return await self.run_games()
+        finally:
+            if self.temporary_data_dir:
+                shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    async def run_games(self) -> dict:
+        sampler = RssSampler()
+        sampler_task = asyncio.create_task(sampler.run())
+        consumer_task = None
+        if self.args.mode == 'rabbitmq':
+            self.broker = LocalBroker()
+            consumer = get_local_consumer_class()(self.manager, self.broker)
+            consumer_task = asyncio.create_task(consumer.run())
+            drive = self.drive_rabbitmq
+        else:
+            drive = self.drive_fastapi
+
+        # closed loop: never more games in flight than the runner has slots
+        slots = asyncio.Semaphore(self.args.max_games_count)
+        start = time.monotonic()
+        await asyncio.gather(*[self.run_game(slots, drive, game_id) for game_id in range(1, self.args.games + 1)])
+        wall_time = time.monotonic() - start
+
+        if consumer_task is not None:
+            self.manager.requested_command = RunnerCommandMessageEnum.STOP
+            await asyncio.wait_for(consumer_task, 5)
+        if hasattr(self, 'client'):
+            await self.client.aclose()
+        sampler.sample()
+        sampler_task.cancel()
+        return self.get_result(wall_time, sampler.peak_tree_rss)
+
+    def get_result(self, wall_time: float, peak_tree_rss: int) -> dict:
+        samples = {phase: [] for phase in PHASES}
+        for game_id, finished in self.message_sender.finished.items():
+            timestamps = finished['timestamps']
+            if 'spawned' not in timestamps or 'exited' not in timestamps:
+                continue
+            sent = self.sent[game_id]
+            samples['message_to_spawn'].append(timestamps['spawned'] - sent)
+            samples['spawn_to_exit'].append(timestamps['exited'] - timestamps['spawned'])
+            samples['exit_to_report'].append(finished['reported'] - timestamps['exited'])
+            samples['message_to_report'].append(finished['reported'] - sent)
+
+        completed = len(self.message_sender.finished)
+        return {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'mode': self.args.mode,
+            'games': self.args.games,
+            'completed': completed,
+            'failed': self.args.games - completed,
+            'rejected_add_game': self.rejected,
+            'max_games_count': self.args.max_games_count,
+            'game_duration': self.args.game_duration,
+            'rcg_size': self.args.rcg_size,
+            'wall_time': round(wall_time, 3),
+            'games_per_hour': round(completed / wall_time * 3600, 1) if wall_time > 0 else 0,
+            # ru_maxrss is in KB on linux
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'peak_tree_rss_mb': round(peak_tree_rss / 1024 / 1024, 1),
+            'phases': {phase: Benchmark.summarize(values) for phase, values in samples.items()},
+        }
+
+    @staticmethod
+    def summarize(values: list[float]) -> dict:
+        if not values:
+            return {'count': 0}
+        values = sorted(values)
+        return {
+            'count': len(values),
+            'mean': round(statistics.mean(values), 4),
+            'p50': round(values[len(values) // 2], 4),
+            'p95': round(values[min(len(values) - 1, int(len(values) * 0.95))], 4),
+            'max': round(values[-1], 4),
+        }
+
+
+def compare(result: dict, baseline: dict):
+    rows = [('games_per_hour', result['games_per_hour'], baseline.get('games_per_hour')),
+            ('peak_rss_mb', result['peak_rss_mb'], baseline.get('peak_rss_mb')),
+            ('peak_tree_rss_mb', result['peak_tree_rss_mb'], baseline.get('peak_tree_rss_mb'))]
+    for phase in PHASES:
+        rows.append((f'{phase}.p50', result['phases'][phase].get('p50'), baseline.get('phases', {}).get(phase, {}).get('p50')))
+        rows.append((f'{phase}.p95', result['phases'][phase].get('p95'), baseline.get('phases', {}).get(phase, {}).get('p95')))
+    for name, value, base in rows:
+        if value is None or not base:
+            print(f'{name:24} {value!s:>12} {"-":>12}')
+            continue
+        print(f'{name:24} {value:>12} {base:>12} {(value - base) / base * 100:+8.1f}%')
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Runner end to end throughput benchmark (fake rcssserver)")
+    parser.add_argument("--mode", choices=['fastapi', 'rabbitmq'], default='fastapi', help="Entry point used to add the games")
+    parser.add_argument("--games", type=int, default=20, help="Number of games to run")
+    parser.add_argument("--max-games-count", type=int, default=4, help="Slots of the runner")
+    parser.add_argument("--game-duration", type=float, default=2, help="Wall clock duration of a fake game (seconds)")
+    parser.add_argument("--rcg-size", type=int, default=1024 * 1024, help="Size of the fake rcg file (bytes)")
+    parser.add_argument("--half-time", type=int, default=300, help="server::half_time of the games")
+    parser.add_argument("--game-timeout", type=float, default=120, help="Give up waiting for a game after this many seconds")
+    parser.add_argument("--data-dir", type=str, help="Data directory of the runner (default: a temporary directory)")
+    parser.add_argument("--output", type=str, help="Write the JSON result to this file")
+    parser.add_argument("--compare", type=str, help="Print the difference to a previous JSON result")
+    return parser.parse_args()
+
+
+async def main():
+    args = get_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    result = await Benchmark(args).run()
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+    return 0 if result['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -1,5 +1,8 @@
 class DataDir:
     server_dir_name = "server"
+    server_versions_dir_name = "versions"
     base_team_dir_name = "baseteam"
     team_config_dir_name = "teamconfig"
-    game_log_dir_name = "gamelog"
\ No newline at end of file
+    game_log_dir_name = "gamelog"
+    download_metadata_file_name = "downloads.json"
+    locks_dir_name = "locks"
\ No newline at end of file
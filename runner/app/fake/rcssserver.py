@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# Stand-in for rcssserver, used for offline load testing of the runner (config: use_fake_server).
+# It accepts the same --server:: options ServerConfig.get_config emits plus --fake:: options:
+#   --fake::duration=<seconds>   wall clock duration of the whole match (default 10)
+#   --fake::rcg_size=<bytes>     approximate size of the written .rcg file (default 1MB)
+#   --fake::connect_delay=<sec>  delay before the players "connect" (default 0.5)
+#   --fake::seed=<int>           seed of the random result (default: random)
+# It starts team_l_start/team_r_start like the real server, prints the "player connected" lines,
+# writes incomplete.rcg while the match is running and renames it to
+# <time>-<left>_<score>[_<penalty>]-vs-<right>_<score>[_<penalty>].rcg at the end.
+# Monitors sending (dispinit version N) to server::port over UDP get a (show ...) frame per cycle.
+import os
+import re
+import sys
+import time
+import random
+import signal
+import socket
+import subprocess
+from datetime import datetime
+
+
+DEFAULT_OPTIONS = {
+    'server::auto_mode': 'false',
+    'server::synch_mode': 'false',
+    'server::game_log_dir': '.',
+    'server::text_log_dir': '.',
+    'server::half_time': '300',
+    'server::nr_normal_halfs': '2',
+    'server::nr_extra_halfs': '2',
+    'server::penalty_shoot_outs': 'true',
+    'server::extra_half_time': '100',
+    'server::port': '6000',
+    'server::coach_port': '6001',
+    'server::olcoach_port': '6002',
+    'fake::duration': '10',
+    'fake::rcg_size': str(1024 * 1024),
+    'fake::connect_delay': '0.5',
+    'fake::seed': '',
+}
+
+# rcssserver joins argv and parses it again, so a quoted value may be split over several args
+OPTION_PATTERN = re.compile(r"--((?:server|fake)::\w+)=(?:'([^']*)'|(\S*))")
+
+stopped = False
+
+
+def parse_options(argv):
+    options = dict(DEFAULT_OPTIONS)
+    for match in OPTION_PATTERN.finditer(' '.join(argv)):
+        options[match.group(1)] = match.group(2) if match.group(2) is not None else match.group(3)
+    return options
+
+
+def to_bool(value):
+    return str(value).lower() in {'true', '1', 'on'}
+
+
+def team_name(start_command, default):
+    match = re.search(r'-t\s+(\S+)', start_command or '')
+    return match.group(1) if match else default
+
+
+def start_team(start_command):
+    if not start_command:
+        return None
+    return subprocess.Popen(start_command, shell=True, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_team(process):
+    if process is None or process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=2)
+    except Exception:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except Exception:
+            pass
+
+
+def open_monitor_socket(port):
+    try:
+        monitor_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        monitor_socket.bind(('0.0.0.0', port))
+        monitor_socket.setblocking(False)
+        return monitor_socket
+    except OSError:
+        return None
+
+
+def accept_monitors(monitor_socket, monitors, server_param):
+    while monitor_socket is not None:
+        try:
+            data, address = monitor_socket.recvfrom(8192)
+        except (BlockingIOError, OSError):
+            return
+        if data.startswith(b'(dispinit') and address not in monitors:
+            monitors.append(address)
+            send_to_monitors(monitor_socket, [address], server_param)
+
+
+def send_to_monitors(monitor_socket, monitors, message):
+    for address in monitors:
+        try:
+            monitor_socket.sendto(message.encode() + b'\0', address)
+        except OSError:
+            pass
+
+
+def on_signal(signum, frame):
+    global stopped
+    stopped = True
+
+
+def main():
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+    options = parse_options(sys.argv[1:])
+    rnd = random.Random(int(options['fake::seed']) if options['fake::seed'] else None)
+
+    left_start = options.get('server::team_l_start')
+    right_start = options.get('server::team_r_start')
+    left_name = team_name(left_start, 'left')
+    right_name = team_name(right_start, 'right')
+
+    half_cycles = int(float(options['server::half_time']) * 10)
+    extra_half_cycles = int(float(options['server::extra_half_time']) * 10)
+    normal_cycles = half_cycles * int(options['server::nr_normal_halfs'])
+    extra_cycles = extra_half_cycles * int(options['server::nr_extra_halfs'])
+    penalty_shoot_outs = to_bool(options['server::penalty_shoot_outs'])
+    duration = float(options['fake::duration'])
+    rcg_size = int(options['fake::rcg_size'])
+
+    print('rcssserver-19.0.0 (fake)', flush=True)
+    print(f"Simulator Random Seed: {rnd.randint(0, 2 ** 31)}", flush=True)
+    print(f"Using simulator's random seed as Hetero Player Seed", flush=True)
+    print(f"wind factor: rand: 0.000000, vector: (0, 0)", flush=True)
+    print('', flush=True)
+    print('Hit CTRL-C to exit', flush=True)
+
+    teams = [start_team(left_start), start_team(right_start)]
+    time.sleep(float(options['fake::connect_delay']))
+    for name in (left_name, right_name):
+        for unum in range(1, 12):
+            print(f'A new (v18) player ({name} {unum}) connected.', flush=True)
+        print(f'A new (v18) online coach ({name}) connected.', flush=True)
+
+    # decide the result up front and spread the goals over the normal time
+    left_score = rnd.choice([0, 0, 1, 1, 2, 2, 3, 4, 5])
+    right_score = rnd.choice([0, 0, 1, 1, 2, 2, 3, 4, 5])
+    goals = sorted([(rnd.randint(1, max(normal_cycles, 1)), 'l') for _ in range(left_score)]
+                   + [(rnd.randint(1, max(normal_cycles, 1)), 'r') for _ in range(right_score)])
+    total_cycles = normal_cycles + (extra_cycles if left_score == right_score else 0)
+
+    game_log_dir = options['server::game_log_dir']
+    text_log_dir = options['server::text_log_dir']
+    os.makedirs(game_log_dir, exist_ok=True)
+    os.makedirs(text_log_dir, exist_ok=True)
+    rcg_path = os.path.join(game_log_dir, 'incomplete.rcg')
+    rcl_path = os.path.join(text_log_dir, 'incomplete.rcl')
+
+    header = (f'ULG5\n(server_param (half_time {options["server::half_time"]})'
+              f'(nr_normal_halfs {options["server::nr_normal_halfs"]})'
+              f'(nr_extra_halfs {options["server::nr_extra_halfs"]})'
+              f'(port {options["server::port"]}))\n(player_param (player_types 18))\n'
+              f'(playmode 0 before_kick_off)\n(team 0 {left_name} {right_name} 0 0)\n')
+    padding = max(0, (rcg_size - len(header)) // max(total_cycles, 1) - 40)
+    seconds_per_cycle = duration / max(total_cycles, 1)
+
+    monitor_socket = open_monitor_socket(int(options['server::port']))
+    monitors = []
+    server_param = f'(server_param (half_time {options["server::half_time"]}))'
+
+    scores = {'l': 0, 'r': 0}
+    start_time = time.monotonic()
+    cycle = 0
+    with open(rcg_path, 'w') as rcg, open(rcl_path, 'w') as rcl:
+        rcg.write(header)
+        rcg.write('(playmode 1 kick_off_l)\n')
+        while cycle < total_cycles and not stopped:
+            due_cycle = min(total_cycles, int((time.monotonic() - start_time) / seconds_per_cycle) + 1)
+            while cycle < due_cycle:
+                cycle += 1
+                while goals and goals[0][0] <= cycle:
+                    side = goals.pop(0)[1]
+                    scores[side] += 1
+                    rcg.write(f'(playmode {cycle} goal_{side})\n')
+                    rcg.write(f'(team {cycle} {left_name} {right_name} {scores["l"]} {scores["r"]})\n')
+                    rcl.write(f'{cycle},0\t(referee goal_{side}_{scores[side]})\n')
+                    rcg.write(f'(playmode {cycle} kick_off_{"r" if side == "l" else "l"})\n')
+                rcg.write(f'(show {cycle} ((b) 0 0 0 0) {"x" * padding})\n')
+            rcg.flush()
+            rcl.flush()
+            accept_monitors(monitor_socket, monitors, server_param)
+            send_to_monitors(monitor_socket, monitors,
+                             f'(show {cycle} (pm 2) (tm {left_name} {right_name} {scores["l"]} {scores["r"]}) ((b) 0 0 0 0))')
+            time.sleep(min(0.05, seconds_per_cycle))
+
+    for name in (left_name, right_name):
+        for unum in range(1, 12):
+            print(f'A player disconnected : ({name} {unum})', flush=True)
+    for team in teams:
+        stop_team(team)
+    if monitor_socket is not None:
+        monitor_socket.close()
+
+    if stopped:
+        print('Got signal, exiting before the end of the match.', flush=True)
+        return 0
+
+    left_penalty = right_penalty = None
+    if penalty_shoot_outs and scores['l'] == scores['r']:
+        left_penalty = rnd.randint(2, 5)
+        right_penalty = left_penalty + rnd.choice([-1, 1])
+
+    left_part = f'{left_name}_{scores["l"]}' + (f'_{left_penalty}' if left_penalty is not None else '')
+    right_part = f'{right_name}_{scores["r"]}' + (f'_{right_penalty}' if right_penalty is not None else '')
+    base_name = f'{datetime.now().strftime("%Y%m%d%H%M%S")}-{left_part}-vs-{right_part}'
+    os.replace(rcg_path, os.path.join(game_log_dir, f'{base_name}.rcg'))
+    os.replace(rcl_path, os.path.join(text_log_dir, f'{base_name}.rcl'))
+    print(f'Game log: {base_name}.rcg', flush=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
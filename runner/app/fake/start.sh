@@ -0,0 +1,21 @@
+#!/bin/sh
+# Stand-in for a base team start.sh, used together with fake/rcssserver.py (config: use_fake_server).
+# Accepts the same arguments as the real base teams (-p port -t team_name -c config_dir -j json -e mode)
+# and just stays alive until the fake server stops it.
+
+port=6000
+team_name=fake
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -p) port="$2"; shift 2 ;;
+        -t) team_name="$2"; shift 2 ;;
+        -c|-j|-e) shift 2 ;;
+        *) shift ;;
+    esac
+done
+
+echo "fake team $team_name connecting to port $port"
+trap 'exit 0' TERM INT
+while true; do
+    sleep 1
+done
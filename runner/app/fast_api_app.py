@@ -1,6 +1,13 @@
-from fastapi import FastAPI, HTTPException, Security, Depends
+from fastapi import FastAPI, HTTPException, Security, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from typing import Optional
+import os
+import asyncio
+import contextlib
 import uvicorn
 from game_runner.runner_manager import RunnerManager
+from game_runner.game_log_files import GameLogFiles
+from game_runner.game_metrics import GameMetrics
 from fastapi.security.api_key import APIKeyHeader
 from starlette.status import HTTP_403_FORBIDDEN
 from utils.messages import *
@@ -11,6 +18,16 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     handlers=[logging.StreamHandler()]
 )
+class Server(uvicorn.Server):
+    # SIGINT/SIGTERM are handled in main.py (SIGTERM drains the runner), uvicorn must not take them over
+    def install_signal_handlers(self):
+        pass
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        yield
+
+
 class FastApiApp:
     def __init__(self, manager: RunnerManager, api_key: str, api_key_name: str = "api_key", port: int = 8000):
         self.logger = logging.getLogger(__name__)
@@ -19,6 +36,8 @@ class FastApiApp:
         self.api_key = api_key
         self.api_key_name = api_key_name
         self.port = port
+        self.server = None
+        self.keep_alive_interval = 15
         self.setup_routes()
         self.logger.info("Runner FastApiApp initialized")
 
@@ -32,6 +51,21 @@ class FastApiApp:
                 raise HTTPException(
                     status_code=HTTP_403_FORBIDDEN, detail="Could not validate credentials"
                 )
+        async def get_api_key_or_query(request: Request):
+            # log viewers may only be able to pass the key in the url
+            api_key = request.headers.get(self.api_key_name) or request.query_params.get(self.api_key_name)
+            if api_key == self.api_key:
+                return api_key
+            raise HTTPException(
+                status_code=HTTP_403_FORBIDDEN, detail="Could not validate credentials"
+            )
+
+        def is_game_live(game_id: int):
+            for game in self.manager.games.values():
+                if game.game_info.game_id == game_id:
+                    return game.status in ('starting', 'running')
+            return False
+
         @self.app.get("/")
         def read_root():
             return {"message": "Hello World"}
@@ -40,6 +74,109 @@ class FastApiApp:
         def get_games(api_key: str = Depends(get_api_key)):
             return self.manager.get_games()
 
+        @self.app.get("/games/events")
+        async def game_events(request: Request, game_id: Optional[int] = None, api_key: str = Depends(get_api_key)):
+            """Server-sent events of the games: a snapshot of every running game, then their lifecycle events"""
+            queue = self.manager.event_bus.subscribe()
+
+            def to_sse(event: GameEventMessage):
+                return f'event: {event.event.value}\ndata: {event.model_dump_json()}\n\n'
+
+            async def stream():
+                try:
+                    for game in list(self.manager.games.values()):
+                        if game_id is None or game.game_info.game_id == game_id:
+                            yield to_sse(game.to_event(GameEventEnum.SNAPSHOT))
+                    while not await request.is_disconnected():
+                        try:
+                            event = await asyncio.wait_for(queue.get(), self.keep_alive_interval)
+                        except asyncio.TimeoutError:
+                            yield ': keep-alive\n\n'
+                            continue
+                        if game_id is None or event.game_id == game_id:
+                            yield to_sse(event)
+                finally:
+                    self.manager.event_bus.unsubscribe(queue)
+
+            return StreamingResponse(stream(), media_type='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+        @self.app.websocket("/games/{game_id}/monitor")
+        async def game_monitor(websocket: WebSocket, game_id: int):
+            """Live monitor frames of a game (rcssserver monitor protocol v5), one text message per frame"""
+            # browsers can not set headers on a websocket, the key may also come as a query parameter
+            api_key = websocket.headers.get(self.api_key_name) or websocket.query_params.get(self.api_key_name)
+            if api_key != self.api_key:
+                await websocket.close(code=1008, reason="Could not validate credentials")
+                return
+            game = self.manager.get_game_by_game_id(game_id)
+            if game is None:
+                await websocket.close(code=1008, reason="Game not found")
+                return
+            await websocket.accept()
+            try:
+                init_frames, queue = await self.manager.monitor_proxy.subscribe(game_id, game.port)
+            except Exception as e:
+                self.logger.error(f"Monitor of game {game_id} failed: {str(e)}")
+                await websocket.close(code=1011, reason=str(e))
+                return
+            try:
+                for frame in init_frames:
+                    await websocket.send_text(frame)
+                while True:
+                    frame = await queue.get()
+                    if frame is None:
+                        break
+                    await websocket.send_text(frame)
+                await websocket.close()
+            except WebSocketDisconnect:
+                pass
+            finally:
+                self.manager.monitor_proxy.unsubscribe(game_id, queue)
+
+        @self.app.get("/games/{game_id}/logs", response_model=GetGameLogFilesResponse)
+        def get_game_log_files(game_id: int, api_key: str = Depends(get_api_key_or_query)):
+            """Files of the game log dir of a running or recent game"""
+            files = GameLogFiles.list_files(self.manager.data_dir, game_id)
+            if files is None:
+                raise HTTPException(status_code=404, detail="Game logs not found")
+            return GetGameLogFilesResponse(game_id=game_id, live=is_game_live(game_id), files=files)
+
+        @self.app.get("/games/{game_id}/logs/{file_name}")
+        async def get_game_log_file(request: Request, game_id: int, file_name: str, follow: bool = False,
+                                    api_key: str = Depends(get_api_key_or_query)):
+            """
+            A file of the game log dir ('rcg' / 'rcl' for the game / text log), with Range support.
+            With follow=true the response goes on with what the server appends until the game is over.
+            """
+            path = GameLogFiles.get_path(self.manager.data_dir, game_id, file_name)
+            try:
+                f = open(path, 'rb') if path is not None else None
+            except FileNotFoundError:  # renamed at the end of the game
+                f = None
+            if f is None:
+                raise HTTPException(status_code=404, detail="Game log file not found")
+            size = os.fstat(f.fileno()).st_size
+            headers = {'Accept-Ranges': 'bytes', 'Cache-Control': 'no-cache'}
+            if follow:
+                start = GameLogFiles.get_follow_start(request.headers.get('range'), size)
+                headers['X-Start-Offset'] = str(start)
+                return StreamingResponse(
+                    GameLogFiles.follow(f, start, lambda: is_game_live(game_id), request.is_disconnected),
+                    media_type='application/octet-stream', headers=headers)
+            try:
+                byte_range = GameLogFiles.parse_range(request.headers.get('range'), size)
+            except ValueError as e:
+                f.close()
+                raise HTTPException(status_code=416, detail=str(e), headers={'Content-Range': f'bytes */{size}'})
+            start, end = byte_range if byte_range is not None else (0, size - 1)
+            headers['Content-Length'] = str(end - start + 1)
+            status_code = 200
+            if byte_range is not None:
+                status_code = 206
+                headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+            return StreamingResponse(GameLogFiles.read(f, start, end), status_code=status_code,
+                                     media_type='application/octet-stream', headers=headers)
+
         @self.app.post("/add_game")
         async def add_game(message_json: GameInfoMessage, api_key: str = Depends(get_api_key)):
             try:
@@ -76,6 +213,21 @@ class FastApiApp:
         async def get_runner_status(api_key: str = Depends(get_api_key)):
             return self.manager.status
 
+        @self.app.get("/metrics", response_class=PlainTextResponse)
+        def get_metrics(api_key: str = Depends(get_api_key_or_query)):
+            """Phase durations of the games in the Prometheus text format"""
+            return PlainTextResponse(self.manager.metrics.to_prometheus(self.manager.get_gauges()),
+                                     media_type=GameMetrics.content_type)
+
+        @self.app.get("/runner/metrics")
+        def get_runner_metrics(api_key: str = Depends(get_api_key)):
+            # the same metrics as json, summed up by the supervisor of the worker processes
+            return {**self.manager.metrics.to_dict(), 'gauges': self.manager.get_gauges()}
+
+        @self.app.get("/runner/tasks", response_model=GetGameTasksResponse)
+        def get_game_tasks(api_key: str = Depends(get_api_key)):
+            return self.manager.get_game_tasks()
+
         @self.app.post("/update_base/from_url")
         async def update_base(
             message_json: UpdateBaseFromURLRequestMessage,
@@ -123,5 +275,9 @@ class FastApiApp:
         
     async def run(self):
         config = uvicorn.Config(self.app, host="0.0.0.0", port=self.port)
-        server = uvicorn.Server(config)
-        await server.serve()
\ No newline at end of file
+        self.server = Server(config)
+        await self.server.serve()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.should_exit = True
\ No newline at end of file
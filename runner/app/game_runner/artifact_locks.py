@@ -0,0 +1,57 @@
+import os
+import asyncio
+from utils.file_lock import FileLock
+
+
+class ArtifactLock:
+    # the asyncio lock serializes the games of this process, the file lock the worker processes of the host
+    def __init__(self, lock: asyncio.Lock, file_lock: FileLock = None):
+        self.lock = lock
+        self.file_lock = file_lock
+
+    async def __aenter__(self):
+        await self.lock.acquire()
+        if self.file_lock is not None:
+            try:
+                await self.file_lock.__aenter__()
+            except BaseException:
+                self.lock.release()
+                raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.file_lock is not None:
+            self.file_lock.release()
+        self.lock.release()
+
+
+class ArtifactLocks:
+    # one lock per on-disk artifact (server, base team, team config, ...), shared by every game
+    # so two games that need the same artifact do not download/unzip it at the same time
+    locks: dict[str, asyncio.Lock] = {}
+    # set when the data dir is shared by several worker processes (see HostRegistry)
+    lock_dir: str = None
+
+    @staticmethod
+    def get(kind: str, name) -> ArtifactLock:
+        key = f'{kind}/{name}'
+        lock = ArtifactLocks.locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            ArtifactLocks.locks[key] = lock
+        file_lock = None
+        if ArtifactLocks.lock_dir is not None:
+            file_lock = FileLock(os.path.join(ArtifactLocks.lock_dir, kind, f'{name}.lock'))
+        return ArtifactLock(lock, file_lock)
+
+    @staticmethod
+    def base_team(base_team_name: str) -> ArtifactLock:
+        return ArtifactLocks.get('baseteam', base_team_name)
+
+    @staticmethod
+    def server(version: str) -> ArtifactLock:
+        return ArtifactLocks.get('server', version)
+
+    @staticmethod
+    def team_config(team_config_id: int) -> ArtifactLock:
+        return ArtifactLocks.get('teamconfig', team_config_id)
@@ -0,0 +1,15 @@
+import os
+
+
+class FakeServer:
+    # stand-ins for rcssserver and the base teams' start.sh (see fake/), used for offline load testing
+    dir_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fake')
+    server_path = os.path.join(dir_path, 'rcssserver.py')
+    team_start_path = os.path.join(dir_path, 'start.sh')
+
+    def __init__(self, duration: float = 10, rcg_size: int = 1024 * 1024):
+        self.duration = duration
+        self.rcg_size = rcg_size
+
+    def get_config(self):
+        return f'--fake::duration={self.duration} --fake::rcg_size={self.rcg_size} '
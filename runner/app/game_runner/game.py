@@ -1,4 +1,6 @@
 import os
+import re
+import time
 import logging
 from utils.tools import Tools
 import asyncio
@@ -7,10 +9,28 @@ from data_dir import DataDir
 from subprocess import PIPE
 from utils.messages import *
 from storage.downloader import Downloader
+from game_runner.artifact_locks import ArtifactLocks
+from game_runner.fake_server import FakeServer
+from game_runner.game_watchdog import GameWatchdog, WatchdogConfig
+from game_runner.game_log_follower import GameLogFollower
+from game_runner.game_events import GameEventBus
+from game_runner.server_presets import ServerPreset, ServerPresets
+from game_runner.server_cache import ServerCache
+from datetime import datetime, timezone
 
 
 class ServerConfig:
-    def __init__(self, config: str, game_info: GameInfoMessage, data_dir: str, port: int, logger):
+    # rcssserver defaults of the game length options a preset does not set
+    server_defaults = {
+        'half_time': '300',
+        'nr_normal_halfs': '2',
+        'nr_extra_halfs': '2',
+        'extra_half_time': '100',
+        'penalty_shoot_outs': 'true',
+    }
+
+    def __init__(self, config: str, game_info: GameInfoMessage, data_dir: str, port: int, logger,
+                 preset: ServerPreset, fake_server: FakeServer = None):
         self.auto_mode = True
         self.synch_mode = True
         self.game_id = game_info.game_id
@@ -20,14 +40,21 @@ class ServerConfig:
                                             game_info.left_base_team_name, 'start.sh')
         self.right_team_start = os.path.join(data_dir, DataDir.base_team_dir_name,
                                              game_info.right_base_team_name, 'start.sh')
-        
+        self.fake_server = fake_server
+        if fake_server is not None:
+            self.left_team_start = FakeServer.team_start_path
+            self.right_team_start = FakeServer.team_start_path
+
         self.game_log_dir = os.path.join(data_dir, DataDir.game_log_dir_name, f'{self.game_id}')
         self.text_log_dir = os.path.join(self.game_log_dir)
         self.port = port
         self.coach_port = port + 1
         self.online_coach_port = port + 2
         os.makedirs(self.game_log_dir, exist_ok=True)
-        self.other_config = config
+        self.preset = preset
+        # the game's server_config overrides the preset, it is validated like the presets
+        self.other_params = ServerPresets.parse_server_config(config)
+        self.params = {**preset.params, **self.other_params}
         self.logger = logger
 
         self.left_team_config_id_path = None
@@ -86,18 +113,21 @@ class ServerConfig:
 
         res += f'--server::game_log_dir={self.game_log_dir} '
         res += f'--server::text_log_dir={self.text_log_dir} '
-        res += '--server::half_time=100 '
-        res += '--server::nr_normal_halfs=2 '
-        res += '--server::nr_extra_halfs=0 '
-        res += '--server::penalty_shoot_outs=0 '
+        if self.preset.command_line:
+            res += self.preset.command_line + ' '
         res += '--server::port=' + str(self.port) + ' '
         res += '--server::coach_port=' + str(self.coach_port) + ' '
         res += '--server::olcoach_port=' + str(self.online_coach_port) + ' '
-        if self.other_config:
-            res += self.other_config
+        for name, value in self.other_params.items():
+            res += f'--server::{name}={value} '
+        if self.fake_server is not None:
+            res += ' ' + self.fake_server.get_config()
         self.logger.debug(f'Server config: {res}')
         return res
 
+    def get_server_param(self, name: str):
+        return self.params.get(name, ServerConfig.server_defaults.get(name))
+
     def __str__(self):
         return self.get_config()
 
@@ -106,11 +136,17 @@ class ServerConfig:
 
 
 class Game:
-    def __init__(self, game_info: GameInfoMessage, port: int, data_dir: str, storage_client: StorageClient):
+    player_connected_pattern = re.compile(r'A new \(v\d+\) player \((\S+) \d+\) connected\.')
+
+    def __init__(self, game_info: GameInfoMessage, port: int, data_dir: str, storage_client: StorageClient,
+                 server_preset: ServerPreset, fake_server: FakeServer = None,
+                 watchdog_config: WatchdogConfig = None, server_cache: ServerCache = None):
         self.logger = logging.getLogger(f'Game{game_info.game_id}')
         self.logger.info(f'Game created: {game_info}')
         self.game_info: GameInfoMessage = game_info
-        self.server_config = ServerConfig(game_info.server_config, game_info, data_dir, port, self.logger)
+        self.fake_server = fake_server
+        self.server_config = ServerConfig(game_info.server_config, game_info, data_dir, port, self.logger,
+                                          server_preset, fake_server)
         self.port = port
         self.data_dir = data_dir
         self.finished_event = None
@@ -118,6 +154,24 @@ class Game:
         self.storage_client = storage_client
         self.status = 'starting'
         self.game_result = [-1, -1, -1, -1]
+        self.error = None
+        self.watchdog_config = watchdog_config
+        self.server_cache = server_cache
+        self.server_path = os.path.join(data_dir, DataDir.server_dir_name, 'rcssserver')
+        self.event_bus: GameEventBus = None
+        self.cycle = 0
+        self.score = [0, 0]
+        self.connected_players = {game_info.left_team_name: 0, game_info.right_team_name: 0}
+        self.timestamps: dict[str, float] = {}  # time.monotonic() of the game lifecycle events
+        self.operations: list[tuple[str, str, float]] = []  # (artifact, operation, seconds) done for the game
+
+    def mark(self, name: str):
+        # the phases of GameMetrics are measured between these marks
+        self.timestamps[name] = time.monotonic()
+
+    def add_operation(self, artifact: str, operation: str, started: float):
+        # called from the worker threads of check(), list.append is atomic
+        self.operations.append((artifact, operation, time.monotonic() - started))
 
     def check_base_team(self, base_team_name: str):
         base_teams_dir = os.path.join(self.data_dir, DataDir.base_team_dir_name)
@@ -148,6 +202,7 @@ class Game:
 
         base_team_zip_path = os.path.join(base_teams_dir, f'{base_team_name}.zip')
         self.logger.debug(f'Downloading base team {base_team_name} from storage')
+        started = time.monotonic()
         zip_file_downloaded = False
         if self.storage_client is not None and self.storage_client.check_connection():
             if self.storage_client.download_file(self.storage_client.base_team_bucket_name,
@@ -168,13 +223,12 @@ class Game:
                 self.logger.error(f'Base team {base_team_name} not found')
 
         if zip_file_downloaded:
+            self.add_operation('base_team', 'download', started)
             self.logger.debug(f'Unzip base team {base_team_name}')
-            Tools.unzip_file(base_team_zip_path, base_teams_dir)
+            started = time.monotonic()
+            Tools.unzip_file(base_team_zip_path, base_teams_dir, Tools.base_team_file_mode)
             os.remove(base_team_zip_path)
-
-        if os.path.exists(os.path.join(base_team_path)):
-            self.logger.debug(f'Setting permissions for base team {base_team_name}')
-            Tools.set_permissions_recursive(base_team_path, 0o777)
+            self.add_operation('base_team', 'unzip', started)
 
         self.logger.debug(f'Check base team {base_team_name} start.sh')
         if not os.path.exists(os.path.join(base_team_path, 'start.sh')):
@@ -190,40 +244,134 @@ class Game:
         if not os.path.exists(team_config_dir):
             if self.storage_client is not None and self.storage_client.check_connection():
                 team_config_zip_path = os.path.join(team_configs_dir, f'{team_config_id}.zip')
+                started = time.monotonic()
                 self.storage_client.download_file(self.storage_client.team_config_bucket_name,
                                                   str(team_config_id), team_config_zip_path)
+                self.add_operation('team_config', 'download', started)
+                started = time.monotonic()
                 Tools.unzip_file(team_config_zip_path, team_configs_dir)
                 os.remove(team_config_zip_path)
+                self.add_operation('team_config', 'unzip', started)
             else:
                 self.logger.error(f'Storage connection error, team config {team_config_id} not found')
                 raise FileNotFoundError(f'Team config {team_config_id} not found')
 
-    def check(self):
-        self.check_base_team(self.game_info.left_base_team_name)
-        self.check_base_team(self.game_info.right_base_team_name)
-        if self.game_info.left_team_config_id is not None:
-            self.check_team_config(self.game_info.left_team_config_id)
-        if self.game_info.right_team_config_id is not None:
-            self.check_team_config(self.game_info.right_team_config_id)
+    async def prepare_base_team(self, base_team_name: str):
+        async with ArtifactLocks.base_team(base_team_name):
+            await asyncio.to_thread(self.check_base_team, base_team_name)
+
+    async def prepare_team_config(self, team_config_id: int):
+        async with ArtifactLocks.team_config(team_config_id):
+            await asyncio.to_thread(self.check_team_config, team_config_id)
+
+    async def prepare_server(self):
+        if self.server_cache is not None:
+            version = self.server_cache.resolve(self.game_info.server_version)
+            fetched = version is not None and not self.server_cache.is_installed(version)
+            started = time.monotonic()
+            self.server_path = await self.server_cache.prepare(version)
+            if fetched:
+                self.add_operation('server', 'download', started)
+            self.logger.debug(f'Server: {self.server_path}')
+
+    async def check(self):
+        self.mark('check_begin')
+        try:
+            await self.prepare()
+        finally:
+            self.mark('check_end')
+
+    async def prepare(self):
+        self.publish(GameEventEnum.PREPARING)
+        if self.fake_server is not None:
+            self.logger.debug('Fake server, nothing to prepare')
+            return
+        # prepare every artifact concurrently, blocking downloads/unzips run in worker threads
+        # and the same artifact is never prepared twice at the same time
+        base_team_names = {self.game_info.left_base_team_name, self.game_info.right_base_team_name}
+        team_config_ids = {self.game_info.left_team_config_id, self.game_info.right_team_config_id} - {None}
+        self.logger.debug(f'Check base teams {base_team_names}, team configs {team_config_ids}')
+        await asyncio.gather(
+            self.prepare_server(),
+            *[self.prepare_base_team(base_team_name) for base_team_name in base_team_names],
+            *[self.prepare_team_config(team_config_id) for team_config_id in team_config_ids]
+        )
 
     async def run_game(self):
-        server_path = os.path.join(self.data_dir, DataDir.server_dir_name, 'rcssserver')
+        server_path = self.server_path
+        if self.fake_server is not None:
+            server_path = FakeServer.server_path
         command = f'{server_path} {self.server_config.get_config()}'
         self.logger.debug(f'Run command: {command}')
 
+        # an exception reaches the task of the game (GameTaskSupervisor), it releases the slot
+        self.process = await asyncio.create_subprocess_shell(
+            command,
+            stdout=PIPE,
+            stderr=PIPE
+        )
+        self.mark('spawned')
+        self.status = 'running'
+        self.publish(GameEventEnum.SPAWNED)
+
+        follower_task = asyncio.create_task(GameLogFollower(
+            self.server_config.game_log_dir, self.on_cycle, self.on_score).run())
+        watchdog = None
+        watchdog_task = None
+        if self.watchdog_config is not None:
+            watchdog = GameWatchdog(self, self.watchdog_config)
+            watchdog_task = asyncio.create_task(watchdog.run())
         try:
-            self.process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=PIPE,
-                stderr=PIPE
+            out, err, _ = await asyncio.gather(
+                self.read_stream(self.process.stdout, self.on_server_output),
+                self.read_stream(self.process.stderr),
+                self.process.wait()
             )
-
-            out, err = await self.process.communicate()
-            exit_code = self.process.returncode
-
-            await self.finished_game(out, err, exit_code)
-        except Exception as e:
-            self.logger.error(f'Error in run_game: {e}')
+        finally:
+            follower_task.cancel()
+            if watchdog_task is not None:
+                watchdog_task.cancel()
+        exit_code = self.process.returncode
+        self.mark('exited')
+        if watchdog is not None and watchdog.reason is not None:
+            self.error = f'Killed by watchdog: {watchdog.reason}'
+
+        await self.finished_game(out, err, exit_code)
+
+    @staticmethod
+    async def read_stream(stream: asyncio.StreamReader, on_line=None) -> bytes:
+        # read everything like communicate() does, but hand every complete line over while the game runs
+        chunks = []
+        rest = b''
+        while True:
+            chunk = await stream.read(64 * 1024)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if on_line is not None:
+                lines = (rest + chunk).split(b'\n')
+                rest = lines.pop()
+                for line in lines:
+                    on_line(line)
+        return b''.join(chunks)
+
+    def on_server_output(self, line: bytes):
+        match = Game.player_connected_pattern.match(line.decode(errors='replace'))
+        if match is None or match.group(1) not in self.connected_players:
+            return
+        self.connected_players[match.group(1)] += 1
+        if all(count == 11 for count in self.connected_players.values()):
+            self.mark('players_connected')
+            self.publish(GameEventEnum.PLAYERS_CONNECTED)
+
+    def on_cycle(self, cycle: int):
+        self.cycle = cycle
+        self.publish(GameEventEnum.CYCLE)
+
+    def on_score(self, cycle: int, score: list[int]):
+        self.cycle = cycle
+        self.score = score
+        self.publish(GameEventEnum.SCORE)
 
     def check_server_output(self):
         out_file = os.path.join(self.server_config.game_log_dir, 'out.txt')
@@ -282,7 +430,7 @@ class Game:
         return zip_file_path
 
     async def finished_game(self, out: bytes, err: bytes, exit_code: int):
-        self.status = 'finished'
+        self.status = 'finished' if self.error is None else 'error'
         # TODO save game results
         self.logger.debug(f'Game finished with exit code {exit_code}')
         out_file = os.path.join(self.server_config.game_log_dir, 'out.txt')
@@ -293,27 +441,59 @@ class Game:
             f.write(err)
 
         valid = self.check_finished()
+        if valid:
+            self.score = self.game_result[:2]
+        self.publish(GameEventEnum.FINISHED)
         if valid:
             zip_file_path = self.zip_game_log_dir()
+            self.mark('zipped')
             self.logger.debug(f'Game log dir zipped to {zip_file_path}')
-            if self.storage_client is not None and self.storage_client.check_connection():
-                self.storage_client.upload_file(self.storage_client.game_log_bucket_name,
-                                                zip_file_path, f'{self.game_info.game_id}.zip')
+            if self.storage_client is not None and await asyncio.to_thread(self.storage_client.check_connection):
+                if await asyncio.to_thread(self.storage_client.upload_file, self.storage_client.game_log_bucket_name,
+                                           zip_file_path, f'{self.game_info.game_id}.zip'):
+                    self.mark('uploaded')
+                    self.publish(GameEventEnum.UPLOADED)
             else:
                 self.logger.error(f'Storage connection error, game log not uploaded')
 
         await self.finished_event(self)
 
+    def to_summary(self) -> GameSummaryMessage:
+        return GameSummaryMessage(
+            game_id=self.game_info.game_id,
+            port=self.port,
+            status=self.status,
+            left_team_name=self.game_info.left_team_name,
+            right_team_name=self.game_info.right_team_name,
+            cycle=self.cycle,
+            left_score=self.score[0],
+            right_score=self.score[1]
+        )
+
+    def to_event(self, event: GameEventEnum) -> GameEventMessage:
+        return GameEventMessage(
+            **self.to_summary().model_dump(),
+            event=event,
+            error=self.error,
+            timestamp=datetime.now(timezone.utc).isoformat()
+        )
+
+    def publish(self, event: GameEventEnum):
+        if self.event_bus is not None:
+            self.event_bus.publish(self.to_event(event))
+
     def to_dict(self):
         return {
             'game_info': self.game_info.to_dict(),
             'port': self.port,
         }
 
-    async def stop(self):
+    async def stop(self, reason: str = None):
         if self.process:
+            if reason is not None:
+                self.error = reason
             Tools.kill_process_tree(self.process.pid)
-            self.process.wait()  # Ensure the main process has terminated
+            await self.process.wait()  # Ensure the main process has terminated
 
     def to_game_finished_message(self) -> GameFinishedMessage:
         return GameFinishedMessage(
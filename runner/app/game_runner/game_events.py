@@ -0,0 +1,30 @@
+import asyncio
+import logging
+from utils.messages import GameEventMessage
+
+
+class GameEventBus:
+    """
+    Fans the game lifecycle events out to the subscribers (e.g. the /games/events stream).
+    Publishing never waits: a subscriber that does not keep up loses its oldest events.
+    """
+    def __init__(self, queue_size: int = 1000):
+        self.logger = logging.getLogger(__name__)
+        self.queue_size = queue_size
+        self.subscribers: set[asyncio.Queue] = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        self.logger.debug(f'GameEventBus subscribe: {len(self.subscribers)} subscribers')
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        self.logger.debug(f'GameEventBus unsubscribe: {len(self.subscribers)} subscribers')
+
+    def publish(self, event: GameEventMessage):
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
@@ -0,0 +1,130 @@
+import os
+import re
+import asyncio
+from datetime import datetime, timezone
+from data_dir import DataDir
+from utils.messages import GameLogFileMessage
+
+
+class GameLogFiles:
+    """
+    The files of data/gamelog/{game_id} (rcg, rcl, server output), read while the server is still writing them.
+    'rcg' and 'rcl' name the game log and the text log whatever their final name is (incomplete.rcg while
+    the game runs, <time>-<left>-vs-<right>.rcg afterwards).
+    """
+    chunk_size = 64 * 1024
+    follow_interval = 0.5
+    range_pattern = re.compile(r'bytes=(\d*)-(\d*)')
+
+    @staticmethod
+    def get_dir(data_dir: str, game_id: int) -> str:
+        return os.path.join(data_dir, DataDir.game_log_dir_name, f'{game_id}')
+
+    @staticmethod
+    def list_files(data_dir: str, game_id: int):
+        """Returns the files of the game log dir, None if the runner has no logs of the game."""
+        game_log_dir = GameLogFiles.get_dir(data_dir, game_id)
+        try:
+            entries = list(os.scandir(game_log_dir))
+        except FileNotFoundError:
+            return None
+        files = []
+        for entry in sorted(entries, key=lambda e: e.name):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # renamed meanwhile (incomplete.rcg)
+                continue
+            if entry.is_file():
+                files.append(GameLogFileMessage(
+                    name=entry.name,
+                    size=stat.st_size,
+                    modified=datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat()
+                ))
+        return files
+
+    @staticmethod
+    def get_path(data_dir: str, game_id: int, file_name: str):
+        """Returns the path of the file, None if the game log dir has no such file. Only plain names are served."""
+        game_log_dir = GameLogFiles.get_dir(data_dir, game_id)
+        try:
+            names = os.listdir(game_log_dir)
+        except FileNotFoundError:
+            return None
+        if file_name in ('rcg', 'rcl'):
+            names = [name for name in names if name.endswith(f'.{file_name}')]
+            return os.path.join(game_log_dir, names[0]) if names else None
+        if file_name not in names:
+            return None
+        path = os.path.join(game_log_dir, file_name)
+        return path if os.path.isfile(path) else None
+
+    @staticmethod
+    def parse_range(range_header: str, size: int):
+        """
+        Returns (start, end) of a single 'bytes=' range, end included, or None to send the whole file.
+        'bytes=-N' is the last N bytes. Raises ValueError if the range starts after the end of the file or selects
+        no byte.
+        """
+        if not range_header:
+            return None
+        match = GameLogFiles.range_pattern.fullmatch(range_header.strip())
+        if match is None or match.group(1) == match.group(2) == '':
+            return None  # several ranges or another unit, the whole file is a valid answer
+        if match.group(1) == '':
+            # the last 0 bytes, or any suffix of an empty file, is no byte at all
+            if size == 0 or int(match.group(2)) == 0:
+                raise ValueError(f'Range {range_header} not satisfiable, size {size}')
+            return max(0, size - int(match.group(2))), size - 1
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else size - 1
+        if start >= size or end < start:
+            raise ValueError(f'Range {range_header} not satisfiable, size {size}')
+        return start, min(end, size - 1)
+
+    @staticmethod
+    def get_follow_start(range_header: str, size: int) -> int:
+        """The offset a follow starts at: 'bytes=N-' from N (even past the current end), 'bytes=-N' the last N bytes."""
+        match = GameLogFiles.range_pattern.fullmatch((range_header or '').strip())
+        if match is None:
+            return 0
+        if match.group(1):
+            return int(match.group(1))
+        if match.group(2):
+            return max(0, size - int(match.group(2)))
+        return 0
+
+    # the file is opened by the caller before the response starts (and closed here), a rename
+    # (incomplete.rcg at the end of the game) does not interrupt a running response
+    @staticmethod
+    async def read(f, start: int, end: int):
+        with f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                data = await asyncio.to_thread(f.read, min(GameLogFiles.chunk_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+    @staticmethod
+    async def follow(f, start: int, is_live, is_disconnected):
+        """
+        Sends the file from start and then what the server appends, like tail -f, until the game is over
+        (is_live() is False) or the client is gone.
+        """
+        with f:
+            f.seek(start)
+            live = True
+            while True:
+                data = await asyncio.to_thread(f.read, GameLogFiles.chunk_size)
+                if data:
+                    yield data
+                    continue
+                if not live:
+                    return
+                if not is_live() or await is_disconnected():
+                    # the server may have written the last cycles between the read and the check
+                    live = False
+                    continue
+                await asyncio.sleep(GameLogFiles.follow_interval)
@@ -0,0 +1,77 @@
+import os
+import re
+import asyncio
+import logging
+
+
+class GameLogFollower:
+    """
+    Follows the .rcg the server is writing and reports the cycle and the score as the game goes on.
+    rcssserver does not print either of them, the game log is the only live source.
+    """
+    show_pattern = re.compile(rb'^\(show (\d+)')
+    team_pattern = re.compile(rb'^\(team (\d+) \S+ \S+ (\d+) (\d+)')
+    read_size = 1024 * 1024
+
+    def __init__(self, game_log_dir: str, on_cycle, on_score, cycle_interval: int = 100, interval: float = 1):
+        self.logger = logging.getLogger(__name__)
+        self.game_log_dir = game_log_dir
+        self.on_cycle = on_cycle  # called every cycle_interval cycles
+        self.on_score = on_score  # called when the score changes
+        self.cycle_interval = cycle_interval
+        self.interval = interval
+        self.rcg_path = None
+        self.offset = 0
+        self.rest = b''
+        self.cycle = 0
+        self.reported_cycle = 0
+        self.score = [0, 0]
+
+    def find_rcg(self):
+        try:
+            rcg_files = [f for f in os.listdir(self.game_log_dir) if f.endswith('.rcg')]
+        except FileNotFoundError:
+            return None
+        return os.path.join(self.game_log_dir, rcg_files[0]) if rcg_files else None
+
+    def read_new_lines(self) -> list[bytes]:
+        if self.rcg_path is None:
+            self.rcg_path = self.find_rcg()
+            if self.rcg_path is None:
+                return []
+        try:
+            with open(self.rcg_path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read(self.read_size)
+        except FileNotFoundError:
+            # the server renames incomplete.rcg at the end of the game
+            self.rcg_path = None
+            return []
+        self.offset += len(data)
+        lines = (self.rest + data).split(b'\n')
+        self.rest = lines.pop()
+        return lines
+
+    def parse(self, lines: list[bytes]):
+        for line in lines:
+            match = GameLogFollower.show_pattern.match(line)
+            if match:
+                self.cycle = int(match.group(1))
+                continue
+            match = GameLogFollower.team_pattern.match(line)
+            if match:
+                self.cycle = max(self.cycle, int(match.group(1)))
+                score = [int(match.group(2)), int(match.group(3))]
+                if score != self.score:
+                    self.score = score
+                    self.on_score(self.cycle, score)
+        if self.cycle - self.reported_cycle >= self.cycle_interval:
+            self.reported_cycle = self.cycle
+            self.on_cycle(self.cycle)
+
+    async def run(self):
+        while True:
+            lines = await asyncio.to_thread(self.read_new_lines)
+            self.parse(lines)
+            if len(lines) == 0:
+                await asyncio.sleep(self.interval)
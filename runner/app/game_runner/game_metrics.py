@@ -0,0 +1,141 @@
+import math
+
+
+class Histogram:
+    # cumulative buckets like a Prometheus histogram, one per label value
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: dict):
+        for i, count in enumerate(other['counts']):
+            self.counts[i] += count
+        self.sum += other['sum']
+        self.count += other['count']
+
+    def to_dict(self) -> dict:
+        return {'counts': list(self.counts), 'sum': self.sum, 'count': self.count}
+
+
+class GameMetrics:
+    """
+    Durations of the phases of the games of the runner, from the time.monotonic() marks of every game
+    (Game.timestamps) and its timed artifact operations (Game.operations), exposed in the Prometheus
+    text format on /metrics. A phase is only observed when the game reached both of its marks.
+    """
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+    gauges_help = {
+        'runner_games_running': 'Games the runner is running.',
+        'runner_available_games': 'Games the runner can still take.',
+    }
+    buckets = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+    # phase: (from mark, to mark), the first existing mark of a tuple is used
+    phases = {
+        'queue': (('received',), ('check_begin',)),
+        'prepare': (('check_begin',), ('check_end',)),
+        'start': (('check_end',), ('spawned',)),
+        'connect': (('spawned',), ('players_connected',)),
+        'simulate': (('players_connected', 'spawned'), ('exited',)),
+        'zip': (('exited',), ('zipped',)),
+        'upload': (('zipped',), ('uploaded',)),
+        'report': (('uploaded', 'zipped', 'exited'), ('reported',)),
+        'total': (('received',), ('reported',)),
+    }
+
+    def __init__(self):
+        self.phase_seconds: dict[str, Histogram] = {}
+        self.operation_seconds: dict[tuple[str, str], Histogram] = {}  # by (artifact, operation)
+        self.games: dict[str, int] = {'success': 0, 'error': 0}
+
+    @staticmethod
+    def first_mark(timestamps: dict[str, float], marks: tuple):
+        for mark in marks:
+            if mark in timestamps:
+                return timestamps[mark]
+        return None
+
+    def get_histogram(self, histograms: dict, key) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(GameMetrics.buckets)
+        return histogram
+
+    def observe_game(self, timestamps: dict[str, float], operations: list[tuple[str, str, float]], success: bool):
+        for phase, (start_marks, end_marks) in GameMetrics.phases.items():
+            start = GameMetrics.first_mark(timestamps, start_marks)
+            end = GameMetrics.first_mark(timestamps, end_marks)
+            if start is not None and end is not None:
+                self.get_histogram(self.phase_seconds, phase).observe(max(0.0, end - start))
+        for artifact, operation, seconds in operations:
+            self.get_histogram(self.operation_seconds, (artifact, operation)).observe(seconds)
+        self.games['success' if success else 'error'] += 1
+
+    # ---------------------------- EXPORT
+
+    def to_dict(self) -> dict:
+        return {
+            'phase_seconds': {phase: histogram.to_dict() for phase, histogram in self.phase_seconds.items()},
+            'operation_seconds': [{'artifact': artifact, 'operation': operation, **histogram.to_dict()}
+                                  for (artifact, operation), histogram in self.operation_seconds.items()],
+            'games': dict(self.games),
+        }
+
+    def merge(self, metrics: dict):
+        # the metrics of a worker process (to_dict), the supervisor exposes the sum of its workers
+        for phase, histogram in metrics['phase_seconds'].items():
+            self.get_histogram(self.phase_seconds, phase).merge(histogram)
+        for histogram in metrics['operation_seconds']:
+            self.get_histogram(self.operation_seconds, (histogram['artifact'], histogram['operation'])).merge(histogram)
+        for result, count in metrics['games'].items():
+            self.games[result] = self.games.get(result, 0) + count
+
+    @staticmethod
+    def format_value(value: float) -> str:
+        if math.isinf(value):
+            return '+Inf'
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+    @staticmethod
+    def format_histogram(name: str, labels: str, histogram: Histogram) -> list[str]:
+        lines = []
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f'{name}_bucket{{{labels},le="{GameMetrics.format_value(float(bound))}"}} {count}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{{labels}}} {GameMetrics.format_value(histogram.sum)}')
+        lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return lines
+
+    def to_prometheus(self, gauges: dict[str, float] = None) -> str:
+        """The metrics in the Prometheus text format, with the current values of gauges_help."""
+        lines = [
+            '# HELP runner_game_phase_seconds Duration of the phases of the finished games.',
+            '# TYPE runner_game_phase_seconds histogram',
+        ]
+        for phase, histogram in self.phase_seconds.items():
+            lines += GameMetrics.format_histogram('runner_game_phase_seconds', f'phase="{phase}"', histogram)
+        lines += [
+            '# HELP runner_game_artifact_seconds Duration of the downloads and unzips done for the games.',
+            '# TYPE runner_game_artifact_seconds histogram',
+        ]
+        for (artifact, operation), histogram in self.operation_seconds.items():
+            lines += GameMetrics.format_histogram('runner_game_artifact_seconds',
+                                                  f'artifact="{artifact}",operation="{operation}"', histogram)
+        lines += [
+            '# HELP runner_games_total Finished games by result.',
+            '# TYPE runner_games_total counter',
+        ]
+        for result, count in self.games.items():
+            lines.append(f'runner_games_total{{result="{result}"}} {count}')
+        for name, value in (gauges or {}).items():
+            lines += [f'# HELP {name} {GameMetrics.gauges_help[name]}', f'# TYPE {name} gauge',
+                      f'{name} {GameMetrics.format_value(value)}']
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,106 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from game_runner.game import Game
+from utils.messages import GameTaskMessage, GameTaskStateEnum
+
+
+class GameTask:
+    def __init__(self, game: Game):
+        self.game = game
+        self.task: asyncio.Task = None
+        self.state = GameTaskStateEnum.RUNNING
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.monotonic()
+        self.ended: float = None
+        self.error: str = None
+        self.released_by_supervisor = False
+
+    def to_message(self) -> GameTaskMessage:
+        return GameTaskMessage(
+            game_id=self.game.game_info.game_id,
+            port=self.game.port,
+            state=self.state,
+            started_at=self.started_at.isoformat(),
+            duration=round((self.ended or time.monotonic()) - self.started, 1),
+            error=self.error,
+            released_by_supervisor=self.released_by_supervisor
+        )
+
+
+class GameTaskSupervisor:
+    """
+    Owns the task of every running game. The slot of a game is released on every exit path of its task:
+    run_game reports the end of the game through game.finished_event, when it raises or is cancelled before
+    that the supervisor stops the server, sets the error of the game and calls on_exit itself.
+    on_exit(game) returns False, and does nothing, for a game it has already released.
+    The tasks of the running games and of the last finished ones are kept with their state.
+    """
+    history_size = 100
+
+    def __init__(self, on_exit):
+        self.logger = logging.getLogger(__name__)
+        self.on_exit = on_exit
+        self.tasks: dict[int, GameTask] = {}  # by port
+        self.history: deque[GameTask] = deque(maxlen=GameTaskSupervisor.history_size)
+        self.counters = {'started': 0, 'finished': 0, 'crashed': 0, 'cancelled': 0, 'released_by_supervisor': 0}
+
+    def start(self, game: Game) -> GameTask:
+        game_task = GameTask(game)
+        game_task.task = asyncio.create_task(self.run(game_task), name=f'Game{game.game_info.game_id}')
+        self.tasks[game.port] = game_task
+        self.counters['started'] += 1
+        return game_task
+
+    async def run(self, game_task: GameTask):
+        game = game_task.game
+        try:
+            await game.run_game()
+        except asyncio.CancelledError:
+            self.end(game_task, GameTaskStateEnum.CANCELLED, 'Game task cancelled')
+            raise
+        except Exception as e:
+            self.logger.exception(f'Game{game.game_info.game_id} task crashed')
+            self.end(game_task, GameTaskStateEnum.CRASHED, f'{type(e).__name__}: {e}')
+        else:
+            self.end(game_task, GameTaskStateEnum.FINISHED, game.error)
+        finally:
+            await self.release(game_task)
+
+    def end(self, game_task: GameTask, state: GameTaskStateEnum, error: str = None):
+        game_task.state = state
+        game_task.error = error
+        game_task.ended = time.monotonic()
+        self.counters[state.value] += 1
+
+    async def release(self, game_task: GameTask):
+        game = game_task.game
+        if self.tasks.get(game.port) is game_task:
+            del self.tasks[game.port]
+        self.history.append(game_task)
+        if game_task.state != GameTaskStateEnum.FINISHED:
+            game.status = 'error'
+            game.error = game.error or game_task.error
+        try:
+            if game.process is not None and game.process.returncode is None:
+                await game.stop(game.error)
+        except Exception as e:
+            self.logger.error(f'Game{game.game_info.game_id}: can not stop the server: {e}')
+        # a no-op when finished_event has already released the game
+        if await self.on_exit(game):
+            game_task.released_by_supervisor = True
+            self.counters['released_by_supervisor'] += 1
+            self.logger.error(f'Game{game.game_info.game_id} ended without reporting ({game.error}), '
+                              f'released port {game.port}')
+
+    def get(self, game_id: int) -> GameTask:
+        for game_task in self.tasks.values():
+            if game_task.game.game_info.game_id == game_id:
+                return game_task
+        return None
+
+    def get_tasks(self) -> list[GameTaskMessage]:
+        # running tasks first, then the last finished ones, newest first
+        return [game_task.to_message() for game_task in [*self.tasks.values(), *reversed(self.history)]]
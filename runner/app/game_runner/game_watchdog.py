@@ -0,0 +1,99 @@
+import os
+import re
+import time
+import asyncio
+import logging
+from utils.tools import Tools
+
+
+class WatchdogConfig:
+    def __init__(self, start_timeout: float = 120, stall_timeout: float = 60, budget_margin: float = 1.5,
+                 interval: float = 5):
+        self.start_timeout = start_timeout  # seconds until the first cycle has to be written to the rcg
+        self.stall_timeout = stall_timeout  # seconds the rcg may stay without any new cycle
+        self.budget_margin = budget_margin  # factor on the real time duration of the match
+        self.interval = interval
+
+
+class GameWatchdog:
+    """
+    Kills a game that can not finish: the server did not start writing the rcg, the rcg stopped
+    progressing (e.g. a deadlocked team in synch mode) or the match took longer than its wall clock budget.
+    """
+    simulator_step = 0.1  # seconds per cycle in real time
+    penalty_cycles = 4000  # upper bound of a penalty shoot out (10 kicks per team, ~200 cycles each)
+    tail_size = 64 * 1024
+    cycle_pattern = re.compile(rb'\((?:show|playmode|team) (\d+)')
+
+    def __init__(self, game, config: WatchdogConfig):
+        self.game = game
+        self.config = config
+        self.logger = logging.getLogger(f'Game{game.game_info.game_id}.watchdog')
+        self.budget = GameWatchdog.get_budget(game.server_config, config)
+        self.cycle = -1
+        self.rcg_size = -1
+        self.reason = None
+
+    @staticmethod
+    def get_budget(server_config, config: WatchdogConfig) -> float:
+        half_time = float(server_config.get_server_param('half_time'))
+        extra_half_time = float(server_config.get_server_param('extra_half_time'))
+        cycles = half_time * 10 * int(server_config.get_server_param('nr_normal_halfs'))
+        cycles += extra_half_time * 10 * int(server_config.get_server_param('nr_extra_halfs'))
+        if str(server_config.get_server_param('penalty_shoot_outs')).lower() in {'1', 'true', 'on'}:
+            cycles += GameWatchdog.penalty_cycles
+        return config.start_timeout + cycles * GameWatchdog.simulator_step * config.budget_margin
+
+    def read_progress(self):
+        """Returns (last cycle, size) of the rcg being written, (None, None) if there is none yet."""
+        game_log_dir = self.game.server_config.game_log_dir
+        try:
+            rcg_files = [f for f in os.listdir(game_log_dir) if f.endswith('.rcg')]
+        except FileNotFoundError:
+            return None, None
+        if not rcg_files:
+            return None, None
+        rcg_path = os.path.join(game_log_dir, rcg_files[0])
+        try:
+            with open(rcg_path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - GameWatchdog.tail_size))
+                cycles = GameWatchdog.cycle_pattern.findall(f.read())
+        except OSError:
+            return None, None
+        return (int(cycles[-1]) if cycles else 0), size
+
+    def check(self, started_at: float, progressed_at: float, now: float):
+        """Returns the reason to kill the game, or None."""
+        if now - started_at > self.budget:
+            return f'wall clock budget of {self.budget:.0f}s exceeded at cycle {self.cycle}'
+        if self.cycle <= 0:
+            if now - started_at > self.config.start_timeout:
+                return f'no progress in the game log {self.config.start_timeout:.0f}s after the start'
+        elif now - progressed_at > self.config.stall_timeout:
+            return f'game stalled at cycle {self.cycle} for {self.config.stall_timeout:.0f}s'
+        return None
+
+    async def run(self):
+        started_at = progressed_at = time.monotonic()
+        self.logger.debug(f'Watchdog started, budget: {self.budget:.0f}s')
+        while True:
+            await asyncio.sleep(self.config.interval)
+            cycle, size = await asyncio.to_thread(self.read_progress)
+            now = time.monotonic()
+            if cycle is not None and (cycle > self.cycle or size != self.rcg_size):
+                self.cycle = max(cycle, self.cycle)
+                self.rcg_size = size
+                progressed_at = now
+            reason = self.check(started_at, progressed_at, now)
+            if reason is not None:
+                self.reason = reason
+                self.logger.error(f'Killing game: {reason}')
+                self.kill()
+                return
+
+    def kill(self):
+        process = self.game.process
+        if process is None or process.returncode is not None:
+            return
+        Tools.kill_process_tree(process.pid)
@@ -0,0 +1,88 @@
+import os
+import json
+import logging
+import psutil
+from utils.file_lock import FileLock
+
+
+class HostRegistry:
+    """
+    The game slots and server ports of one host, shared by the worker processes of a supervisor
+    (see supervisor.py). The registry is a json file changed under a file lock: a slot is taken by
+    writing its port with the pid of the worker, a slot of a dead worker is taken back on the next access.
+    """
+    def __init__(self, registry_dir: str, max_games_count: int, first_port: int = 6000, port_step: int = 10):
+        self.logger = logging.getLogger(__name__)
+        self.file_path = os.path.join(registry_dir, 'host_registry.json')
+        self.file_lock = FileLock(os.path.join(registry_dir, 'host_registry.lock'))
+        self.ports = list(range(first_port, first_port + port_step * max_games_count, port_step))
+
+    def load(self) -> dict:
+        if not os.path.exists(self.file_path):
+            return {'slots': {}, 'workers': {}}
+        try:
+            with open(self.file_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f'Failed to load host registry {self.file_path}: {e}')
+            return {'slots': {}, 'workers': {}}
+
+    def save(self, registry: dict):
+        tmp_file_path = f'{self.file_path}.tmp'
+        with open(tmp_file_path, 'w') as f:
+            json.dump(registry, f, indent=2)
+        os.replace(tmp_file_path, self.file_path)
+
+    def reclaim(self, registry: dict):
+        for port, slot in list(registry['slots'].items()):
+            if not psutil.pid_exists(slot['pid']):
+                self.logger.warning(f'HostRegistry: taking back port {port} of dead worker {slot["pid"]} '
+                                    f'(Game{slot["game_id"]})')
+                del registry['slots'][port]
+        for pid in list(registry['workers']):
+            if not psutil.pid_exists(int(pid)):
+                del registry['workers'][pid]
+
+    def reset(self):
+        # called by the supervisor before it starts the workers
+        with self.file_lock:
+            self.save({'slots': {}, 'workers': {}})
+
+    def register_worker(self, worker_index: int, api_port: int):
+        with self.file_lock:
+            registry = self.load()
+            self.reclaim(registry)
+            registry['workers'][str(os.getpid())] = {'worker_index': worker_index, 'api_port': api_port}
+            self.save(registry)
+
+    def acquire(self, game_id: int):
+        """Returns a free port of the host for the game, None if every slot of the host is taken."""
+        with self.file_lock:
+            registry = self.load()
+            self.reclaim(registry)
+            for port in self.ports:
+                if str(port) not in registry['slots']:
+                    registry['slots'][str(port)] = {'pid': os.getpid(), 'game_id': game_id}
+                    self.save(registry)
+                    return port
+        return None
+
+    def release(self, port: int):
+        with self.file_lock:
+            registry = self.load()
+            slot = registry['slots'].get(str(port))
+            if slot is not None and slot['pid'] == os.getpid():
+                del registry['slots'][str(port)]
+                self.save(registry)
+
+    def get_slots(self) -> dict[int, dict]:
+        with self.file_lock:
+            registry = self.load()
+            self.reclaim(registry)
+            return {int(port): slot for port, slot in registry['slots'].items()}
+
+    def get_workers(self) -> dict[int, dict]:
+        with self.file_lock:
+            registry = self.load()
+            self.reclaim(registry)
+            return {int(pid): worker for pid, worker in registry['workers'].items()}
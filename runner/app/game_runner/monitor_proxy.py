@@ -0,0 +1,109 @@
+import asyncio
+import logging
+
+
+class MonitorConnection(asyncio.DatagramProtocol):
+    """
+    The single monitor connection of one game. Every frame the server sends is offered to all the
+    clients; a client whose queue is full loses its oldest frame, the server is never waited for.
+    """
+    init_frame_types = ('(server_param', '(player_param', '(player_type')
+    dispinit = b'(dispinit version 5)\0'
+
+    def __init__(self, game_id: int, port: int, host: str = '127.0.0.1', queue_size: int = 32,
+                 connect_timeout: float = 10):
+        self.logger = logging.getLogger(f'Game{game_id}.monitor')
+        self.game_id = game_id
+        self.address = (host, port)
+        self.queue_size = queue_size
+        self.connect_timeout = connect_timeout
+        self.transport: asyncio.DatagramTransport = None
+        self.connected = asyncio.Event()
+        self.init_frames: list[str] = []
+        self.clients: set[asyncio.Queue] = set()
+        self.frames = 0
+        self.dropped = 0
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        # not connected to the server address: rcssserver may answer from another port
+        self.transport, _ = await loop.create_datagram_endpoint(lambda: self, local_addr=('0.0.0.0', 0))
+        # UDP, repeat the dispinit until the server answers
+        for _ in range(int(self.connect_timeout)):
+            self.transport.sendto(MonitorConnection.dispinit, self.address)
+            try:
+                await asyncio.wait_for(self.connected.wait(), 1)
+                self.logger.info(f'Monitor connected to {self.address}')
+                return
+            except asyncio.TimeoutError:
+                pass
+        self.close()
+        raise ConnectionError(f'Server on {self.address} did not answer the monitor')
+
+    def datagram_received(self, data: bytes, addr):
+        self.connected.set()
+        frame = data.rstrip(b'\0').decode(errors='replace')
+        self.frames += 1
+        if frame.startswith(MonitorConnection.init_frame_types):
+            self.init_frames.append(frame)
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(frame)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.clients.discard(queue)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+        # wake the clients up, None ends their stream
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        self.logger.info(f'Monitor closed, frames: {self.frames}, dropped for slow clients: {self.dropped}')
+
+
+class MonitorProxy:
+    """
+    Opens one monitor connection per watched game (on the first viewer, closed with the last one
+    or at the end of the game) and fans its frames out to any number of viewers.
+    """
+    def __init__(self, queue_size: int = 32):
+        self.logger = logging.getLogger(__name__)
+        self.queue_size = queue_size
+        self.connections: dict[int, MonitorConnection] = {}
+        # one lock per game: opening the connection of a game waits for its server, not for the other games
+        self.locks: dict[int, asyncio.Lock] = {}
+
+    async def subscribe(self, game_id: int, port: int) -> tuple[list[str], asyncio.Queue]:
+        """Returns the init frames (server_param, ...) received so far and the queue of the next frames."""
+        async with self.locks.setdefault(game_id, asyncio.Lock()):
+            connection = self.connections.get(game_id)
+            if connection is None:
+                connection = MonitorConnection(game_id, port, queue_size=self.queue_size)
+                await connection.open()
+                self.connections[game_id] = connection
+            return list(connection.init_frames), connection.subscribe()
+
+    def unsubscribe(self, game_id: int, queue: asyncio.Queue):
+        connection = self.connections.get(game_id)
+        if connection is None:
+            return
+        connection.unsubscribe(queue)
+        if not connection.clients:
+            self.close(game_id)
+
+    def close(self, game_id: int):
+        self.locks.pop(game_id, None)
+        connection = self.connections.pop(game_id, None)
+        if connection is not None:
+            connection.close()
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from utils.tools import Tools
 from game_runner.game import Game
 import logging
@@ -8,25 +9,73 @@ from data_dir import DataDir
 from utils.messages import *
 from utils.message_sender import MessageSender
 from storage.downloader import Downloader
+from storage.download_metadata import DownloadMetadata
+from game_runner.artifact_locks import ArtifactLocks
+from game_runner.fake_server import FakeServer
+from game_runner.game_watchdog import WatchdogConfig
+from game_runner.game_events import GameEventBus
+from game_runner.monitor_proxy import MonitorProxy
+from game_runner.host_registry import HostRegistry
+from game_runner.server_presets import ServerPresets
+from game_runner.server_cache import ServerCache
+from game_runner.game_tasks import GameTaskSupervisor
+from game_runner.game_metrics import GameMetrics
+from utils.config import DEFAULT_CONFIG
 from enum import Enum
 import requests
 
 
 class RunnerManager:
-    def __init__(self, data_dir: str, storage_client: StorageClient, message_sender: MessageSender, runner_id: int):
+    def __init__(self, data_dir: str, storage_client: StorageClient, message_sender: MessageSender, runner_id: int,
+                 fake_server: FakeServer = None, watchdog_config: WatchdogConfig = None,
+                 drain_timeout: float = 1800, drain_kill_timeout: float = 60,
+                 host_registry: HostRegistry = None, report_status: bool = True,
+                 server_presets: ServerPresets = None, servers: list[dict] = None,
+                 default_server_version: str = None):
         self.logger = logging.getLogger(__name__)
         self.logger.info('GameRunnerManager created')
         self.available_games_count = 0
         self.available_ports = []
         self.games: dict[int, Game] = {}
+        self.game_tasks = GameTaskSupervisor(self.on_finished_game)
+        self.metrics = GameMetrics()
         self.data_dir = data_dir
         self.storage_client = storage_client
         self.message_sender = message_sender
-        self.check_server()
+        self.download_metadata = DownloadMetadata(os.path.join(data_dir, DataDir.download_metadata_file_name))
+        self.fake_server = fake_server
+        self.watchdog_config = watchdog_config
+        self.event_bus = GameEventBus()
+        self.monitor_proxy = MonitorProxy()
+        if server_presets is None:
+            server_presets = ServerPresets(DEFAULT_CONFIG['server_presets'],
+                                           DEFAULT_CONFIG['config']['default_server_preset'])
+        self.server_presets = server_presets
+        self.server_cache = ServerCache(data_dir, storage_client, self.download_metadata,
+                                        servers, default_server_version)
+        # set in the worker processes of a supervisor: slots and ports are taken from the host registry
+        # and the supervisor reports the status of the host to the tournament manager
+        self.host_registry = host_registry
+        self.report_status = report_status
+        if host_registry is not None:
+            ArtifactLocks.lock_dir = os.path.join(data_dir, DataDir.locks_dir_name)
+        if fake_server is not None:
+            self.logger.warning(f'Using fake server {FakeServer.server_path}, games are simulated')
+        elif self.server_cache.default_version is not None:
+            # the versions of the server cache are fetched by update_servers and on demand
+            self.logger.info(f'Server {self.server_cache.default_version} is provided by the server cache')
+        else:
+            self.check_server()
         self.lock = asyncio.Lock()
         self.runner_id = runner_id
         self.status = RunnerStatusMessageEnum.RUNNING
         self.requested_command: RunnerCommandMessageEnum = None
+        self.drain_timeout = drain_timeout  # seconds to wait for the running games before stopping them
+        self.drain_kill_timeout = drain_kill_timeout  # seconds to wait for the stopped games to report
+        self.drained_games: list[dict] = []
+        self.drain_report: dict = None
+        self.drained = asyncio.Event()
+        self.drain_task: asyncio.Task = None
 
     def check_server(self):
         server_dir = os.path.join(self.data_dir, DataDir.server_dir_name)
@@ -52,9 +101,13 @@ class RunnerManager:
         self.available_ports = list(range(6000, 6000 + 10 * max_games_count, 10))
         self.logger.info(f'GameRunnerManager available_ports: {self.available_ports}')
 
-    def get_available_port(self):
+    def get_available_port(self, game_id: int = None):
         if self.available_games_count == 0:
             return None
+        if self.host_registry is not None:
+            port = self.host_registry.acquire(game_id)
+            self.logger.info(f'GameRunnerManager get_available_port (host registry): {port}')
+            return port
         port = self.available_ports.pop()
         self.logger.info(f'GameRunnerManager get_available_port: {port}')
         return port
@@ -62,9 +115,13 @@ class RunnerManager:
     def free_port(self, port):
         self.logger.info(f'GameRunnerManager free_port: {port}')
         self.available_games_count += 1
+        if self.host_registry is not None:
+            self.host_registry.release(port)
+            return
         self.available_ports.append(port)
 
     async def add_game(self, game_info: GameInfoMessage, called_from_rabbitmq: bool = False) -> GameStartedMessage:
+        received = time.monotonic()
         async with self.lock:
             #TODO try except
             self.logger.info(f'GameRunnerManager adding game: {game_info}')
@@ -75,33 +132,61 @@ class RunnerManager:
                 self.logger.warning(f'GameRunnerManager add_game: No available games')
                 return GameStartedMessage(game_id=game_info.game_id, success=False, runner_id=self.runner_id, error='No available games')
             self.logger.info(f'GameRunnerManager add_game: {game_info}')
-            port = self.get_available_port()
+            # an unknown preset or an invalid server_config is rejected before a slot is taken
+            try:
+                server_preset = self.server_presets.get(game_info.server_preset)
+                ServerPresets.parse_server_config(game_info.server_config)
+                self.server_cache.resolve(game_info.server_version)
+            except ValueError as e:
+                self.logger.warning(f'GameRunnerManager add_game: Game{game_info.game_id} rejected: {e}')
+                return GameStartedMessage(game_id=game_info.game_id, success=False, runner_id=self.runner_id, error=str(e))
+            port = self.get_available_port(game_info.game_id)
             if port is None:
                 self.logger.warning(f'GameRunnerManager add_game: No available ports')
                 return GameStartedMessage(game_id=game_info.game_id, success=False, runner_id=self.runner_id, error='No available ports')
             self.available_games_count -= 1
-            game = Game(game_info, port, self.data_dir, self.storage_client)
+            try:
+                game = Game(game_info, port, self.data_dir, self.storage_client, server_preset, self.fake_server,
+                            self.watchdog_config, self.server_cache)
+            except Exception:
+                self.free_port(port)
+                raise
+            game.timestamps['received'] = received
             game.finished_event = self.on_finished_game
+            game.event_bus = self.event_bus
             self.games[port] = game
-            self.games[port].check()
-            asyncio.create_task(game.run_game())
-            res = GameStartedMessage(game_id=game_info.game_id, success=True, port=port, runner_id=self.runner_id)
-            if called_from_rabbitmq:
-                try:
-                    game_started_message = GameStartedMessage(game_id=game_info.game_id, port=port, success=True, runner_id=self.runner_id)
-                    if self.message_sender is not None:
-                        await self.message_sender.send_message('from_runner/game_started', game_started_message.model_dump())
-                except Exception as e:
-                    self.logger.error(f'GameRunnerManager add_game (Can not send game_started message): {e}')
-            return res
 
-    async def on_finished_game(self, game: Game):
+        # the slot is reserved, prepare artifacts without holding the manager lock
+        try:
+            await game.check()
+        except Exception as e:
+            self.logger.error(f'GameRunnerManager add_game: Game{game_info.game_id} check failed: {e}')
+            async with self.lock:
+                self.free_port(port)
+                del self.games[port]
+            raise
+
+        self.game_tasks.start(game)
+        res = GameStartedMessage(game_id=game_info.game_id, success=True, port=port, runner_id=self.runner_id)
+        if called_from_rabbitmq:
+            try:
+                game_started_message = GameStartedMessage(game_id=game_info.game_id, port=port, success=True, runner_id=self.runner_id)
+                if self.message_sender is not None:
+                    await self.message_sender.send_message('from_runner/game_started', game_started_message.model_dump())
+            except Exception as e:
+                self.logger.error(f'GameRunnerManager add_game (Can not send game_started message): {e}')
+        return res
+
+    async def on_finished_game(self, game: Game) -> bool:
+        # called by the game when it ends and by its task when it ends without reporting, only the first call counts
         async with self.lock:
+            if self.games.get(game.port) is not game:
+                return False
             try:
                 self.logger.info(f'GameRunnerManager on_finished_game: Game{game.game_info.game_id}')
-                self.free_port(game.port)
                 game_finished_message = GameFinishedMessage(game_id=game.game_info.game_id, 
-                                                            success=True, 
+                                                            success=game.error is None,
+                                                            error=game.error,
                                                             left_score=game.game_result[0],
                                                             right_score=game.game_result[1],
                                                             left_penalty=game.game_result[2],
@@ -109,9 +194,29 @@ class RunnerManager:
                                                             runner_id=self.runner_id)
                 if self.message_sender is not None:
                     await self.message_sender.send_message('from_runner/game_finished', game_finished_message.model_dump())
-                del self.games[game.port]
             except Exception as e:
                 self.logger.error(f'GameRunnerManager on_finished_game: {e}')
+            finally:
+                # the slot comes back even if the report failed
+                game.mark('reported')
+                self.release_game(game)
+            return True
+
+    def release_game(self, game: Game):
+        self.metrics.observe_game(game.timestamps, game.operations, game.error is None)
+        self.monitor_proxy.close(game.game_info.game_id)
+        self.free_port(game.port)
+        del self.games[game.port]
+        if self.status == RunnerStatusMessageEnum.DRAINING:
+            self.drained_games.append({'game_id': game.game_info.game_id, 'success': game.error is None,
+                                       'error': game.error})
+
+    def get_gauges(self) -> dict[str, float]:
+        return {'runner_games_running': len(self.games), 'runner_available_games': self.available_games_count}
+
+    def get_game_tasks(self) -> GetGameTasksResponse:
+        return GetGameTasksResponse(tasks=self.game_tasks.get_tasks(), counters=dict(self.game_tasks.counters),
+                                    available_games_count=self.available_games_count)
 
     def get_games(self):
         self.logger.info(f'GameRunnerManager get_games')
@@ -189,6 +294,12 @@ class RunnerManager:
                     self.requested_command = command
                     self.logger.info("Stopping Runner: Initiating shutdown.")
                     return ResponseMessage(success=True, value="Runner is stopping.")
+            elif command == RunnerCommandMessageEnum.DRAIN:
+                if self.status in [RunnerStatusMessageEnum.DRAINING, RunnerStatusMessageEnum.STOPPED]:
+                    self.logger.warning(f"Runner is already {self.status}.")
+                    return ResponseMessage(success=False, error="400", value=f"Runner is already {self.status}.")
+                await self.start_drain()
+                return ResponseMessage(success=True, value=f"Runner is draining {len(self.games)} running games.")
             elif command == RunnerCommandMessageEnum.HELLO:
                 self.logger.info("Hello - Direct Command, TM!")
                 return ResponseMessage(success=True, value="Hello, TM!", obj={"success": True, "value": "Hello - Direct Command, TM!", "error": None})
@@ -203,7 +314,7 @@ class RunnerManager:
         self.status = new_status
         # Notify TM about the pause
         pause_status = RunnerStatusMessage(runner_id=self.runner_id,status=self.status,timestamp=datetime.utcnow().isoformat())
-        if self.message_sender:
+        if self.message_sender and self.report_status:
             await self.message_sender.send_message('from_runner/status_update', pause_status.model_dump())
             # await self.send_status_log(self.pv_status, self.status)
     
@@ -216,76 +327,118 @@ class RunnerManager:
         )
         await self.message_sender.send_message('from_runner/submit_log', log.model_dump())
     
+    async def start_drain(self):
+        # stop taking games right away (add_game checks the status), the RabbitMQ consumer
+        # gives its queued messages back when it sees the DRAIN command
+        self.logger.info(f'GameRunnerManager start_drain: {len(self.games)} running games')
+        self.requested_command = RunnerCommandMessageEnum.DRAIN
+        await self.update_status_to(RunnerStatusMessageEnum.DRAINING)
+        # kept here, the loop only holds a weak reference to a task
+        self.drain_task = asyncio.create_task(self.drain())
+        self.drain_task.add_done_callback(self.on_drain_done)
+
+    def on_drain_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.logger.error(f'GameRunnerManager drain failed: {task.exception()!r}')
+            # the runner still exits, main.py waits for drained
+            self.drained.set()
+
+    async def cancel_drain(self):
+        if self.drain_task is not None and not self.drain_task.done():
+            self.drain_task.cancel()
+            await asyncio.gather(self.drain_task, return_exceptions=True)
+
+    async def wait_for_games(self, timeout: float) -> bool:
+        # a game leaves self.games only after its log is uploaded and game_finished is reported
+        deadline = time.monotonic() + timeout
+        while self.games and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+        return not self.games
+
+    async def drain(self):
+        started_at = time.monotonic()
+        in_flight = [game.game_info.game_id for game in self.games.values()]
+        stopped = []
+        try:
+            if not await self.wait_for_games(self.drain_timeout):
+                self.logger.warning(f'GameRunnerManager drain: timeout after {self.drain_timeout}s, '
+                                    f'stopping {len(self.games)} games')
+                for game in list(self.games.values()):
+                    stopped.append(game.game_info.game_id)
+                    try:
+                        await game.stop(f'Stopped: runner drain timeout ({self.drain_timeout}s)')
+                    except Exception as e:
+                        self.logger.error(f'GameRunnerManager drain: can not stop Game{game.game_info.game_id}: {e}')
+                await self.wait_for_games(self.drain_kill_timeout)
+        except Exception as e:
+            self.logger.error(f'GameRunnerManager drain: {e}')
+
+        self.drain_report = {
+            'in_flight_games': in_flight,
+            'completed_games': [g['game_id'] for g in self.drained_games if g['success']],
+            'failed_games': [g for g in self.drained_games if not g['success']],
+            'stopped_games': stopped,
+            'unreported_games': [game.game_info.game_id for game in self.games.values()],
+            'duration': round(time.monotonic() - started_at, 1),
+        }
+        self.logger.info(f'GameRunnerManager drain report: {self.drain_report}')
+        try:
+            if self.message_sender is not None and self.runner_id is not None:
+                await self.message_sender.send_message('from_runner/submit_log', SubmitRunnerLog(
+                    runner_id=self.runner_id,
+                    message=f"Drained: {self.drain_report}",
+                    log_level=LogLevelMessageEnum.INFO if not self.drain_report['unreported_games'] else LogLevelMessageEnum.ERROR,
+                    timestamp=datetime.utcnow().isoformat()
+                ).model_dump())
+            await self.update_status_to(RunnerStatusMessageEnum.STOPPED)
+        except Exception as e:
+            self.logger.error(f'GameRunnerManager drain: can not report the drain: {e}')
+        self.drained.set()
+
     async def shutdown(self): # TODO: there is one in main.py
         self.logger.info("Shutting down the Runner...")
         self.logger.info("Runner has shutdown.")
         await asyncio.sleep(1)
         await asyncio.get_event_loop().stop()
         
-    async def update_base_minio(
-            self, 
-            base_team_name: str, 
-            bucket_name: str,
-            file_name: str
-        ):
-        self.logger.info(f'GameRunnerManager update_base: {base_team_name}, github')
-
-
+    def prepare_base_teams_dir(self, base_team_name: str):
         base_teams_dir = os.path.join(self.data_dir, DataDir.base_team_dir_name)
         base_team_path = os.path.join(base_teams_dir, base_team_name)
         self.logger.debug(f'Check base team {base_team_name}, path: {base_team_path}, dir: {base_teams_dir}')
 
-
         #  -- check if base team already exists
         if os.path.exists(base_team_path) and \
             not os.path.exists(os.path.join(base_team_path, 'start.sh')):
-            
+
             self.logger.debug(f'Base team {base_team_name} already exists')
             self.logger.error(f'Base team {base_team_name} start.sh not found')
             Tools.remove_dir(base_team_path)
-                
 
         #  -- check if base team dir is not a file
         if os.path.isfile(base_teams_dir):
             self.logger.error(f'Base teams dir {base_teams_dir} is a file')
             Tools.remove_dir(base_teams_dir)
 
-
-
         #  -- create base team dir if not exists
         if not os.path.exists(base_teams_dir):
             self.logger.info(f'Creating base teams directory: {base_teams_dir}')
             os.makedirs(base_teams_dir, exist_ok=True)
 
-        
-        base_team_zip_path = os.path.join(base_teams_dir, f'{base_team_name}.zip')
-        zip_file_downloaded = False
+        return base_teams_dir, base_team_path
 
-        self.logger.debug(f'Downloading base team {base_team_name} from storage')
-        try:
-            self.storage_client.download_file(
-                bucket_name,
-                file_name,
-                base_team_zip_path
-            )
-            zip_file_downloaded = True
-        except Exception as e:
-            self.logger.error(f'Failed to download {base_team_name}: {e}')
-            return False, f'Failed to download {base_team_name}: {e}'
+    def is_base_team_installed(self, base_team_name: str):
+        base_team_path = os.path.join(self.data_dir, DataDir.base_team_dir_name, base_team_name)
+        return os.path.exists(os.path.join(base_team_path, 'start.sh'))
 
+    def install_base_team_zip(self, base_team_name: str, base_team_zip_path: str):
+        base_teams_dir = os.path.join(self.data_dir, DataDir.base_team_dir_name)
+        base_team_path = os.path.join(base_teams_dir, base_team_name)
 
-        if not zip_file_downloaded:
-            self.logger.info(f'Downloading base team from storage')
-            return False, 'Failed to download base team from storage'
-
-        if zip_file_downloaded:
-            self.logger.debug(f'Unzip base team {base_team_name}')
-            Tools.unzip_file(base_team_zip_path, base_teams_dir)
-            os.remove(base_team_zip_path)
-
-        if os.path.exists(os.path.join(base_team_path)):
-            self.logger.debug(f'Setting permissions for base team {base_team_name}')
-            Tools.set_permissions_recursive(base_team_path, 0o777)
+        self.logger.debug(f'Unzip base team {base_team_name}')
+        Tools.unzip_file(base_team_zip_path, base_teams_dir, Tools.base_team_file_mode)
+        os.remove(base_team_zip_path)
 
         self.logger.debug(f'Check base team {base_team_name} start.sh')
         if not os.path.exists(os.path.join(base_team_path, 'start.sh')):
@@ -294,75 +447,94 @@ class RunnerManager:
             return False, f'Base team {base_team_name} start.sh not found'
 
         return True, "Base team updated successfully"
-    
-    async def update_base_url(
-            self, 
-            base_team_name: str,
-            download_url:str
-        ):
-        self.logger.info(f'GameRunnerManager update_base: {base_team_name}, github')
-
 
-        base_teams_dir = os.path.join(self.data_dir, DataDir.base_team_dir_name)
-        base_team_path = os.path.join(base_teams_dir, base_team_name)
-        self.logger.debug(f'Check base team {base_team_name}, path: {base_team_path}, dir: {base_teams_dir}')
-
-
-        #  -- check if base team already exists
-        if os.path.exists(base_team_path) and \
-            not os.path.exists(os.path.join(base_team_path, 'start.sh')):
-            
-            self.logger.debug(f'Base team {base_team_name} already exists')
-            self.logger.error(f'Base team {base_team_name} start.sh not found')
-            Tools.remove_dir(base_team_path)
-                
-
-        #  -- check if base team dir is not a file
-        if os.path.isfile(base_teams_dir):
-            self.logger.error(f'Base teams dir {base_teams_dir} is a file')
-            Tools.remove_dir(base_teams_dir)
-
-
-
-        #  -- create base team dir if not exists
-        if not os.path.exists(base_teams_dir):
-            self.logger.info(f'Creating base teams directory: {base_teams_dir}')
-            os.makedirs(base_teams_dir, exist_ok=True)
-
-        
+    def sync_base_team(self, base_team_name: str, source: str, download, conditional: bool):
+        # download is called as download(zip_path, etag, last_modified) -> (modified, etag, last_modified)
+        base_teams_dir, base_team_path = self.prepare_base_teams_dir(base_team_name)
         base_team_zip_path = os.path.join(base_teams_dir, f'{base_team_name}.zip')
-        zip_file_downloaded = False
 
-        self.logger.debug(f'Downloading base team {base_team_name} from url')
+        validators = None
+        if conditional and self.is_base_team_installed(base_team_name):
+            validators = self.download_metadata.get(base_team_name, source)
+        etag = validators['etag'] if validators else None
+        last_modified = validators['last_modified'] if validators else None
+
+        self.logger.debug(f'Downloading base team {base_team_name} from {source}')
         try:
-            with requests.get(download_url, stream=True) as r:
-                r.raise_for_status()
-                with open(base_team_zip_path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                zip_file_downloaded = True
+            modified, etag, last_modified = download(base_team_zip_path, etag, last_modified)
         except Exception as e:
             self.logger.error(f'Failed to download {base_team_name}: {e}')
             return False, f'Failed to download {base_team_name}: {e}'
 
+        if not modified:
+            self.logger.info(f'Base team {base_team_name} is up to date')
+            return True, "Base team is up to date"
 
-        if not zip_file_downloaded:
-            self.logger.info(f'Downloading base team from url')
-            return False, 'Failed to download base team from url'
+        self.download_metadata.remove(base_team_name)
+        res, message = self.install_base_team_zip(base_team_name, base_team_zip_path)
+        if res:
+            self.download_metadata.set(base_team_name, source, etag, last_modified)
+        return res, message
 
-        if zip_file_downloaded:
-            self.logger.debug(f'Unzip base team {base_team_name}')
-            Tools.unzip_file(base_team_zip_path, base_teams_dir)
-            os.remove(base_team_zip_path)
+    async def update_base_minio(
+            self, 
+            base_team_name: str, 
+            bucket_name: str,
+            file_name: str,
+            conditional: bool = False
+        ):
+        self.logger.info(f'GameRunnerManager update_base: {base_team_name}, minio')
 
-        if os.path.exists(os.path.join(base_team_path)):
-            self.logger.debug(f'Setting permissions for base team {base_team_name}')
-            Tools.set_permissions_recursive(base_team_path, 0o777)
+        def download(base_team_zip_path, etag, last_modified):
+            return self.storage_client.download_file_resumable(bucket_name, file_name, base_team_zip_path, etag)
 
-        self.logger.debug(f'Check base team {base_team_name} start.sh')
-        if not os.path.exists(os.path.join(base_team_path, 'start.sh')):
-            self.logger.error(f'Base team {base_team_name} start.sh not found')
-            Tools.remove_dir(base_team_path)
-            return False, f'Base team {base_team_name} start.sh not found'
+        async with ArtifactLocks.base_team(base_team_name):
+            return await asyncio.to_thread(self.sync_base_team, base_team_name,
+                                           f'minio:{bucket_name}/{file_name}', download, conditional)
 
-        return True, "Base team updated successfully"
+    async def update_base_url(
+            self, 
+            base_team_name: str,
+            download_url: str,
+            conditional: bool = False
+        ):
+        self.logger.info(f'GameRunnerManager update_base: {base_team_name}, url')
+
+        def download(base_team_zip_path, etag, last_modified):
+            return Downloader.download_url(download_url, base_team_zip_path, etag, last_modified)
+
+        async with ArtifactLocks.base_team(base_team_name):
+            return await asyncio.to_thread(self.sync_base_team, base_team_name,
+                                           f'url:{download_url}', download, conditional)
+
+    async def update_base_team(self, base_team: dict):
+        # one entry of settings['base_teams']
+        base_team_name = base_team['name']
+        if self.fake_server is not None:
+            return True, "Fake server, base team is not needed"
+        if not base_team.get('force_pull', False) and self.is_base_team_installed(base_team_name):
+            self.logger.info(f'Base team {base_team_name} already exists, skipping download')
+            return True, "Base team already exists"
+        download = base_team['download']
+        if download['type'] == 'url':
+            self.logger.info(f"Downloading base team {base_team_name} from {download['url']}")
+            return await self.update_base_url(base_team_name, download['url'], conditional=True)
+        elif download['type'] == 'minio':
+            self.logger.info(f"Downloading base team {base_team_name} from Minio")
+            return await self.update_base_minio(base_team_name, download['bucket'], download['object'], conditional=True)
+        return False, f"Unknown download type {download['type']}"
+
+    async def update_servers(self):
+        if self.fake_server is not None:
+            return []
+        return await self.server_cache.update_all()
+
+    async def update_base_teams(self, base_teams: list[dict]):
+        results = await asyncio.gather(*[self.update_base_team(base_team) for base_team in base_teams],
+                                       return_exceptions=True)
+        for base_team, result in zip(base_teams, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error on downloading team {base_team['name']}: {result}")
+            elif not result[0]:
+                self.logger.error(f"Error on downloading team {base_team['name']}: {result[1]}")
+        return results
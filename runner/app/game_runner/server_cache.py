@@ -0,0 +1,193 @@
+import os
+import re
+import shutil
+import asyncio
+import logging
+import subprocess
+from data_dir import DataDir
+from storage.storage_client import StorageClient
+from storage.downloader import Downloader
+from storage.download_metadata import DownloadMetadata
+from game_runner.artifact_locks import ArtifactLocks
+
+
+class ServerCache:
+    """
+    The rcssserver builds of the host, side by side in data/server/versions/<version>, selected per game
+    with GameInfoMessage.server_version. The builds of the config (servers) are fetched at startup, any other
+    version is fetched from the server bucket (rcssserver-<version>) the first time a game asks for it and
+    kept for the next games, so a game asking for a new version needs neither a restart nor a new download
+    on every game. AppImage builds are extracted once, the games run the extracted AppRun and do
+    not mount the image every time.
+    Without a version (and without default_server_version) a game runs the single data/server/rcssserver.
+    """
+    version_pattern = re.compile(r'\w[\w.\-]*')
+    binary_name = 'rcssserver'
+    extracted_dir_name = 'squashfs-root'
+    appimage_magic = b'AI\x02'  # at offset 8 of an AppImage
+    extract_timeout = 300
+
+    def __init__(self, data_dir: str, storage_client: StorageClient, download_metadata: DownloadMetadata,
+                 servers: list[dict] = None, default_version: str = None):
+        self.logger = logging.getLogger(__name__)
+        self.data_dir = data_dir
+        self.storage_client = storage_client
+        self.download_metadata = download_metadata
+        self.servers: dict[str, dict] = {}
+        for server in servers or []:
+            self.servers[ServerCache.check_version(server['version'])] = server
+        self.default_version = ServerCache.check_version(default_version) if default_version else None
+
+    @staticmethod
+    def check_version(version) -> str:
+        version = str(version)
+        if ServerCache.version_pattern.fullmatch(version) is None:
+            raise ValueError(f'Invalid server version {version!r}')
+        return version
+
+    def resolve(self, version: str = None):
+        """The version a game runs, None for the single data/server/rcssserver. Raises ValueError for invalid names."""
+        version = version or self.default_version
+        return ServerCache.check_version(version) if version else None
+
+    def get_legacy_path(self) -> str:
+        return os.path.join(self.data_dir, DataDir.server_dir_name, ServerCache.binary_name)
+
+    def get_version_dir(self, version: str) -> str:
+        return os.path.join(self.data_dir, DataDir.server_dir_name, DataDir.server_versions_dir_name, version)
+
+    def get_path(self, version: str) -> str:
+        """The executable of an installed version: the extracted AppRun of an AppImage, the binary otherwise."""
+        version_dir = self.get_version_dir(version)
+        app_run = os.path.join(version_dir, ServerCache.extracted_dir_name, 'AppRun')
+        if os.path.exists(app_run):
+            return app_run
+        return os.path.join(version_dir, ServerCache.binary_name)
+
+    def is_installed(self, version: str) -> bool:
+        return os.path.exists(self.get_path(version))
+
+    def get_versions(self) -> list[str]:
+        versions_dir = os.path.join(self.data_dir, DataDir.server_dir_name, DataDir.server_versions_dir_name)
+        if not os.path.isdir(versions_dir):
+            return []
+        return sorted(version for version in os.listdir(versions_dir) if self.is_installed(version))
+
+    def get_download(self, version: str):
+        """Returns (source, download) of the version, download(path, etag, last_modified) -> (modified, etag, last_modified)."""
+        server = self.servers.get(version)
+        download = server['download'] if server is not None else \
+            {'type': 'minio', 'object': f'{ServerCache.binary_name}-{version}'}
+        if download['type'] == 'url':
+            url = download['url']
+            return f'url:{url}', lambda path, etag, last_modified: Downloader.download_url(url, path, etag, last_modified)
+        if download['type'] == 'minio':
+            if self.storage_client is None:
+                raise FileNotFoundError(f'Server {version} is not installed and the runner has no storage')
+            bucket_name = download.get('bucket') or self.storage_client.server_bucket_name
+            object_name = download['object']
+            return f'minio:{bucket_name}/{object_name}', lambda path, etag, last_modified: \
+                self.storage_client.download_file_resumable(bucket_name, object_name, path, etag)
+        raise ValueError(f"Unknown download type {download['type']} of server {version}")
+
+    @staticmethod
+    def is_appimage(file_path: str) -> bool:
+        with open(file_path, 'rb') as f:
+            return f.read(11)[8:] == ServerCache.appimage_magic
+
+    def extract(self, version: str, binary_path: str):
+        # extracted next to the binary and swapped in, a game never sees a half extracted build
+        version_dir = self.get_version_dir(version)
+        tmp_dir = os.path.join(version_dir, '.extract')
+        old_dir = os.path.join(version_dir, '.old')
+        target_dir = os.path.join(version_dir, ServerCache.extracted_dir_name)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            subprocess.run([binary_path, '--appimage-extract'], cwd=tmp_dir, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=ServerCache.extract_timeout)
+            # the old tree is renamed aside and removed only once the new one is in place: a game starting
+            # meanwhile finds one of the two trees (or the AppImage between the renames), never a half deleted one
+            if os.path.exists(target_dir):
+                os.replace(target_dir, old_dir)
+            os.replace(os.path.join(tmp_dir, ServerCache.extracted_dir_name), target_dir)
+            self.logger.info(f'Server {version} extracted to {target_dir}')
+        except Exception as e:
+            # the AppImage can still run by itself
+            self.logger.warning(f'Failed to extract server {version}, running the AppImage: {e}')
+            shutil.rmtree(target_dir, ignore_errors=True)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    def sync(self, version: str, conditional: bool):
+        """Downloads (only if changed when conditional) and installs the version, returns (success, message)."""
+        source, download = self.get_download(version)
+        metadata_name = f'server/{version}'
+        version_dir = self.get_version_dir(version)
+        binary_path = os.path.join(version_dir, ServerCache.binary_name)
+        download_path = f'{binary_path}.download'
+        os.makedirs(version_dir, exist_ok=True)
+
+        validators = None
+        if conditional and self.is_installed(version):
+            validators = self.download_metadata.get(metadata_name, source)
+        etag = validators['etag'] if validators else None
+        last_modified = validators['last_modified'] if validators else None
+
+        self.logger.debug(f'Downloading server {version} from {source}')
+        try:
+            modified, etag, last_modified = download(download_path, etag, last_modified)
+        except Exception as e:
+            self.logger.error(f'Failed to download server {version}: {e}')
+            return False, f'Failed to download server {version}: {e}'
+        if not modified:
+            self.logger.info(f'Server {version} is up to date')
+            return True, 'Server is up to date'
+
+        self.download_metadata.remove(metadata_name)
+        os.chmod(download_path, 0o755)
+        # a running game keeps the old inode, the next games start the new build
+        os.replace(download_path, binary_path)
+        extract = self.servers.get(version, {}).get('extract', True)
+        if extract and ServerCache.is_appimage(binary_path):
+            self.extract(version, binary_path)
+        else:
+            shutil.rmtree(os.path.join(version_dir, ServerCache.extracted_dir_name), ignore_errors=True)
+        self.download_metadata.set(metadata_name, source, etag, last_modified)
+        self.logger.info(f'Server {version} installed from {source}')
+        return True, f'Server {version} installed'
+
+    async def prepare(self, version: str = None) -> str:
+        """Returns the executable of the version, fetched first if the host does not have it yet."""
+        version = self.resolve(version)
+        if version is None:
+            return self.get_legacy_path()
+        if self.is_installed(version):
+            return self.get_path(version)
+        async with ArtifactLocks.server(version):
+            # another game (or worker) may have installed it meanwhile
+            if not self.is_installed(version):
+                res, message = await asyncio.to_thread(self.sync, version, False)
+                if not res:
+                    raise FileNotFoundError(message)
+        return self.get_path(version)
+
+    async def update(self, version: str):
+        # one entry of settings['servers'], installed ones are only revalidated with force_pull
+        if not self.servers[version].get('force_pull', False) and self.is_installed(version):
+            self.logger.info(f'Server {version} already exists, skipping download')
+            return True, 'Server already exists'
+        async with ArtifactLocks.server(version):
+            return await asyncio.to_thread(self.sync, version, True)
+
+    async def update_all(self):
+        versions = list(self.servers)
+        results = await asyncio.gather(*[self.update(version) for version in versions], return_exceptions=True)
+        for version, result in zip(versions, results):
+            if isinstance(result, Exception):
+                self.logger.error(f'Error on downloading server {version}: {result}')
+            elif not result[0]:
+                self.logger.error(f'Error on downloading server {version}: {result[1]}')
+        return results
@@ -0,0 +1,106 @@
+import re
+import logging
+
+
+class ServerPreset:
+    # a named, validated set of rcssserver options, compiled once into its command line arguments
+    def __init__(self, name: str, params: dict[str, str]):
+        self.name = name
+        self.params = params
+        self.args = tuple(f'--server::{param}={value}' for param, value in params.items())
+        self.command_line = ' '.join(self.args)
+
+    def __repr__(self):
+        return f'ServerPreset({self.name}: {self.command_line})'
+
+
+class ServerPresets:
+    """
+    The server presets of the runner config (server_presets), referenced by name in GameInfoMessage.server_preset.
+    Every option is checked against the known rcssserver options when the runner starts, so a game can not
+    reach the server with a misspelled or malformed option. The free-form GameInfoMessage.server_config is
+    checked the same way for every game.
+    """
+    bool_values = {'true': 'true', 'on': 'true', '1': 'true', 'false': 'false', 'off': 'false', '0': 'false'}
+    # rcssserver options a preset may set, with their type
+    known_params = {
+        # game length
+        'half_time': int, 'nr_normal_halfs': int, 'nr_extra_halfs': int, 'extra_half_time': int,
+        'penalty_shoot_outs': bool, 'golden_goal': bool, 'simulator_step': int, 'slow_down_factor': int,
+        # penalties
+        'pen_nr_kicks': int, 'pen_max_extra_kicks': int, 'pen_before_setup_wait': int, 'pen_setup_wait': int,
+        'pen_ready_wait': int, 'pen_taken_wait': int, 'pen_random_winner': bool, 'pen_allow_mult_kicks': bool,
+        'pen_coach_moves_players': bool, 'pen_dist_x': float, 'pen_max_goalie_dist_x': float,
+        # referee and waits
+        'auto_mode': bool, 'synch_mode': bool, 'connect_wait': int, 'kick_off_wait': int, 'game_over_wait': int,
+        'drop_ball_time': int, 'use_offside': bool, 'forbid_kick_off_offside': bool, 'free_kick_faults': bool,
+        'back_passes': bool, 'proper_goal_kicks': bool, 'max_goal_kicks': int, 'start_goal_l': int,
+        'start_goal_r': int, 'fullstate_l': bool, 'fullstate_r': bool, 'keepaway': bool,
+        # coaches
+        'coach': bool, 'coach_w_referee': bool, 'say_coach_cnt_max': int, 'say_coach_msg_size': int,
+        'freeform_send_period': int, 'freeform_wait_period': int, 'clang_win_size': int,
+        # logging
+        'text_logging': bool, 'game_log_version': int, 'game_log_compression': int,
+        'text_log_compression': int, 'game_log_dated': bool, 'text_log_dated': bool, 'record_messages': bool,
+        'send_comms': bool, 'profile': bool, 'log_times': bool, 'verbose': bool,
+        # noise and wind
+        'wind_none': bool, 'wind_random': bool, 'wind_force': float, 'wind_dir': float, 'wind_rand': float,
+        'team_actuator_noise': bool, 'player_rand': float, 'ball_rand': float,
+    }
+    # options the runner sets for every game (ports, log dirs, team start commands) or depends on (the game log)
+    reserved_params = {'port', 'coach_port', 'olcoach_port', 'game_log_dir', 'text_log_dir',
+                       'team_l_start', 'team_r_start', 'game_logging'}
+    arg_pattern = re.compile(r'--server::(\w+)=(\S+)')
+
+    def __init__(self, presets: dict[str, dict], default_preset: str):
+        self.logger = logging.getLogger(__name__)
+        self.presets: dict[str, ServerPreset] = {}
+        for name, params in presets.items():
+            try:
+                self.presets[name] = ServerPreset(name, ServerPresets.validate_params(params or {}))
+            except ValueError as e:
+                raise ValueError(f'Server preset {name}: {e}') from e
+            self.logger.info(f'Server preset {self.presets[name]}')
+        if default_preset not in self.presets:
+            raise ValueError(f'Default server preset {default_preset} is not declared in server_presets')
+        self.default_preset = default_preset
+
+    @staticmethod
+    def validate_value(param: str, value) -> str:
+        if param in ServerPresets.reserved_params:
+            raise ValueError(f'server::{param} is managed by the runner')
+        param_type = ServerPresets.known_params.get(param)
+        if param_type is None:
+            raise ValueError(f'server::{param} is not a known rcssserver option')
+        text = str(value).strip().lower() if param_type is bool else str(value).strip()
+        if param_type is bool:
+            if text not in ServerPresets.bool_values:
+                raise ValueError(f'server::{param} must be true or false, got {value!r}')
+            return ServerPresets.bool_values[text]
+        try:
+            param_type(text)
+        except ValueError:
+            raise ValueError(f'server::{param} must be {param_type.__name__}, got {value!r}')
+        return text
+
+    @staticmethod
+    def validate_params(params: dict) -> dict[str, str]:
+        return {param: ServerPresets.validate_value(param, value) for param, value in params.items()}
+
+    @staticmethod
+    def parse_server_config(server_config: str) -> dict[str, str]:
+        """Validates the free-form server_config of a game ('--server::name=value ...') and returns its options."""
+        params = {}
+        for token in (server_config or '').split():
+            match = ServerPresets.arg_pattern.fullmatch(token)
+            if match is None:
+                raise ValueError(f'Invalid server_config option {token!r}, expected --server::<name>=<value>')
+            # the last occurrence wins, like on the rcssserver command line
+            params[match.group(1)] = ServerPresets.validate_value(match.group(1), match.group(2))
+        return params
+
+    def get(self, name: str = None) -> ServerPreset:
+        preset = self.presets.get(name or self.default_preset)
+        if preset is None:
+            raise ValueError(f'Unknown server preset {name}, available: {", ".join(self.presets)}')
+        return preset
@@ -5,7 +5,13 @@ import sys
 from utils.config import get_config_file, get_settings
 from utils.args_helper import ArgsHelper
 from utils.logging_config import get_logging_config
+from utils.tools import Tools
 from game_runner.runner_manager import RunnerManager
+from game_runner.fake_server import FakeServer
+from game_runner.game_watchdog import WatchdogConfig
+from game_runner.host_registry import HostRegistry
+from game_runner.server_presets import ServerPresets
+from supervisor import Supervisor, SupervisorApi
 import os
 from fast_api_app import FastApiApp
 import argparse
@@ -25,7 +31,7 @@ def get_args():
     parser.add_argument("--data-dir", type=str, help="Directory to store data files")
     parser.add_argument("--log-dir", type=str, help="Directory to store log files")
     parser.add_argument("--api-key", type=str, help="API key for authentication")
-    parser.add_argument("--max_games_count", type=int, help="Maximum number of games to run")
+    parser.add_argument("--max-games-count", "--max_games_count", dest="max_games_count", type=int, help="Maximum number of games to run")
     parser.add_argument("--use-fast-api", type=ArgsHelper.str_to_bool, help="Use FastAPI app (true/false or 1/0)")
     parser.add_argument("--fast-api-ip", type=str, help="IP to run FastAPI app")
     parser.add_argument("--fast-api-port", type=int, help="Port to run FastAPI app")
@@ -47,6 +53,14 @@ def get_args():
     parser.add_argument("--base-team-bucket-name", type=str, help="Team bucket name")
     parser.add_argument("--team-config-bucket-name", type=str, help="Team config bucket name")
     parser.add_argument("--game-log-bucket-name", type=str, help="Match bucket name")
+    parser.add_argument("--use-game-watchdog", type=ArgsHelper.str_to_bool, help="Kill games that stall or exceed their wall clock budget (true/false or 1/0)")
+    parser.add_argument("--drain-timeout", type=float, help="Seconds to wait for the running games on drain (SIGTERM) before stopping them")
+    parser.add_argument("--default-server-preset", type=str, help="Server preset of the games that do not name one")
+    parser.add_argument("--default-server-version", type=str, help="rcssserver version of the games that do not name one")
+    parser.add_argument("--use-fake-server", type=ArgsHelper.str_to_bool, help="Use the fake rcssserver and base teams for load testing (true/false or 1/0)")
+    parser.add_argument("--workers", type=int, help="Number of worker processes, more than 1 runs a supervisor that registers the host as one runner")
+    parser.add_argument("--worker-index", type=int, help=argparse.SUPPRESS)  # set by the supervisor
+    parser.add_argument("--runner-id", type=int, help=argparse.SUPPRESS)  # set by the supervisor
     parser.add_argument("--config", type=str, help="default.yml config file", default="default.yml")
     args, unknown = parser.parse_known_args()
     return args
@@ -59,15 +73,22 @@ data_dir = settings['config']['data_dir']
 log_dir = settings['config']['log_dir']
 api_key = settings['config']['api_key']
 api_key_name = "api-key"
+worker_index = settings['config'].get('worker_index')
+is_supervisor = worker_index is None and settings['config']['workers'] > 1
 
 # ---------------------------- 
 os.makedirs(log_dir, exist_ok=True)
-logging.config.dictConfig(get_logging_config(log_dir))
+logging.config.dictConfig(get_logging_config(log_dir, 'app.log' if worker_index is None else f'worker{worker_index}.log'))
 
-logging.info('GameRunner started')
+logging.info('GameRunner started' if worker_index is None else f'GameRunner worker {worker_index} started')
 logging.debug(f'args: {args}')
 logging.info(settings)
 
+# ---------------------------- UNZIP
+base_team_file_mode = str(settings['config']['base_team_file_mode'])
+Tools.base_team_file_mode = None if base_team_file_mode == 'zip' else int(base_team_file_mode, 8)
+Tools.unzip_workers = settings['config']['unzip_workers']
+
 # ---------------------------- MINIO CLIENT
 minio_client = None
 if settings['config']['use_minio']:
@@ -75,7 +96,10 @@ if settings['config']['use_minio']:
         server_bucket_name=settings['config']['server_bucket_name'],
         base_team_bucket_name=settings['config']['base_team_bucket_name'],
         team_config_bucket_name=settings['config']['team_config_bucket_name'],
-        game_log_bucket_name=settings['config']['game_log_bucket_name']
+        game_log_bucket_name=settings['config']['game_log_bucket_name'],
+        upload_part_size=settings['config']['upload_part_size_mb'] * 1024 * 1024,
+        upload_parallelism=settings['config']['upload_parallelism'],
+        upload_retries=settings['config']['upload_retries']
     )
 
     minio_client.init(endpoint=settings['config']['minio_endpoint'],
@@ -97,11 +121,12 @@ if settings['config']['connect_to_tournament_manager']:
         settings['config']['tournament_manager_port'], 
         settings['config']['tournament_manager_api_key']
     )
-runner_id = None
+runner_id = settings['config'].get('runner_id')
 
 async def send_register_message():
     global runner_id
-    while settings['config']['connect_to_tournament_manager']:
+    # the workers of a supervisor use the runner id of the supervisor
+    while settings['config']['connect_to_tournament_manager'] and worker_index is None:
         try:
             register_resp = await message_sender.send_message(
                 "from_runner/register",
@@ -127,50 +152,60 @@ async def main():
     global runner_id
     await send_register_message()
 
+    fake_server = None
+    if settings['config']['use_fake_server']:
+        fake_server = FakeServer(
+            duration=settings['config']['fake_game_duration'],
+            rcg_size=settings['config']['fake_rcg_size']
+        )
+
+    watchdog_config = None
+    if settings['config']['use_game_watchdog']:
+        watchdog_config = WatchdogConfig(
+            start_timeout=settings['config']['watchdog_start_timeout'],
+            stall_timeout=settings['config']['watchdog_stall_timeout'],
+            budget_margin=settings['config']['watchdog_budget_margin']
+        )
+
+    host_registry = None
+    if worker_index is not None:
+        host_registry = HostRegistry(data_dir, settings['config']['max_games_count'])
+
     game_runner_manager = RunnerManager(
         data_dir=data_dir, 
         storage_client=minio_client, 
         message_sender=message_sender, 
-        runner_id=runner_id
+        runner_id=runner_id,
+        fake_server=fake_server,
+        watchdog_config=watchdog_config,
+        drain_timeout=settings['config']['drain_timeout'],
+        drain_kill_timeout=settings['config']['drain_kill_timeout'],
+        host_registry=host_registry,
+        report_status=host_registry is None,
+        server_presets=ServerPresets(settings['server_presets'], settings['config']['default_server_preset']),
+        servers=settings['servers'],
+        default_server_version=settings['config']['default_server_version']
     )
 
 
     # ---------------------------- DOWNLOAD BASE TEAMS
-    logging.info('Downloading base teams')
-    for base_team in settings['base_teams']:
-        if base_team['download']['type'] == 'url':
-            logging.info(f"Downloading base team {base_team['name']} from {base_team['download']['url']}")
-            try:
-                await game_runner_manager.update_base_url(
-                    base_team_name=base_team['name'], 
-                    download_url=base_team['download']['url']
-                )
-            except Exception as e:
-                logging.error(f"Error on downloading team: {e}")
-                
-
-        elif base_team['download']['type'] == 'minio':
-            logging.info(f"Downloading base team {base_team['name']} from Minio")
-            try:
-                await game_runner_manager.update_base_minio(
-                    base_team_name=base_team['name'], 
-                    bucket_name=base_team['download']['bucket'],
-                    file_name=base_team['download']['object']
-                )
-            except Exception as e:
-                logging.error(f"Error on downloading team: {e}")
-                
-
-
-
-
-    game_runner_manager.set_available_games_count(2)
+    # all bases are fetched in parallel, unchanged ones are skipped (ETag/Last-Modified)
+    # and interrupted downloads are resumed, the supervisor has already done it for its workers
+    if host_registry is None:
+        logging.info('Downloading servers and base teams')
+        await asyncio.gather(game_runner_manager.update_servers(),
+                             game_runner_manager.update_base_teams(settings['base_teams']))
+    else:
+        host_registry.register_worker(worker_index, settings['config']['fast_api_port'])
+
+    game_runner_manager.set_available_games_count(settings['config']['max_games_count'])
 
     # download base teams by default
 
+    fast_api_app = FastApiApp(game_runner_manager, api_key, api_key_name, settings['config']['fast_api_port'])
+
     async def run_fastapi():
         logging.info('Starting FastAPI app')
-        fast_api_app = FastApiApp(game_runner_manager, api_key, api_key_name, settings['config']['fast_api_port'])
         await fast_api_app.run()
 
     async def run_rmq():
@@ -195,25 +230,89 @@ async def main():
         await asyncio.gather(*tasks, return_exceptions=True)
         loop.stop()
 
+    async def drain_or_shutdown(signal, loop):
+        # the first SIGTERM drains the runner (finish the running games, then exit), a second one shuts it down
+        if game_runner_manager.status in [RunnerStatusMessageEnum.DRAINING, RunnerStatusMessageEnum.STOPPED]:
+            await shutdown(signal, loop)
+            return
+        logging.info(f"Received exit signal {signal.name}, draining...")
+        await game_runner_manager.start_drain()
+
     loop = asyncio.get_running_loop()
 
-    signals = (signal.SIGINT, signal.SIGTERM)
-    for s in signals:
-        loop.add_signal_handler(s, lambda s=s: asyncio.create_task(shutdown(s, loop)))
+    loop.add_signal_handler(signal.SIGINT, lambda: asyncio.create_task(shutdown(signal.SIGINT, loop)))
+    loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(drain_or_shutdown(signal.SIGTERM, loop)))
 
-    try:
+    async def run_apps():
         if settings['config']['use_fast_api'] and settings['config']['use_rabbitmq']:
             await asyncio.gather(run_fastapi(), run_rmq())
         elif settings['config']['use_fast_api']:
             await run_fastapi()
         elif settings['config']['use_rabbitmq']:
             await run_rmq()
+
+    apps_task = asyncio.create_task(run_apps())
+    drained_task = asyncio.create_task(game_runner_manager.drained.wait())
+    try:
+        await asyncio.wait([apps_task, drained_task], return_when=asyncio.FIRST_COMPLETED)
+        if drained_task.done():
+            logging.info(f"Runner drained: {game_runner_manager.drain_report}")
+            # the consumer has already stopped, let the api server finish its requests
+            fast_api_app.stop()
+            await asyncio.wait([apps_task], timeout=10)
+        else:
+            apps_task.result()
     except Exception as e:
         logging.error(f"Error: {e}")
     finally:
-        loop.close()
+        for task in [apps_task, drained_task]:
+            task.cancel()
+        await asyncio.gather(apps_task, drained_task, return_exceptions=True)
+        await game_runner_manager.cancel_drain()
         logging.info("Successfully shut down the application.")
 
 
+async def supervise():
+    await send_register_message()
+
+    # the servers and the base teams are shared by the workers, they are installed once before starting them
+    if not settings['config']['use_fake_server']:
+        cache_manager = RunnerManager(data_dir=data_dir, storage_client=minio_client, message_sender=None,
+                                      runner_id=runner_id, servers=settings['servers'],
+                                      default_server_version=settings['config']['default_server_version'])
+        logging.info('Downloading servers and base teams')
+        await asyncio.gather(cache_manager.update_servers(),
+                             cache_manager.update_base_teams(settings['base_teams']))
+
+    supervisor = Supervisor(
+        worker_args=sys.argv[1:],
+        workers_count=settings['config']['workers'],
+        first_worker_port=settings['config']['fast_api_port'] + 1,
+        host_registry=HostRegistry(data_dir, settings['config']['max_games_count']),
+        runner_id=runner_id,
+        message_sender=message_sender,
+        api_key=api_key,
+        api_key_name=api_key_name
+    )
+    supervisor_api = SupervisorApi(supervisor, api_key, api_key_name, settings['config']['fast_api_port'])
+
+    def on_signal(sig):
+        # the first SIGTERM drains the workers, a second one (or SIGINT) shuts them down
+        logging.info(f"Received exit signal {sig.name}, sending it to the workers...")
+        supervisor.send_signal(signal.SIGINT if supervisor.stopping else sig)
+
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, on_signal, signal.SIGINT)
+    loop.add_signal_handler(signal.SIGTERM, on_signal, signal.SIGTERM)
+
+    api_task = asyncio.create_task(supervisor_api.run())
+    try:
+        await supervisor.run()
+    finally:
+        supervisor_api.stop()
+        await asyncio.wait([api_task], timeout=10)
+        logging.info("Successfully shut down the supervisor.")
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(supervise() if is_supervisor else main())
@@ -24,6 +24,7 @@ class RabbitMQConsumer:
         self.connection = None
         self.channel = None
         self.shared_queue = None
+        self.consumer_tag = None
         self.message_queue = asyncio.Queue()
         self.requested_command: RunnerCommandMessageEnum = None
         self.paused = False
@@ -62,10 +63,12 @@ class RabbitMQConsumer:
         elif self.requested_command == RunnerCommandMessageEnum.RESUME:
             self.logger.info("Received RESUME command. Resuming...")
             self.paused = False
+        elif self.requested_command == RunnerCommandMessageEnum.DRAIN:
+            self.logger.info("Received DRAIN command. No more messages will be taken...")
 
     async def process_messages(self):
         try:
-            while self.requested_command != RunnerCommandMessageEnum.STOP:
+            while self.requested_command not in [RunnerCommandMessageEnum.STOP, RunnerCommandMessageEnum.DRAIN]:
                 await self.check_requested_command()
                 if self.paused or self.requested_command == RunnerCommandMessageEnum.PAUSE:
                     self.logger.info("Pausing...")
@@ -81,7 +84,7 @@ class RabbitMQConsumer:
                     self.requested_command = None
                     await self.manager.update_status_to(RunnerStatusMessageEnum.RUNNING)
                 try:
-                    message = await self.message_queue.get_nowait()
+                    message = self.message_queue.get_nowait()
                 except asyncio.QueueEmpty:
                     self.logger.debug("No messages in queue. Waiting for 1 second...")
                     await asyncio.sleep(1)
@@ -126,13 +129,27 @@ class RabbitMQConsumer:
                         await handle_error(res.error, False)
                     else:
                         await message.ack()
-            await self.manager.update_status_to(RunnerStatusMessageEnum.STOPPED)
+            if self.requested_command == RunnerCommandMessageEnum.DRAIN:
+                # the manager finishes the running games and reports STOPPED
+                await self.stop_consuming()
+            else:
+                await self.manager.update_status_to(RunnerStatusMessageEnum.STOPPED)
         except Exception as e:
             self.logger.fatal(f"y Error: {e}")
             traceback.print_exc()
 
     async def start_consuming(self):
-        await self.shared_queue.consume(self.consume_shared_queue)
+        self.consumer_tag = await self.shared_queue.consume(self.consume_shared_queue)
+
+    async def stop_consuming(self):
+        if self.shared_queue is not None and self.consumer_tag is not None:
+            await self.shared_queue.cancel(self.consumer_tag)
+            self.consumer_tag = None
+        # give the messages this runner already received back to the queue for the other runners
+        while not self.message_queue.empty():
+            message = self.message_queue.get_nowait()
+            await message.nack(requeue=True)
+        self.logger.info("Stopped consuming the shared queue")
 
     async def run(self):
         await self.connect()
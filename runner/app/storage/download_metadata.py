@@ -0,0 +1,55 @@
+import json
+import os
+import threading
+import logging
+from utils.file_lock import FileLock
+
+
+class DownloadMetadata:
+    # keeps the validators (ETag / Last-Modified) of the last installed download of each artifact,
+    # so a restart can ask the source "has it changed?" instead of pulling the whole file again.
+    # The file is shared by the worker processes of the host: it is re-read under a file lock on every access
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(f'{file_path}.lock')
+        self.entries: dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r') as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            logging.error(f'Failed to load download metadata {self.file_path}: {e}')
+            self.entries = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.file_path) or '.', exist_ok=True)
+        tmp_file_path = f'{self.file_path}.tmp'
+        with open(tmp_file_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_file_path, self.file_path)
+
+    def get(self, name: str, source: str):
+        # validators are only meaningful for the source they were received from
+        with self.lock, self.file_lock:
+            self.load()
+            entry = self.entries.get(name)
+            if entry is None or entry.get('source') != source:
+                return None
+            return dict(entry)
+
+    def set(self, name: str, source: str, etag: str = None, last_modified: str = None):
+        with self.lock, self.file_lock:
+            self.load()
+            self.entries[name] = {'source': source, 'etag': etag, 'last_modified': last_modified}
+            self.save()
+
+    def remove(self, name: str):
+        with self.lock, self.file_lock:
+            self.load()
+            if self.entries.pop(name, None) is not None:
+                self.save()
@@ -1,4 +1,5 @@
 import requests
+import json
 import os
 from utils.tools import Tools
 import logging
@@ -75,6 +76,75 @@ class Downloader:
             print(f"Failed to download {file_name}: {e}")
             return False
 
+    @staticmethod
+    def download_url(url: str, target_path: str, etag: str = None, last_modified: str = None):
+        """
+        Conditional and resumable download of url to target_path.
+        etag/last_modified are the validators of the currently installed copy, if the server answers
+        304 the file is not downloaded. An interrupted download is kept in target_path.part and resumed
+        with a Range request as long as the remote file did not change (If-Range).
+        Returns (modified, etag, last_modified).
+        """
+        part_path = f'{target_path}.part'
+        part_meta_path = f'{part_path}.json'
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        offset = 0
+        part_meta = None
+        if os.path.exists(part_path) and os.path.exists(part_meta_path):
+            try:
+                with open(part_meta_path, 'r') as f:
+                    part_meta = json.load(f)
+            except Exception as e:
+                logging.warning(f'Ignoring broken partial download metadata {part_meta_path}: {e}')
+        if part_meta and (part_meta.get('etag') or part_meta.get('last_modified')):
+            offset = os.path.getsize(part_path)
+            headers['Range'] = f'bytes={offset}-'
+            headers['If-Range'] = part_meta.get('etag') or part_meta.get('last_modified')
+            logging.debug(f'Resuming download of {url} from byte {offset}')
+
+        os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+        with requests.get(url, headers=headers, stream=True, timeout=(10, 60)) as response:
+            if response.status_code == 304:
+                logging.info(f'{url} not modified, skipping download')
+                return False, etag, last_modified
+            if response.status_code == 416:
+                # the partial file does not match the remote one anymore, start over
+                logging.warning(f'Range not satisfiable for {url}, restarting download')
+                Downloader.remove_partial(target_path)
+                return Downloader.download_url(url, target_path, etag, last_modified)
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                new_etag = part_meta.get('etag')
+                new_last_modified = part_meta.get('last_modified')
+                mode = 'ab'
+            else:
+                new_etag = response.headers.get('ETag')
+                new_last_modified = response.headers.get('Last-Modified')
+                mode = 'wb'
+                with open(part_meta_path, 'w') as f:
+                    json.dump({'etag': new_etag, 'last_modified': new_last_modified}, f)
+
+            with open(part_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+
+        os.replace(part_path, target_path)
+        os.remove(part_meta_path)
+        logging.info(f'Downloaded {url} to {target_path}')
+        return True, new_etag, new_last_modified
+
+    @staticmethod
+    def remove_partial(target_path: str):
+        for path in (f'{target_path}.part', f'{target_path}.part.json'):
+            if os.path.exists(path):
+                os.remove(path)
+
     @staticmethod
     def download_server(output_dir: str):
         if SERVER_LINK['type'] == 'releases' and SERVER_LINK['file_type'] == 'appimage':
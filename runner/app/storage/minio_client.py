@@ -1,14 +1,28 @@
 from minio import Minio
+from minio.datatypes import Part
 from minio.error import S3Error
 from storage.storage_client import StorageClient
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import base64
+import hashlib
+import math
+import glob
+import os
 import time
 
 
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum size of every part except the last one
+
+
 class MinioClient(StorageClient):
-    def __init__(self, server_bucket_name, base_team_bucket_name, team_config_bucket_name, game_log_bucket_name):
+    def __init__(self, server_bucket_name, base_team_bucket_name, team_config_bucket_name, game_log_bucket_name,
+                 upload_part_size=16 * 1024 * 1024, upload_parallelism=4, upload_retries=3):
         super().__init__(server_bucket_name, base_team_bucket_name, team_config_bucket_name, game_log_bucket_name)
         self.client = None
+        self.upload_part_size = max(int(upload_part_size), MIN_PART_SIZE)
+        self.upload_parallelism = max(int(upload_parallelism), 1)
+        self.upload_retries = max(int(upload_retries), 1)
 
     def init(self, endpoint, access_key, secret_key, secure=True):
         self.client = Minio(
@@ -20,10 +34,53 @@ class MinioClient(StorageClient):
 
     def upload_file(self, bucket_name, file_path, object_name):
         try:
-            self.client.fput_object(bucket_name, object_name, file_path)
+            if os.path.getsize(file_path) <= self.upload_part_size:
+                self.client.fput_object(bucket_name, object_name, file_path)
+            else:
+                self.upload_file_multipart(bucket_name, file_path, object_name)
             logging.info(f"'{file_path}' is successfully uploaded as '{object_name}' in '{bucket_name}' bucket.")
+            return True
         except Exception as e:
             logging.error(f"Error occurred: {e}")
+            return False
+
+    def upload_file_multipart(self, bucket_name, file_path, object_name):
+        # fput_object has no per-part Content-MD5 or retry, so the parts go through the private multipart calls
+        # of the client. Their signatures are checked in tests/unittest/test_minio_client.py, minio is pinned to
+        # the 7.2 line in pyproject.toml
+        file_size = os.path.getsize(file_path)
+        part_count = math.ceil(file_size / self.upload_part_size)
+        logging.debug(f"Uploading '{file_path}' in {part_count} parts of {self.upload_part_size} bytes, "
+                      f"{self.upload_parallelism} in parallel")
+        upload_id = self.client._create_multipart_upload(bucket_name, object_name,
+                                                         {'Content-Type': 'application/octet-stream'})
+        try:
+            with ThreadPoolExecutor(max_workers=self.upload_parallelism) as executor:
+                parts = list(executor.map(
+                    lambda part_number: self.upload_part(bucket_name, file_path, object_name, upload_id, part_number),
+                    range(1, part_count + 1)
+                ))
+            self.client._complete_multipart_upload(bucket_name, object_name, upload_id, parts)
+        except Exception:
+            self.client._abort_multipart_upload(bucket_name, object_name, upload_id)
+            raise
+
+    def upload_part(self, bucket_name, file_path, object_name, upload_id, part_number):
+        with open(file_path, 'rb') as f:
+            f.seek((part_number - 1) * self.upload_part_size)
+            data = f.read(self.upload_part_size)
+        # the server rejects the part (BadDigest) if it does not match Content-MD5
+        headers = {'Content-MD5': base64.b64encode(hashlib.md5(data).digest()).decode()}
+        for attempt in range(1, self.upload_retries + 1):
+            try:
+                etag = self.client._upload_part(bucket_name, object_name, data, headers, upload_id, part_number)
+                return Part(part_number, etag)
+            except Exception as e:
+                if attempt == self.upload_retries:
+                    raise
+                logging.warning(f"Uploading part {part_number} of '{object_name}' failed ({e}), "
+                                f"retry {attempt}/{self.upload_retries - 1}")
+                time.sleep(2 ** (attempt - 1))
 
     def download_file(self, bucket_name, object_name, file_path):
         try:
@@ -35,6 +92,44 @@ class MinioClient(StorageClient):
             logging.error(f"Error occurred: {e}")
             return False
 
+    def download_file_resumable(self, bucket_name, object_name, file_path, etag=None):
+        """
+        Conditional and resumable download, etag is the one of the currently installed copy.
+        The object is streamed to file_path.<etag>.part so an interrupted download of the same
+        version is resumed from where it stopped. Returns (modified, etag, last_modified).
+        """
+        stat = self.client.stat_object(bucket_name, object_name)
+        last_modified = stat.last_modified.isoformat() if stat.last_modified else None
+        if etag is not None and stat.etag == etag:
+            logging.info(f"'{object_name}' in '{bucket_name}' bucket not modified, skipping download")
+            return False, stat.etag, last_modified
+
+        part_path = f'{file_path}.{stat.etag}.part'
+        for stale_part in glob.glob(f'{glob.escape(file_path)}.*.part'):
+            if stale_part != part_path:
+                os.remove(stale_part)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset > stat.size:
+            os.remove(part_path)
+            offset = 0
+
+        if offset < stat.size:
+            logging.debug(f"Downloading '{object_name}' from '{bucket_name}' bucket to '{file_path}' from byte {offset}")
+            response = self.client.get_object(bucket_name, object_name, offset=offset)
+            try:
+                with open(part_path, 'ab' if offset else 'wb') as f:
+                    for data in response.stream(amt=1024 * 1024):
+                        f.write(data)
+            finally:
+                response.close()
+                response.release_conn()
+        else:
+            open(part_path, 'ab').close()
+
+        os.replace(part_path, file_path)
+        logging.info(f"'{object_name}' is successfully downloaded to '{file_path}' from '{bucket_name}' bucket.")
+        return True, stat.etag, last_modified
+
     async def download_log_file(self, log_file_name, file_path):
         return self.download_file(self.game_log_bucket_name, log_file_name, file_path)
 
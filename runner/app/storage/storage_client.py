@@ -15,6 +15,10 @@ class StorageClient(ABC):
     def download_file(self, bucket_name, object_name, file_path):
         pass
 
+    @abstractmethod
+    def download_file_resumable(self, bucket_name, object_name, file_path, etag=None):
+        pass
+
     @abstractmethod
     def check_connection(self):
         pass
\ No newline at end of file
@@ -0,0 +1,325 @@
+import os
+import sys
+import signal
+import asyncio
+import logging
+import requests
+import uvicorn
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Security, Depends, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.security.api_key import APIKeyHeader
+from starlette.status import HTTP_403_FORBIDDEN
+from fast_api_app import Server
+from game_runner.host_registry import HostRegistry
+from game_runner.game_metrics import GameMetrics
+from utils.message_sender import MessageSender
+from utils.messages import *
+
+
+class Worker:
+    def __init__(self, index: int, api_port: int):
+        self.index = index
+        self.api_port = api_port
+        self.process: asyncio.subprocess.Process = None
+        self.restarts = 0
+        self.status: RunnerStatusMessageEnum = RunnerStatusMessageEnum.UNKNOWN
+
+
+class Supervisor:
+    """
+    Runs the runner as N worker processes on one host (main.py --workers N). Every worker is a full
+    runner (RunnerManager, RabbitMQ consumer and FastAPI app on its own port), so zip/unzip/download work
+    of one worker never delays the message handling of the others. The workers share the data dir
+    (server, base teams, team configs) and take their game slots and server ports from one HostRegistry.
+    The supervisor registers the host as one runner and is the only one reporting its status.
+    """
+    restart_delay = 5
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+
+    def __init__(self, worker_args: list[str], workers_count: int, first_worker_port: int,
+                 host_registry: HostRegistry, runner_id: int, message_sender: MessageSender,
+                 api_key: str, api_key_name: str = "api-key", status_interval: float = 2):
+        self.logger = logging.getLogger(__name__)
+        self.worker_args = worker_args
+        self.workers = [Worker(i, first_worker_port + i) for i in range(workers_count)]
+        self.host_registry = host_registry
+        self.runner_id = runner_id
+        self.message_sender = message_sender
+        self.api_key = api_key
+        self.api_key_name = api_key_name
+        self.status_interval = status_interval
+        self.status = RunnerStatusMessageEnum.RUNNING
+        self.stopping = False
+        self.next_worker = 0
+
+    async def start_worker(self, worker: Worker):
+        args = [sys.executable, Supervisor.main_path, *self.worker_args,
+                '--worker-index', str(worker.index),
+                '--use-fast-api', 'true',
+                '--fast-api-port', str(worker.api_port)]
+        if self.runner_id is not None:
+            args += ['--runner-id', str(self.runner_id)]
+        # own session: the games of a crashed worker can be killed with its process group
+        worker.process = await asyncio.create_subprocess_exec(*args, start_new_session=True)
+        self.logger.info(f'Supervisor started worker {worker.index} (pid {worker.process.pid}, '
+                         f'api port {worker.api_port})')
+
+    async def watch_worker(self, worker: Worker):
+        while True:
+            return_code = await worker.process.wait()
+            self.kill_process_group(worker)
+            # a worker exits with 0 after a drain (drain command or SIGTERM), it is only restarted if it crashed
+            if self.stopping or return_code == 0:
+                self.logger.info(f'Supervisor: worker {worker.index} exited with {return_code}')
+                return
+            worker.restarts += 1
+            self.logger.error(f'Supervisor: worker {worker.index} exited with {return_code}, '
+                              f'restarting in {Supervisor.restart_delay}s (restarts: {worker.restarts})')
+            await asyncio.sleep(Supervisor.restart_delay)
+            if self.stopping:
+                return
+            await self.start_worker(worker)
+
+    def kill_process_group(self, worker: Worker):
+        # the games (rcssserver, teams) of a dead worker are left in its process group
+        try:
+            os.killpg(worker.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def send_signal(self, sig: signal.Signals):
+        # SIGTERM drains every worker, SIGINT shuts them down
+        self.stopping = True
+        for worker in self.workers:
+            if worker.process is not None and worker.process.returncode is None:
+                worker.process.send_signal(sig)
+
+    async def run(self):
+        self.host_registry.reset()
+        for worker in self.workers:
+            await self.start_worker(worker)
+        status_task = asyncio.create_task(self.watch_status())
+        try:
+            await asyncio.gather(*[self.watch_worker(worker) for worker in self.workers])
+        finally:
+            status_task.cancel()
+        await self.report_status(RunnerStatusMessageEnum.STOPPED)
+
+    # ---------------------------- WORKER API
+
+    def request_worker(self, worker: Worker, method: str, route: str, json=None, timeout: float = 10):
+        response = requests.request(method, f'http://127.0.0.1:{worker.api_port}/{route}',
+                                    headers={self.api_key_name: self.api_key}, json=json, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def call_worker(self, worker: Worker, method: str, route: str, json=None):
+        return await asyncio.to_thread(self.request_worker, worker, method, route, json)
+
+    async def call_workers(self, method: str, route: str, json=None) -> list:
+        # one result per worker, the exception if the worker could not be reached
+        return await asyncio.gather(*[self.call_worker(worker, method, route, json) for worker in self.workers],
+                                    return_exceptions=True)
+
+    def get_worker_by_pid(self, pid: int) -> Optional[Worker]:
+        for worker in self.workers:
+            if worker.process is not None and worker.process.pid == pid:
+                return worker
+        return None
+
+    def get_worker_by_port(self, port: int) -> Optional[Worker]:
+        slot = self.host_registry.get_slots().get(port)
+        return self.get_worker_by_pid(slot['pid']) if slot is not None else None
+
+    def get_worker_by_game_id(self, game_id: int) -> Optional[Worker]:
+        for slot in self.host_registry.get_slots().values():
+            if slot['game_id'] == game_id:
+                return self.get_worker_by_pid(slot['pid'])
+        return None
+
+    # ---------------------------- STATUS
+
+    @staticmethod
+    def aggregate_status(statuses: list[RunnerStatusMessageEnum]) -> Optional[RunnerStatusMessageEnum]:
+        """The status of the host, None while the workers are switching (e.g. half of them paused)."""
+        if len(set(statuses)) == 1:
+            return statuses[0]
+        if RunnerStatusMessageEnum.DRAINING in statuses:
+            return RunnerStatusMessageEnum.DRAINING
+        return None
+
+    async def watch_status(self):
+        while True:
+            await asyncio.sleep(self.status_interval)
+            results = await self.call_workers('GET', 'runner/status')
+            for worker, result in zip(self.workers, results):
+                worker.status = RunnerStatusMessageEnum.UNKNOWN if isinstance(result, Exception) \
+                    else RunnerStatusMessageEnum(result)
+            # a restarting worker does not change the status of the host
+            statuses = [worker.status for worker in self.workers if worker.status != RunnerStatusMessageEnum.UNKNOWN]
+            status = Supervisor.aggregate_status(statuses) if statuses else None
+            if status is not None and status != self.status:
+                await self.report_status(status)
+
+    async def report_status(self, status: RunnerStatusMessageEnum):
+        self.logger.info(f'Supervisor status: {self.status} -> {status}')
+        self.status = status
+        if self.message_sender is None:
+            return
+        try:
+            await self.message_sender.send_message('from_runner/status_update', RunnerStatusMessage(
+                runner_id=self.runner_id, status=status, timestamp=datetime.utcnow().isoformat()).model_dump())
+        except Exception as e:
+            self.logger.error(f'Supervisor: can not report the status {status}: {e}')
+
+
+class SupervisorApi:
+    """
+    The api of the host on the registered runner port. Commands go to every worker, game requests
+    to the worker running the game. The game streams (/games/events, /games/{id}/monitor) are served
+    by the workers themselves, see /runner/workers for their ports.
+    """
+    def __init__(self, supervisor: Supervisor, api_key: str, api_key_name: str = "api-key", port: int = 8000):
+        self.logger = logging.getLogger(__name__)
+        self.app = FastAPI()
+        self.supervisor = supervisor
+        self.api_key = api_key
+        self.api_key_name = api_key_name
+        self.port = port
+        self.server = None
+        self.setup_routes()
+
+    def setup_routes(self):
+        api_key_header = APIKeyHeader(name=self.api_key_name, auto_error=False)
+
+        async def get_api_key(api_key: str = Security(api_key_header)):
+            if api_key == self.api_key:
+                return api_key
+            else:
+                raise HTTPException(
+                    status_code=HTTP_403_FORBIDDEN, detail="Could not validate credentials"
+                )
+
+        async def get_api_key_or_query(request: Request):
+            # prometheus scrape configs pass the key as a query parameter
+            api_key = request.headers.get(self.api_key_name) or request.query_params.get(self.api_key_name)
+            if api_key == self.api_key:
+                return api_key
+            raise HTTPException(
+                status_code=HTTP_403_FORBIDDEN, detail="Could not validate credentials"
+            )
+
+        async def forward(worker: Optional[Worker], method: str, route: str, json=None):
+            if worker is None:
+                raise HTTPException(status_code=404, detail="Game not found")
+            try:
+                return await self.supervisor.call_worker(worker, method, route, json)
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=f"Worker {worker.index}: {e}")
+
+        @self.app.get("/")
+        def read_root():
+            return {"message": "Hello World"}
+
+        @self.app.get("/runner/workers")
+        def get_workers(api_key: str = Depends(get_api_key)):
+            return [{'worker_index': worker.index, 'pid': worker.process.pid if worker.process else None,
+                     'api_port': worker.api_port, 'status': worker.status, 'restarts': worker.restarts}
+                    for worker in self.supervisor.workers]
+
+        @self.app.get("/games")
+        async def get_games(api_key: str = Depends(get_api_key)):
+            res = GetGamesResponse(games=[])
+            for result in await self.supervisor.call_workers('GET', 'games'):
+                if not isinstance(result, Exception):
+                    res.games.extend(GameSummaryMessage(**game) for game in result['games'])
+            return res
+
+        @self.app.get("/metrics", response_class=PlainTextResponse)
+        async def get_metrics(api_key: str = Depends(get_api_key_or_query)):
+            # the sum of the workers, a worker that can not be reached is left out
+            metrics = GameMetrics()
+            gauges = {name: 0 for name in GameMetrics.gauges_help}
+            for result in await self.supervisor.call_workers('GET', 'runner/metrics'):
+                if isinstance(result, Exception):
+                    continue
+                metrics.merge(result)
+                for name, value in result['gauges'].items():
+                    gauges[name] += value
+            # every worker could take max_games_count games, the host registry has the free slots of the host
+            host_registry = self.supervisor.host_registry
+            gauges['runner_available_games'] = len(host_registry.ports) - len(host_registry.get_slots())
+            return PlainTextResponse(metrics.to_prometheus(gauges), media_type=GameMetrics.content_type)
+
+        @self.app.get("/runner/tasks")
+        async def get_game_tasks(api_key: str = Depends(get_api_key)):
+            res = GetGameTasksResponse(tasks=[], counters={}, available_games_count=0)
+            for result in await self.supervisor.call_workers('GET', 'runner/tasks'):
+                if isinstance(result, Exception):
+                    continue
+                res.tasks.extend(GameTaskMessage(**task) for task in result['tasks'])
+                for name, count in result['counters'].items():
+                    res.counters[name] = res.counters.get(name, 0) + count
+                res.available_games_count += result['available_games_count']
+            return res
+
+        @self.app.post("/add_game")
+        async def add_game(message_json: GameInfoMessage, api_key: str = Depends(get_api_key)):
+            # round robin, the next worker if one can not take the game
+            workers = self.supervisor.workers
+            res = {"success": False, "error": "No available games"}
+            for i in range(len(workers)):
+                worker = workers[(self.supervisor.next_worker + i) % len(workers)]
+                try:
+                    res = await self.supervisor.call_worker(worker, 'POST', 'add_game', message_json.model_dump())
+                except Exception as e:
+                    res = {"success": False, "error": f"Worker {worker.index}: {e}"}
+                    continue
+                if res.get('success'):
+                    self.supervisor.next_worker = (worker.index + 1) % len(workers)
+                    break
+            return res
+
+        @self.app.post("/stop_game_by_game_id/{game_id}")
+        async def stop_game_by_game_id(game_id: int, api_key: str = Depends(get_api_key)):
+            worker = self.supervisor.get_worker_by_game_id(game_id)
+            return await forward(worker, 'POST', f'stop_game_by_game_id/{game_id}')
+
+        @self.app.post("/stop_game_by_port/{port}")
+        async def stop_game_by_port(port: int, api_key: str = Depends(get_api_key)):
+            worker = self.supervisor.get_worker_by_port(port)
+            return await forward(worker, 'POST', f'stop_game_by_port/{port}')
+
+        @self.app.post("/runner/receive_command", response_model=ResponseMessage)
+        async def receive_command(command_request: RequestedCommandToRunnerMessage, api_key: str = Depends(get_api_key)):
+            self.logger.info(f"Received command: {command_request.command}, sending it to every worker")
+            results = await self.supervisor.call_workers('POST', 'runner/receive_command', command_request.model_dump())
+            errors = [f"Worker {worker.index}: {result if isinstance(result, Exception) else result.get('value')}"
+                      for worker, result in zip(self.supervisor.workers, results)
+                      if isinstance(result, Exception) or not result.get('success')]
+            if errors:
+                return ResponseMessage(success=False, error="; ".join(errors))
+            return ResponseMessage(success=True, value=f"{command_request.command.value} sent to {len(results)} workers.")
+
+        @self.app.get("/runner/status")
+        async def get_runner_status(api_key: str = Depends(get_api_key)):
+            return self.supervisor.status
+
+        # the base teams are shared, one worker updates them for the whole host
+        @self.app.post("/update_base/from_url")
+        async def update_base_from_url(message_json: UpdateBaseFromURLRequestMessage, api_key: str = Depends(get_api_key)):
+            return await forward(self.supervisor.workers[0], 'POST', 'update_base/from_url', message_json.model_dump())
+
+        @self.app.post("/update_base/from_minio")
+        async def update_base_from_minio(message_json: UpdateBaseFromMINIORequestMessage, api_key: str = Depends(get_api_key)):
+            return await forward(self.supervisor.workers[0], 'POST', 'update_base/from_minio', message_json.model_dump())
+
+    async def run(self):
+        config = uvicorn.Config(self.app, host="0.0.0.0", port=self.port)
+        self.server = Server(config)
+        await self.server.serve()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.should_exit = True
@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+from game_runner.fake_server import FakeServer
+from game_runner.runner_manager import RunnerManager
+from utils.messages import RunnerCommandMessageEnum, RunnerStatusMessageEnum
+
+
+def get_runner_manager(tmp_path):
+    runner_manager = RunnerManager(str(tmp_path), None, None, 1, fake_server=FakeServer(),
+                                   drain_timeout=1, drain_kill_timeout=1)
+    runner_manager.set_available_games_count(2)
+    return runner_manager
+
+
+@pytest.mark.asyncio
+async def test_drain_command(tmp_path):
+    runner_manager = get_runner_manager(tmp_path)
+
+    response = await runner_manager.receive_command(RunnerCommandMessageEnum.DRAIN)
+
+    assert response.success
+    assert runner_manager.drain_task is not None
+    await asyncio.wait_for(runner_manager.drained.wait(), 2)
+    assert runner_manager.status == RunnerStatusMessageEnum.STOPPED
+    assert runner_manager.drain_report['in_flight_games'] == []
+
+
+@pytest.mark.asyncio
+async def test_failed_drain_still_sets_drained(tmp_path, monkeypatch, caplog):
+    runner_manager = get_runner_manager(tmp_path)
+
+    async def failing_drain():
+        raise RuntimeError('drain failed')
+
+    monkeypatch.setattr(runner_manager, 'drain', failing_drain)
+    await runner_manager.start_drain()
+
+    await asyncio.wait_for(runner_manager.drained.wait(), 2)
+    assert 'drain failed' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_cancel_drain(tmp_path):
+    runner_manager = get_runner_manager(tmp_path)
+    runner_manager.games[6000] = object()  # a game that never finishes
+    await runner_manager.start_drain()
+
+    await runner_manager.cancel_drain()
+
+    assert runner_manager.drain_task.cancelled()
+    assert not runner_manager.drained.is_set()
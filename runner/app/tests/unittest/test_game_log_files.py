@@ -0,0 +1,93 @@
+import os
+import pytest
+from game_runner.game_log_files import GameLogFiles
+
+
+def make_game_log_dir(tmp_path, game_id=1):
+    game_log_dir = GameLogFiles.get_dir(str(tmp_path), game_id)
+    os.makedirs(game_log_dir)
+    for name, data in [('incomplete.rcg', b'ULG5'), ('incomplete.rcl', b''), ('server.log', b'server')]:
+        with open(os.path.join(game_log_dir, name), 'wb') as f:
+            f.write(data)
+    os.makedirs(os.path.join(game_log_dir, 'sub'))
+    return game_log_dir
+
+
+@pytest.mark.parametrize('range_header, expected', [
+    (None, None),
+    ('', None),
+    ('bytes=0-99', (0, 99)),
+    ('bytes=10-19', (10, 19)),
+    ('bytes=90-200', (90, 99)),  # the end is cut to the size
+    ('bytes=50-', (50, 99)),  # open ended
+    ('bytes=99-', (99, 99)),
+    ('bytes=-10', (90, 99)),  # the last 10 bytes
+    ('bytes=-500', (0, 99)),
+    (' bytes=-10 ', (90, 99)),
+    ('bytes=0-9,20-29', None),  # several ranges, the whole file
+    ('items=0-9', None),
+    ('bytes=-', None),
+])
+def test_parse_range(range_header, expected):
+    assert GameLogFiles.parse_range(range_header, 100) == expected
+
+
+@pytest.mark.parametrize('range_header, size', [
+    ('bytes=100-', 100),
+    ('bytes=100-200', 100),
+    ('bytes=20-10', 100),
+    ('bytes=-0', 100),
+    # an empty file (incomplete.rcl before the first cycle) has no byte to send
+    ('bytes=0-', 0),
+    ('bytes=0-10', 0),
+    ('bytes=-10', 0),
+])
+def test_parse_range_not_satisfiable(range_header, size):
+    with pytest.raises(ValueError, match='not satisfiable'):
+        GameLogFiles.parse_range(range_header, size)
+
+
+def test_parse_range_empty_file_without_range():
+    assert GameLogFiles.parse_range(None, 0) is None
+
+
+@pytest.mark.parametrize('range_header, size, expected', [
+    (None, 100, 0),
+    ('bytes=50-', 100, 50),
+    ('bytes=150-', 100, 150),  # past the current end, waits for the server
+    ('bytes=-10', 100, 90),
+    ('bytes=-500', 100, 0),
+    ('bytes=-10', 0, 0),
+    ('bytes=-', 100, 0),
+    ('bytes=0-9,20-29', 100, 0),
+])
+def test_get_follow_start(range_header, size, expected):
+    assert GameLogFiles.get_follow_start(range_header, size) == expected
+
+
+def test_get_path(tmp_path):
+    game_log_dir = make_game_log_dir(tmp_path)
+
+    assert GameLogFiles.get_path(str(tmp_path), 1, 'rcg') == os.path.join(game_log_dir, 'incomplete.rcg')
+    assert GameLogFiles.get_path(str(tmp_path), 1, 'rcl') == os.path.join(game_log_dir, 'incomplete.rcl')
+    assert GameLogFiles.get_path(str(tmp_path), 1, 'server.log') == os.path.join(game_log_dir, 'server.log')
+    assert GameLogFiles.get_path(str(tmp_path), 1, 'missing.log') is None
+    assert GameLogFiles.get_path(str(tmp_path), 2, 'rcg') is None
+
+
+@pytest.mark.parametrize('file_name', [
+    '..',
+    '.',
+    '../2/incomplete.rcg',
+    '../../downloads.json',
+    '/etc/passwd',
+    'sub',
+    'sub/../server.log',
+])
+def test_get_path_serves_only_files_of_the_game_log_dir(tmp_path, file_name):
+    make_game_log_dir(tmp_path, 1)
+    make_game_log_dir(tmp_path, 2)
+    with open(os.path.join(tmp_path, 'downloads.json'), 'w') as f:
+        f.write('{}')
+
+    assert GameLogFiles.get_path(str(tmp_path), 1, file_name) is None
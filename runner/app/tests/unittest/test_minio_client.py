@@ -0,0 +1,108 @@
+import inspect
+import threading
+import pytest
+from minio import Minio
+from storage.minio_client import MinioClient, MIN_PART_SIZE
+
+
+class FakeMinio:
+    def __init__(self, fail_part_number=None, fail_times=0):
+        self.fail_part_number = fail_part_number
+        self.fail_times = fail_times
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.lock = threading.Lock()
+
+    def fput_object(self, bucket_name, object_name, file_path):
+        with open(file_path, 'rb') as f:
+            self.objects[(bucket_name, object_name)] = f.read()
+
+    def _create_multipart_upload(self, bucket_name, object_name, headers):
+        upload_id = f'upload-{len(self.uploads) + 1}'
+        self.uploads[upload_id] = {}
+        return upload_id
+
+    def _upload_part(self, bucket_name, object_name, data, headers, upload_id, part_number):
+        assert headers['Content-MD5']
+        with self.lock:
+            if part_number == self.fail_part_number and self.fail_times > 0:
+                self.fail_times -= 1
+                raise ConnectionError('connection reset')
+            self.uploads[upload_id][part_number] = data
+        return f'etag-{part_number}'
+
+    def _complete_multipart_upload(self, bucket_name, object_name, upload_id, parts):
+        assert [part.part_number for part in parts] == list(range(1, len(parts) + 1))
+        assert [part.etag for part in parts] == [f'etag-{part.part_number}' for part in parts]
+        self.objects[(bucket_name, object_name)] = b''.join(self.uploads[upload_id][part.part_number] for part in parts)
+
+    def _abort_multipart_upload(self, bucket_name, object_name, upload_id):
+        self.aborted.append(upload_id)
+
+
+def get_minio_client(fake_client):
+    minio_client = MinioClient('server', 'baseteam', 'teamconfig', 'gamelog', upload_part_size=MIN_PART_SIZE,
+                               upload_parallelism=2, upload_retries=3)
+    minio_client.client = fake_client
+    return minio_client
+
+
+def test_minio_private_multipart_calls():
+    # the private calls of the installed client take the arguments upload_file_multipart passes
+    assert list(inspect.signature(Minio._create_multipart_upload).parameters) == \
+        ['self', 'bucket_name', 'object_name', 'headers']
+    assert list(inspect.signature(Minio._upload_part).parameters) == \
+        ['self', 'bucket_name', 'object_name', 'data', 'headers', 'upload_id', 'part_number']
+    assert list(inspect.signature(Minio._complete_multipart_upload).parameters) == \
+        ['self', 'bucket_name', 'object_name', 'upload_id', 'parts']
+    assert list(inspect.signature(Minio._abort_multipart_upload).parameters) == \
+        ['self', 'bucket_name', 'object_name', 'upload_id']
+
+
+def test_upload_small_file_single_put(tmp_path):
+    file_path = tmp_path / '1.zip'
+    file_path.write_bytes(b'game log')
+    fake_client = FakeMinio()
+    minio_client = get_minio_client(fake_client)
+
+    assert minio_client.upload_file('gamelog', str(file_path), '1.zip')
+    assert fake_client.objects[('gamelog', '1.zip')] == b'game log'
+    assert fake_client.uploads == {}
+
+
+def test_upload_large_file_multipart(tmp_path):
+    data = bytes(range(256)) * (MIN_PART_SIZE * 3 // 256 + 100)
+    file_path = tmp_path / '2.zip'
+    file_path.write_bytes(data)
+    fake_client = FakeMinio()
+    minio_client = get_minio_client(fake_client)
+
+    assert minio_client.upload_file('gamelog', str(file_path), '2.zip')
+    assert fake_client.objects[('gamelog', '2.zip')] == data
+    assert len(fake_client.uploads['upload-1']) == 4
+
+
+def test_upload_multipart_retries_failed_part(tmp_path, monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda delay: None)
+    data = b'x' * (MIN_PART_SIZE + 10)
+    file_path = tmp_path / '3.zip'
+    file_path.write_bytes(data)
+    fake_client = FakeMinio(fail_part_number=2, fail_times=2)
+    minio_client = get_minio_client(fake_client)
+
+    assert minio_client.upload_file('gamelog', str(file_path), '3.zip')
+    assert fake_client.objects[('gamelog', '3.zip')] == data
+    assert fake_client.aborted == []
+
+
+def test_upload_multipart_aborts_after_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr('time.sleep', lambda delay: None)
+    file_path = tmp_path / '4.zip'
+    file_path.write_bytes(b'x' * (MIN_PART_SIZE + 10))
+    fake_client = FakeMinio(fail_part_number=1, fail_times=3)
+    minio_client = get_minio_client(fake_client)
+
+    assert not minio_client.upload_file('gamelog', str(file_path), '4.zip')
+    assert ('gamelog', '4.zip') not in fake_client.objects
+    assert fake_client.aborted == ['upload-1']
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from game_runner.monitor_proxy import MonitorProxy, MonitorConnection
+
+
+class FakeMonitorServer(asyncio.DatagramProtocol):
+    # answers the dispinit of a monitor with a server_param frame, like rcssserver
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if data == MonitorConnection.dispinit:
+            self.transport.sendto(b'(server_param (half_time 300))\0', addr)
+
+
+async def start_fake_server():
+    transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+        FakeMonitorServer, local_addr=('127.0.0.1', 0))
+    return transport
+
+
+async def get_silent_port():
+    # a bound socket that never answers, the monitor waits for it until its timeout
+    transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+        asyncio.DatagramProtocol, local_addr=('127.0.0.1', 0))
+    return transport
+
+
+@pytest.mark.asyncio
+async def test_subscribe_shares_the_connection_of_a_game():
+    server = await start_fake_server()
+    monitor_proxy = MonitorProxy()
+    try:
+        port = server.get_extra_info('sockname')[1]
+        init_frames, queue1 = await monitor_proxy.subscribe(1, port)
+        _, queue2 = await monitor_proxy.subscribe(1, port)
+
+        assert init_frames == ['(server_param (half_time 300))']
+        assert list(monitor_proxy.connections) == [1]
+        monitor_proxy.unsubscribe(1, queue1)
+        assert 1 in monitor_proxy.connections
+        monitor_proxy.unsubscribe(1, queue2)
+        assert monitor_proxy.connections == {}
+        assert monitor_proxy.locks == {}
+    finally:
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_opening_a_game_does_not_block_other_games():
+    server = await start_fake_server()
+    silent = await get_silent_port()
+    monitor_proxy = MonitorProxy()
+    opening = asyncio.create_task(monitor_proxy.subscribe(1, silent.get_extra_info('sockname')[1]))
+    try:
+        await asyncio.sleep(0.1)
+        assert not opening.done()
+
+        init_frames, queue = await asyncio.wait_for(
+            monitor_proxy.subscribe(2, server.get_extra_info('sockname')[1]), 2)
+
+        assert init_frames == ['(server_param (half_time 300))']
+        assert not opening.done()
+        monitor_proxy.unsubscribe(2, queue)
+    finally:
+        opening.cancel()
+        await asyncio.gather(opening, return_exceptions=True)
+        for connection in list(monitor_proxy.connections.values()):
+            connection.close()
+        server.close()
+        silent.close()
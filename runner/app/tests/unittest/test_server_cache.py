@@ -0,0 +1,85 @@
+import os
+import logging
+import shutil
+from game_runner.runner_manager import RunnerManager
+from game_runner.server_cache import ServerCache
+
+
+def write_fake_appimage(binary_path, build):
+    # extracts an AppRun that prints the build, like rcssserver-x.AppImage --appimage-extract
+    with open(binary_path, 'w') as f:
+        f.write(f'#!/bin/sh\nmkdir -p squashfs-root/usr\necho {build} > squashfs-root/AppRun\n'
+                f'echo {build} > squashfs-root/usr/lib\n')
+    os.chmod(binary_path, 0o755)
+
+
+def get_server_cache(tmp_path):
+    server_cache = ServerCache(str(tmp_path), None, None)
+    binary_path = os.path.join(server_cache.get_version_dir('19.0.0'), ServerCache.binary_name)
+    os.makedirs(os.path.dirname(binary_path))
+    return server_cache, binary_path
+
+
+def read(path):
+    with open(path) as f:
+        return f.read().strip()
+
+
+def test_extract(tmp_path):
+    server_cache, binary_path = get_server_cache(tmp_path)
+    write_fake_appimage(binary_path, 'build1')
+
+    server_cache.extract('19.0.0', binary_path)
+
+    assert server_cache.get_path('19.0.0').endswith(os.path.join(ServerCache.extracted_dir_name, 'AppRun'))
+    assert read(server_cache.get_path('19.0.0')) == 'build1'
+    assert sorted(os.listdir(server_cache.get_version_dir('19.0.0'))) == \
+        [ServerCache.binary_name, ServerCache.extracted_dir_name]
+
+
+def test_extract_replaces_the_old_tree_after_the_swap(tmp_path, monkeypatch):
+    server_cache, binary_path = get_server_cache(tmp_path)
+    write_fake_appimage(binary_path, 'build1')
+    server_cache.extract('19.0.0', binary_path)
+    target_dir = os.path.join(server_cache.get_version_dir('19.0.0'), ServerCache.extracted_dir_name)
+    rmtree = shutil.rmtree
+
+    def checked_rmtree(path, *args, **kwargs):
+        # the tree a game may be starting from is never deleted in place
+        assert os.path.abspath(path) != os.path.abspath(target_dir)
+        if os.path.basename(path) == '.old' and os.path.exists(path):
+            assert read(os.path.join(target_dir, 'AppRun')) == 'build2'
+        rmtree(path, *args, **kwargs)
+
+    monkeypatch.setattr(shutil, 'rmtree', checked_rmtree)
+    write_fake_appimage(binary_path, 'build2')
+    server_cache.extract('19.0.0', binary_path)
+
+    assert read(server_cache.get_path('19.0.0')) == 'build2'
+    assert read(os.path.join(target_dir, 'usr', 'lib')) == 'build2'
+    assert sorted(os.listdir(server_cache.get_version_dir('19.0.0'))) == \
+        [ServerCache.binary_name, ServerCache.extracted_dir_name]
+
+
+def test_extract_failure_runs_the_appimage(tmp_path):
+    server_cache, binary_path = get_server_cache(tmp_path)
+    write_fake_appimage(binary_path, 'build1')
+    server_cache.extract('19.0.0', binary_path)
+    with open(binary_path, 'w') as f:
+        f.write('#!/bin/sh\nexit 1\n')
+
+    server_cache.extract('19.0.0', binary_path)
+
+    assert server_cache.get_path('19.0.0') == binary_path
+    assert os.listdir(server_cache.get_version_dir('19.0.0')) == [ServerCache.binary_name]
+
+
+def test_runner_manager_with_default_server_version(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    runner_manager = RunnerManager(str(tmp_path), None, None, 1, default_server_version='19.0.0')
+
+    assert runner_manager.server_cache.default_version == '19.0.0'
+    assert 'Server 19.0.0 is provided by the server cache' in caplog.text
+    assert 'fake server' not in caplog.text
+    # the single data/server/rcssserver is not fetched
+    assert not os.path.exists(os.path.join(tmp_path, 'server', 'rcssserver'))
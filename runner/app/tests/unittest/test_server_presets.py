@@ -0,0 +1,73 @@
+import pytest
+from game_runner.fake_server import FakeServer
+from game_runner.runner_manager import RunnerManager
+from game_runner.server_presets import ServerPresets
+from utils.messages import GameInfoMessage
+
+
+def get_runner_manager(tmp_path):
+    runner_manager = RunnerManager(str(tmp_path), None, None, 1, fake_server=FakeServer())
+    runner_manager.set_available_games_count(2)
+    return runner_manager
+
+
+def test_validate_value():
+    assert ServerPresets.validate_value('half_time', ' 300 ') == '300'
+    assert ServerPresets.validate_value('wind_force', 1.5) == '1.5'
+    assert ServerPresets.validate_value('auto_mode', 'On') == 'true'
+    assert ServerPresets.validate_value('use_offside', 0) == 'false'
+
+
+@pytest.mark.parametrize('param, value, error', [
+    ('port', '6000', 'managed by the runner'),
+    ('game_log_dir', '/tmp', 'managed by the runner'),
+    ('half_tme', '300', 'not a known rcssserver option'),
+    ('half_time', 'long', 'must be int'),
+    ('wind_force', 'strong', 'must be float'),
+    ('auto_mode', 'yes', 'must be true or false'),
+])
+def test_validate_value_rejects(param, value, error):
+    with pytest.raises(ValueError, match=error):
+        ServerPresets.validate_value(param, value)
+
+
+def test_parse_server_config():
+    assert ServerPresets.parse_server_config(None) == {}
+    assert ServerPresets.parse_server_config('') == {}
+    # the last occurrence wins
+    assert ServerPresets.parse_server_config(
+        '--server::auto_mode=on --server::half_time=300 --server::half_time=600'
+    ) == {'auto_mode': 'true', 'half_time': '600'}
+
+
+@pytest.mark.parametrize('server_config, error', [
+    ('--server::port=6000', 'managed by the runner'),
+    ('--server::synch_mod=true', 'not a known rcssserver option'),
+    ('--server::half_time=1.5', 'must be int'),
+    ('--server::auto_mode=true;reboot', 'must be true or false'),
+    ('--player::half_time=300', 'Invalid server_config option'),
+    ('half_time=300', 'Invalid server_config option'),
+])
+def test_parse_server_config_rejects(server_config, error):
+    with pytest.raises(ValueError, match=error):
+        ServerPresets.parse_server_config(server_config)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('game_info, error', [
+    (GameInfoMessage(game_id=1, server_preset='unknown'), 'Unknown server preset unknown'),
+    (GameInfoMessage(game_id=1, server_config='--server::coach_port=6002'), 'managed by the runner'),
+    (GameInfoMessage(game_id=1, server_config='--server::half_time=long'), 'must be int'),
+    (GameInfoMessage(game_id=1, server_version='../19.0.0'), 'Invalid server version'),
+])
+async def test_add_game_rejects_invalid_server_options(tmp_path, game_info, error):
+    runner_manager = get_runner_manager(tmp_path)
+
+    response = await runner_manager.add_game(game_info)
+
+    assert not response.success
+    assert error in response.error
+    # no slot is taken
+    assert runner_manager.available_games_count == 2
+    assert runner_manager.available_ports == [6000, 6010]
+    assert runner_manager.games == {}
@@ -0,0 +1,125 @@
+import os
+import stat
+import zipfile
+import pytest
+from utils.tools import Tools
+
+
+def zip_info(name, mode, file_type=stat.S_IFREG):
+    info = zipfile.ZipInfo(name)
+    info.external_attr = (file_type | mode) << 16
+    return info
+
+
+def write_zip(zip_path, entries):
+    # entries: (ZipInfo or name, data)
+    with zipfile.ZipFile(zip_path, 'w') as zipf:
+        for info, data in entries:
+            zipf.writestr(info, data)
+    return str(zip_path)
+
+
+def get_mode(path):
+    return stat.S_IMODE(os.lstat(path).st_mode)
+
+
+def test_unzip_file(tmp_path):
+    zip_path = write_zip(tmp_path / 'team.zip', [
+        ('team/start.sh', b'#!/bin/sh'),
+        ('team/lib/libteam.so', b'lib'),
+        ('team/lib/libteam.so', b'last'),  # the last entry wins like in extractall
+    ])
+    target = tmp_path / 'out'
+
+    assert Tools.unzip_file(zip_path, str(target)) == 2
+    assert (target / 'team' / 'start.sh').read_bytes() == b'#!/bin/sh'
+    assert (target / 'team' / 'lib' / 'libteam.so').read_bytes() == b'last'
+
+
+@pytest.mark.parametrize('name', [
+    '../evil.sh',
+    'team/../../evil.sh',
+    'team\\..\\..\\evil.sh',
+    '/tmp/evil.sh',
+    '\\tmp\\evil.sh',
+    'C:/evil.sh',
+])
+def test_unzip_file_rejects_unsafe_paths(tmp_path, name):
+    zip_path = write_zip(tmp_path / 'evil.zip', [('team/start.sh', b'ok'), (name, b'evil')])
+    target = tmp_path / 'out'
+
+    with pytest.raises(ValueError, match='Unsafe path'):
+        Tools.unzip_file(zip_path, str(target))
+    # the archive is checked before anything is written
+    assert not (target / 'team').exists()
+    assert not (tmp_path / 'evil.sh').exists()
+
+
+def test_unzip_file_writes_symlink_entries_as_files(tmp_path):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    zip_path = write_zip(tmp_path / 'link.zip', [
+        (zip_info('team/link', 0o777, stat.S_IFLNK), str(outside)),
+    ])
+    target = tmp_path / 'out'
+
+    Tools.unzip_file(zip_path, str(target))
+
+    link = target / 'team' / 'link'
+    assert not link.is_symlink()
+    assert link.read_text() == str(outside)
+
+
+def test_unzip_file_symlink_entry_does_not_redirect_later_entries(tmp_path):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    zip_path = write_zip(tmp_path / 'link.zip', [
+        (zip_info('team/link', 0o777, stat.S_IFLNK), str(outside)),
+        ('team/link/evil.sh', b'evil'),
+    ])
+
+    with pytest.raises(OSError):
+        Tools.unzip_file(zip_path, str(tmp_path / 'out'))
+    assert os.listdir(outside) == []
+
+
+def test_unzip_file_keeps_the_modes_of_the_zip(tmp_path):
+    zip_path = write_zip(tmp_path / 'team.zip', [
+        (zip_info('team/', 0o750, stat.S_IFDIR), b''),
+        (zip_info('team/start.sh', 0o755), b'#!/bin/sh'),
+        (zip_info('team/formations.conf', 0o600), b'433'),
+        (zip_info('team/data/no_mode.txt', 0), b'no mode'),
+        (zip_info('read_only/', 0o555, stat.S_IFDIR), b''),
+        (zip_info('read_only/team.conf', 0o444), b'conf'),
+    ])
+    target = tmp_path / 'out'
+
+    Tools.unzip_file(zip_path, str(target), mode=None)
+
+    assert get_mode(target / 'team') == 0o750
+    assert get_mode(target / 'team' / 'start.sh') == 0o755
+    assert get_mode(target / 'team' / 'formations.conf') == 0o600
+    # 0o644 for files without permission bits in the zip
+    assert get_mode(target / 'team' / 'data' / 'no_mode.txt') == 0o644
+    # a directory without the write bit is still filled
+    assert get_mode(target / 'read_only') == 0o555
+    assert (target / 'read_only' / 'team.conf').read_bytes() == b'conf'
+    os.chmod(target / 'read_only', 0o755)
+
+
+def test_unzip_file_applies_the_mode(tmp_path):
+    # the mode is not masked by the umask
+    old_umask = os.umask(0o077)
+    try:
+        zip_path = write_zip(tmp_path / 'team.zip', [
+            (zip_info('team/start.sh', 0o700), b'#!/bin/sh'),
+            ('team/lib/libteam.so', b'lib'),
+        ])
+        target = tmp_path / 'out'
+
+        Tools.unzip_file(zip_path, str(target), mode=0o775, workers=2)
+    finally:
+        os.umask(old_umask)
+
+    for path in ['team', 'team/start.sh', 'team/lib', 'team/lib/libteam.so']:
+        assert get_mode(target / path) == 0o775
@@ -13,6 +13,7 @@ DEFAULT_CONFIG = {
         "log_dir": "../data/logs",
         "api_key": "api-key",
         "max_games_count": 2,
+        "workers": 1,
         "use_fast_api": True,
         "fast_api_ip": "127.0.0.1",
         "fast_api_port": 8082,
@@ -34,8 +35,56 @@ DEFAULT_CONFIG = {
         "base_team_bucket_name": "baseteam",
         "team_config_bucket_name": "teamconfig",
         "game_log_bucket_name": "gamelog",
+        "upload_part_size_mb": 16,
+        "upload_parallelism": 4,
+        "upload_retries": 3,
+        "base_team_file_mode": "777",
+        "unzip_workers": 4,
+        "use_fake_server": False,
+        "fake_game_duration": 10,
+        "fake_rcg_size": 1048576,
+        "use_game_watchdog": True,
+        "watchdog_start_timeout": 120,
+        "watchdog_stall_timeout": 60,
+        "watchdog_budget_margin": 1.5,
+        "drain_timeout": 1800,
+        "drain_kill_timeout": 60,
         "default_param": "runner",
+        "default_server_preset": "default",
+        "default_server_version": None,
     },
+    # rcssserver options by preset name (GameInfoMessage.server_preset), the presets of the config file
+    # are added to these ones and replace the ones with the same name
+    "server_presets": {
+        "default": {
+            "half_time": 100,
+            "nr_normal_halfs": 2,
+            "nr_extra_halfs": 0,
+            "penalty_shoot_outs": False,
+        },
+        "official": {
+            "half_time": 300,
+            "nr_normal_halfs": 2,
+            "nr_extra_halfs": 0,
+            "penalty_shoot_outs": False,
+        },
+        "knockout": {
+            "half_time": 300,
+            "nr_normal_halfs": 2,
+            "nr_extra_halfs": 2,
+            "extra_half_time": 100,
+            "penalty_shoot_outs": True,
+        },
+        "quick_test": {
+            "half_time": 50,
+            "nr_normal_halfs": 2,
+            "nr_extra_halfs": 0,
+            "penalty_shoot_outs": False,
+            "text_logging": False,
+        },
+    },
+    # rcssserver builds by version (GameInfoMessage.server_version), fetched at startup into data/server/versions
+    "servers": [],
     "base_teams": [
         {
             "name": "cyrus",
@@ -68,6 +117,11 @@ def get_settings(args, config):
         **args,
     }
     settings_o["base_teams"] = config["base_teams"] if "base_teams" in config.keys() else settings_o["base_teams"]
+    settings_o["servers"] = config.get("servers") or settings_o["servers"]
+    settings_o["server_presets"] = {
+        **settings_o["server_presets"],
+        **(config.get("server_presets") or {}),
+    }
     global SETTINGS
     SETTINGS = settings_o
     return settings_o
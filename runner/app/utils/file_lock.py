@@ -0,0 +1,49 @@
+import os
+import fcntl
+import asyncio
+
+
+class FileLock:
+    # an exclusive flock on a file, it is held by one process of the host at a time and released
+    # by the kernel if the process dies, so a crashed worker never leaves a stale lock behind
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        self.fd = fd
+
+    def release(self):
+        if self.fd is None:
+            return
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    async def __aenter__(self):
+        # flock blocks, wait for it in a thread so the event loop keeps running
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # the thread can not be interrupted, give the lock back as soon as it gets it
+            acquiring.add_done_callback(lambda _: self.release())
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
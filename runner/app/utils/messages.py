@@ -21,6 +21,7 @@ class LogLevelMessageEnum(str, Enum):
 class RunnerStatusMessageEnum(str, Enum):
     RUNNING = 'running'
     PAUSED = 'paused'
+    DRAINING = 'draining'
     STOPPED = 'stopped'
     UNKNOWN = 'unknown'
     CRASHED = 'crashed'
@@ -29,6 +30,7 @@ class RunnerCommandMessageEnum(str, Enum):
     RESUME = 'resume'
     PAUSE = 'pause'
     STOP = 'stop'
+    DRAIN = 'drain'
     HELLO = 'hello'
 
 class BaseMessage(BaseModel):
@@ -69,7 +71,9 @@ class GameInfoMessage(BaseModel):
     right_team_config_json_encoded: Optional[str] = Field(None, example='{@qq@version@qq@:1@c@@qq@formation_name@qq@:@qq@433@qq@}')
     left_base_team_name: str = Field(None, example="cyrus")
     right_base_team_name: str = Field(None, example="cyrus")
+    server_preset: Optional[str] = Field(None, example="official", description="Name of a server preset of the runner config, the runner's default preset if empty.")
     server_config: Optional[str] = Field(None, example="--server::auto_mode=true")
+    server_version: Optional[str] = Field(None, example="19.0.0", description="rcssserver version of the game, the runner's default version if empty.")
 
     def fix_json(self):
         if self.left_team_config_json:
@@ -107,9 +111,65 @@ class GameFinishedMessage(BaseModel):
     right_penalty: Optional[int] = Field(None, example=-1)
     runner_id: Optional[int] = Field(None, example=1)
     success: bool = Field(None, example=True)
+    error: Optional[str] = Field(None, example="")
+
+class GameSummaryMessage(BaseModel):
+    game_id: int = Field(None, example=1)
+    port: Optional[int] = Field(None, example=6000)
+    status: str = Field(None, example="running")
+    left_team_name: Optional[str] = Field(None, example="team1")
+    right_team_name: Optional[str] = Field(None, example="team2")
+    cycle: Optional[int] = Field(None, example=1200)
+    left_score: Optional[int] = Field(None, example=0)
+    right_score: Optional[int] = Field(None, example=1)
+
+class GameLogFileMessage(BaseModel):
+    name: str = Field(None, example="incomplete.rcg")
+    size: int = Field(None, example=1048576)
+    modified: str = Field(None, example="2024-06-29T15:50:21+00:00")
+
+class GetGameLogFilesResponse(BaseModel):
+    game_id: int = Field(None, example=1)
+    live: bool = Field(None, example=True, description="The game is running, its files are still growing.")
+    files: list[GameLogFileMessage] = Field(None, example=[{"name": "incomplete.rcg", "size": 1048576}])
 
 class GetGamesResponse(BaseModel):
-    games: list[GameFinishedMessage] = Field(None, example=[{"game_id": 1, "status": "starting", "port": 12345}])
+    games: list[GameSummaryMessage] = Field(None, example=[{"game_id": 1, "status": "starting", "port": 12345}])
+
+class GameTaskStateEnum(str, Enum):
+    RUNNING = 'running'
+    FINISHED = 'finished'  # run_game returned
+    CRASHED = 'crashed'  # run_game raised
+    CANCELLED = 'cancelled'
+
+class GameTaskMessage(BaseModel):
+    game_id: int = Field(None, example=1)
+    port: int = Field(None, example=6000)
+    state: GameTaskStateEnum = Field(None, example=GameTaskStateEnum.RUNNING)
+    started_at: str = Field(None, example="2024-06-29T15:50:21+00:00")
+    duration: float = Field(None, example=12.5, description="Seconds the task ran (or is running) for.")
+    error: Optional[str] = Field(None, example="FileNotFoundError: rcssserver")
+    released_by_supervisor: bool = Field(None, example=False, description="The slot was released by the task supervisor, the game never reported its end.")
+
+class GetGameTasksResponse(BaseModel):
+    tasks: list[GameTaskMessage] = Field(None, example=[{"game_id": 1, "port": 6000, "state": "running"}])
+    counters: dict[str, int] = Field(None, example={"started": 10, "finished": 9, "crashed": 1, "cancelled": 0, "released_by_supervisor": 1})
+    available_games_count: int = Field(None, example=1)
+
+class GameEventEnum(str, Enum):
+    SNAPSHOT = 'snapshot'  # state of a running game when a client subscribes
+    PREPARING = 'preparing'
+    SPAWNED = 'spawned'
+    PLAYERS_CONNECTED = 'players_connected'
+    CYCLE = 'cycle'
+    SCORE = 'score'
+    FINISHED = 'finished'
+    UPLOADED = 'uploaded'
+
+class GameEventMessage(GameSummaryMessage):
+    event: GameEventEnum = Field(None, example="cycle")
+    error: Optional[str] = Field(None, example=None)
+    timestamp: Optional[str] = Field(None, example="2024-09-18T12:34:56Z")
 
 class TeamMessage(BaseModel):
     user_id: int = Field(None, example=1)
@@ -306,7 +366,7 @@ class UpdateTournamentRequestMessage(BaseModel):
 
 class SendCommandRequest(BaseModel):
     runner_ids: Optional[Union[int, List[int]]] = Field(None,examples=[1,2],description="Runner ID (int) or list of runner IDs to send the command to.")
-    command: RunnerCommandMessageEnum = Field(..., examples=['resume', 'pause', 'stop', 'hello'],description="Command to send to the runner.")
+    command: RunnerCommandMessageEnum = Field(..., examples=['resume', 'pause', 'stop', 'drain', 'hello'],description="Command to send to the runner.")
 
 class RequestedCommandToRunnerMessage(BaseModel):
     command: RunnerCommandMessageEnum = Field(..., example="resume", description="Command to be sent to the runner.")
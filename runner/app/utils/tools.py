@@ -1,10 +1,16 @@
 import os
 import zipfile
+import shutil
 import psutil
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 
 class Tools:
+    # mode of the files and directories of an extracted base team, None keeps the permission bits of the zip
+    base_team_file_mode = 0o777
+    unzip_workers = 4
+
     @staticmethod
     def  zip_directory(directory_path, zip_file_path):
         # Create a ZipFile object in write mode
@@ -18,18 +24,93 @@ class Tools:
                     zipf.write(full_path, os.path.relpath(full_path, directory_path))
 
     @staticmethod
-    def unzip_file(zip_file_path, directory_path):
-        # Create a ZipFile object in read mode
+    def get_unzip_target(directory_path, name):
+        # like extractall, but an entry that would land outside directory_path fails the whole archive
+        parts = name.replace('\\', '/').split('/')
+        if name.startswith(('/', '\\')) or '..' in parts or ':' in parts[0]:
+            raise ValueError(f'Unsafe path in zip file: {name}')
+        target = os.path.normpath(os.path.join(directory_path, *[part for part in parts if part]))
+        if target != directory_path and not target.startswith(directory_path + os.sep):
+            raise ValueError(f'Unsafe path in zip file: {name}')
+        return target
+
+    @staticmethod
+    def unzip_file(zip_file_path, directory_path, mode=None, workers=None):
+        """
+        Extracts the zip in one pass: every file is streamed to disk and gets its mode when it is created,
+        no second walk over the tree. mode applies to every file and directory, None keeps the permission
+        bits of the zip (0o644/0o755 for archives without them). Files are extracted by a thread pool,
+        zlib releases the GIL while it inflates.
+        """
+        directory_path = os.path.realpath(directory_path)
         with zipfile.ZipFile(zip_file_path, 'r') as zipf:
-            # Extract all the contents of zip file in the current directory
-            zipf.extractall(directory_path)
+            infos = zipf.infolist()
+            # check every entry before writing anything
+            targets = [Tools.get_unzip_target(directory_path, info.filename) for info in infos]
+
+            def get_mode(info, default):
+                if mode is not None:
+                    return mode
+                return (info.external_attr >> 16) & 0o777 or default
+
+            dir_modes = {}
+            files = {}  # by target, the last entry wins like in extractall
+            for info, target in zip(infos, targets):
+                if info.is_dir():
+                    dir_modes[target] = get_mode(info, 0o755)
+                else:
+                    files[target] = info
+                # the parents without their own entry
+                parent = os.path.dirname(target)
+                while parent != directory_path and parent not in dir_modes:
+                    dir_modes[parent] = mode
+                    parent = os.path.dirname(parent)
+            dir_modes.pop(directory_path, None)
+            os.makedirs(directory_path, exist_ok=True)
+            for dir_path in sorted(dir_modes):
+                os.makedirs(dir_path, exist_ok=True)
+
+            def extract(info, target):
+                file_mode = get_mode(info, 0o644)
+                fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, file_mode)
+                with zipf.open(info) as source, os.fdopen(fd, 'wb') as destination:
+                    os.fchmod(destination.fileno(), file_mode)  # not masked by the umask
+                    shutil.copyfileobj(source, destination, 1024 * 1024)
+
+            def extract_all(batch):
+                for target, info in batch:
+                    extract(info, target)
+
+            # one batch per thread, the biggest files spread first
+            workers = min(workers or Tools.unzip_workers, len(files)) or 1
+            entries = sorted(files.items(), key=lambda entry: entry[1].file_size, reverse=True)
+            batches = [entries[i::workers] for i in range(workers)]
+            if workers == 1:
+                extract_all(entries)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for result in [executor.submit(extract_all, batch) for batch in batches]:
+                        result.result()
+
+            # last, a directory without the write bit can not be filled
+            for dir_path, dir_mode in dir_modes.items():
+                if dir_mode is not None:
+                    os.chmod(dir_path, dir_mode)
+        return len(files)
 
     @staticmethod
     def kill_process_tree(pid):
-        parent = psutil.Process(pid)
-        for child in parent.children(recursive=True):
-            child.kill()
-        parent.kill()
+        try:
+            parent = psutil.Process(pid)
+            children = parent.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return
+        # a process may exit by itself meanwhile (e.g. the 'sh -c' wrapper when its child is killed)
+        for process in children + [parent]:
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                pass
 
     @staticmethod
 
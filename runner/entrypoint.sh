@@ -5,6 +5,7 @@
 : "${LOG_DIR:=/app/data/logs}"
 : "${API_KEY:=api-key}"
 : "${MAX_GAMES_COUNT:=5}"
+: "${WORKERS:=1}"
 : "${USE_FAST_API:=true}"
 : "${FAST_API_IP:=127.0.0.1}"
 : "${FAST_API_PORT:=8082}"
@@ -26,6 +27,9 @@
 : "${BASE_TEAM_BUCKET_NAME:=baseteam}"
 : "${TEAM_CONFIG_BUCKET_NAME:=teamconfig}"
 : "${GAME_LOG_BUCKET_NAME:=gamelog}"
+: "${USE_FAKE_SERVER:=false}"
+: "${USE_GAME_WATCHDOG:=true}"
+: "${DRAIN_TIMEOUT:=1800}"
 
 cd app
 
@@ -34,6 +38,7 @@ exec python -m main \
     --log-dir "$LOG_DIR" \
     --api-key "$API_KEY" \
     --max-games-count "$MAX_GAMES_COUNT" \
+    --workers "$WORKERS" \
     --use-fast-api "$USE_FAST_API" \
     --fast-api-port "$FAST_API_PORT" \
     --fast-api-ip "$FAST_API_IP" \
@@ -54,5 +59,8 @@ exec python -m main \
     --base-team-bucket-name "$BASE_TEAM_BUCKET_NAME" \
     --team-config-bucket-name "$TEAM_CONFIG_BUCKET_NAME" \
     --game-log-bucket-name "$GAME_LOG_BUCKET_NAME" \
-    --to-runner-queue "$TO_RUNNER_QUEUE"
+    --to-runner-queue "$TO_RUNNER_QUEUE" \
+    --use-fake-server "$USE_FAKE_SERVER" \
+    --use-game-watchdog "$USE_GAME_WATCHDOG" \
+    --drain-timeout "$DRAIN_TIMEOUT"
 
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# Benchmark of the round robin game generation of a tournament (TournamentManager.create_all_games).
+# Compares, on a fresh SQLite database for every run:
+#   orm  - the previous implementation: the teams are loaded with their tournaments and one GameModel
+#          per pair is added to the session
+#   bulk - TournamentManager.create_all_games: the team ids only and one executemany insert
+# Usage (from tournament_manager2/app):
+#   python benchmark.py --teams 50 200 500
+#   python benchmark.py --teams 200 --approaches bulk --repeat 3 --output bulk.json
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime, timezone
+
+from sqlalchemy import select, func, insert
+from sqlalchemy.orm import selectinload
+
+from managers.database_manager import DatabaseManager
+from managers.tournament_manager import TournamentManager
+from models import UserModel, TeamModel, TournamentModel, GameModel
+from models.association_table import tournament_team_association
+from models.tournament_model import TournamentStatus
+
+
+APPROACHES = ['orm', 'bulk']
+
+
+async def create_all_games_orm(session, tournament_id: int) -> int:
+    # the implementation before the bulk insert, kept as the baseline
+    stmt = select(TeamModel).options(
+        selectinload(TeamModel.tournaments)
+        ).filter(TeamModel.tournaments.any(id=tournament_id))
+    teams = (await session.execute(stmt)).scalars().all()
+    count = 0
+    for i in range(len(teams)):
+        for j in range(i + 1, len(teams)):
+            session.add(GameModel(
+                left_team_id=teams[i].id,
+                right_team_id=teams[j].id,
+                tournament_id=tournament_id
+            ))
+            count += 1
+    await session.commit()
+    return count
+
+
+async def create_all_games_bulk(session, tournament_id: int) -> int:
+    return await TournamentManager(session, None).create_all_games(tournament_id)
+
+
+class Benchmark:
+    def __init__(self, args):
+        self.logger = logging.getLogger(__name__)
+        self.args = args
+        self.work_dir = tempfile.mkdtemp(prefix='tm-benchmark-')
+
+    async def setup(self, db_manager: DatabaseManager, teams: int) -> int:
+        # the tournament and its teams, inserted in bulk so the setup does not dominate the run
+        async for session in db_manager.get_session():
+            user = UserModel(name='benchmark', code='benchmark')
+            now = datetime.utcnow()
+            tournament = TournamentModel(name='benchmark', owner=user, start_at=now, start_registration_at=now,
+                                         end_registration_at=now, status=TournamentStatus.WAIT_FOR_START)
+            session.add_all([user, tournament])
+            await session.flush()
+            team_ids = (await session.execute(
+                insert(TeamModel).returning(TeamModel.id),
+                [{'name': f'team{i}', 'user_id': user.id, 'base_team': 'base'} for i in range(teams)]
+            )).scalars().all()
+            await session.execute(insert(tournament_team_association),
+                                  [{'tournament_id': tournament.id, 'team_id': team_id} for team_id in team_ids])
+            await session.commit()
+            return tournament.id
+
+    async def run_once(self, approach: str, teams: int, index: int) -> dict:
+        database_path = os.path.join(self.work_dir, f'{approach}-{teams}-{index}.db')
+        db_manager = DatabaseManager(f'sqlite+aiosqlite:///{database_path}')
+        await db_manager.init_db()
+        try:
+            tournament_id = await self.setup(db_manager, teams)
+            create_all_games = create_all_games_orm if approach == 'orm' else create_all_games_bulk
+            async for session in db_manager.get_session():
+                start = time.perf_counter()
+                created = await create_all_games(session, tournament_id)
+                seconds = time.perf_counter() - start
+            async for session in db_manager.get_session():
+                stored = (await session.execute(
+                    select(func.count(GameModel.id)).where(GameModel.tournament_id == tournament_id)
+                )).scalar()
+        finally:
+            await db_manager.engine.dispose()
+            os.remove(database_path)
+        expected = teams * (teams - 1) // 2
+        if created != expected or stored != expected:
+            raise RuntimeError(f'{approach} with {teams} teams: {created} created, {stored} stored, {expected} expected')
+        return {'seconds': seconds, 'games': stored}
+
+    async def run(self) -> dict:
+        results = []
+        try:
+            for teams in self.args.teams:
+                for approach in self.args.approaches:
+                    runs = [await self.run_once(approach, teams, index) for index in range(self.args.repeat)]
+                    seconds = [run['seconds'] for run in runs]
+                    result = {
+                        'approach': approach,
+                        'teams': teams,
+                        'games': runs[0]['games'],
+                        'runs': len(runs),
+                        'min_seconds': round(min(seconds), 4),
+                        'mean_seconds': round(statistics.mean(seconds), 4),
+                        'games_per_second': round(runs[0]['games'] / min(seconds), 1) if min(seconds) > 0 else 0,
+                    }
+                    self.logger.warning(f"{approach:5} {teams:5} teams: {result['games']:7} games in "
+                                        f"{result['min_seconds']:.3f}s")
+                    results.append(result)
+        finally:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+        return {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'results': results,
+        }
+
+
+def print_table(result: dict):
+    by_key = {(row['approach'], row['teams']): row for row in result['results']}
+    print(f"{'teams':>6} {'games':>8} " + ' '.join(f'{approach + " s":>10}' for approach in APPROACHES) + f" {'speedup':>8}")
+    for teams in sorted({row['teams'] for row in result['results']}):
+        rows = [by_key.get((approach, teams)) for approach in APPROACHES]
+        games = next(row['games'] for row in rows if row is not None)
+        seconds = [f"{row['min_seconds']:>10.3f}" if row else f"{'-':>10}" for row in rows]
+        speedup = f"{rows[0]['min_seconds'] / rows[1]['min_seconds']:>7.1f}x" \
+            if all(rows) and rows[1]['min_seconds'] > 0 else f"{'-':>8}"
+        print(f"{teams:>6} {games:>8} {' '.join(seconds)} {speedup}")
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Round robin game generation benchmark (ORM objects vs bulk insert)")
+    parser.add_argument("--teams", type=int, nargs='+', default=[50, 200, 500], help="Team counts of the tournaments")
+    parser.add_argument("--approaches", choices=APPROACHES, nargs='+', default=APPROACHES, help="Implementations to run")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs of every approach and team count, the fastest is reported")
+    parser.add_argument("--output", type=str, help="Write the JSON result to this file")
+    return parser.parse_args()
+
+
+async def main():
+    args = get_args()
+    logging.basicConfig(level=logging.WARNING, format='%(message)s', force=True)
+    result = await Benchmark(args).run()
+    print(json.dumps(result, indent=2))
+    print_table(result)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
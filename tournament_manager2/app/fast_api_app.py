@@ -7,7 +7,9 @@ from managers.team_manager import TeamManager
 from managers.user_manager import UserManager
 from managers.database_manager import DatabaseManager
 from managers.runner_manager import RunnerManager
-from models.runner_log_model import RunnerLogModel
+from managers.deadline_scheduler import DeadlineScheduler
+from managers.game_dispatcher import GameDispatcher
+from managers.database_writer import DatabaseWriter
 
 from fastapi.security.api_key import APIKeyHeader
 from starlette.status import HTTP_403_FORBIDDEN
@@ -17,7 +19,7 @@ from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import AsyncGenerator, List
+from typing import AsyncGenerator, List, Awaitable, Callable
 from storage.minio_client import MinioClient
 
 from fastapi.openapi.docs import get_swagger_ui_html
@@ -69,6 +71,9 @@ class FastApiApp:
         self.api_key_name = api_key_name
         self.port = port
         self.game_log_tmp_path = "/app/game_log_tmp"
+        self.tournament_scheduler: DeadlineScheduler = None
+        self.game_dispatcher: GameDispatcher = None
+        self.database_writer: DatabaseWriter = None
 
         # Add CORS middleware
         self.app.add_middleware(
@@ -92,6 +97,23 @@ class FastApiApp:
 
         self.setup_routes()
 
+    def notify_tournament_scheduler(self):
+        # the deadlines of the tournaments may have changed, a failed request only costs a reload
+        if self.tournament_scheduler is not None:
+            self.tournament_scheduler.notify()
+
+    def notify_game_dispatcher(self, runner_changed: bool = True):
+        # a runner registered, changed its status or got a command, its free slots are loaded again
+        if self.game_dispatcher is not None:
+            self.game_dispatcher.notify(reload=runner_changed)
+
+    async def write_runner_update(self, runner_manager: RunnerManager,
+                                  write: Callable[[RunnerManager], Awaitable[ResponseMessage]]) -> ResponseMessage:
+        # through the database writer, committed with the other runner updates of its batch, when there is one
+        if self.database_writer is None:
+            return await write(runner_manager)
+        return await self.database_writer.submit(lambda session: write(RunnerManager(db_session=session)))
+
     def setup_routes(self):
         api_key_header = APIKeyHeader(name=self.api_key_name, auto_error=False)
 
@@ -178,11 +200,12 @@ class FastApiApp:
                 return ResponseMessage(success=False, error=str(e))
 
         @self.app.get("/user/get_all", response_model=Union[ResponseMessage, GetUsersResponseMessage], tags=["User Management"])
-        async def get_users(user_manager: UserManager = Depends(get_user_manager),
+        async def get_users(request: PageRequestMessage = Depends(),
+                            user_manager: UserManager = Depends(get_user_manager),
                             api_key: str = Depends(get_api_key)):
-            self.logger.info(f"get_users")
+            self.logger.info(f"get_users: {request}")
             try:
-                return await user_manager.get_users()
+                return await user_manager.get_users(request)
             except Exception as e:
                 self.logger.error(f"get_users: {e}")
                 traceback.print_exc()
@@ -223,12 +246,13 @@ class FastApiApp:
                 return ResponseMessage(success=False, error=str(e))
 
         @self.app.post("/team/get_all", response_model=Union[ResponseMessage, GetTeamsResponseMessage], tags=["Team Management"])
-        async def get_teams(team_manager: TeamManager = Depends(get_team_manager),
+        async def get_teams(request: GetTeamsRequestMessage = Depends(),
+                            team_manager: TeamManager = Depends(get_team_manager),
                             user_manager: UserManager = Depends(get_user_manager),
                             api_key: str = Depends(get_api_key)):
-            self.logger.info(f"get_teams")
+            self.logger.info(f"get_teams: {request}")
             try:
-                return await team_manager.get_teams()
+                return await team_manager.get_teams(request)
             except Exception as e:
                 self.logger.error(f"get_teams: {e}")
                 traceback.print_exc()
@@ -279,7 +303,9 @@ class FastApiApp:
                 AddTournamentRequestMessage.model_validate(message.model_dump())
                 user = await user_manager.get_user_or_create(message.user_code)
                 self.logger.info(f"add_tournament: adding message to manager: {message}")
-                return await tournament_manager.add_tournament(message)
+                res = await tournament_manager.add_tournament(message)
+                self.notify_tournament_scheduler()
+                return res
             except Exception as e:
                 self.logger.error(f"add_tournament: {e}")
                 traceback.print_exc()
@@ -300,11 +326,12 @@ class FastApiApp:
                 return ResponseMessage(success=False, error=str(e))
 
         @self.app.post("/tournament/get_all", response_model=Union[ResponseMessage, GetTournamentsResponseMessage], tags=["Tournament Management"])
-        async def get_tournaments(tournament_manager: TournamentManager = Depends(get_tournament_manager),
+        async def get_tournaments(request: GetTournamentsRequestMessage = Depends(),
+                                  tournament_manager: TournamentManager = Depends(get_tournament_manager),
                                   api_key: str = Depends(get_api_key)):
-            self.logger.info(f"get_tournaments")
+            self.logger.info(f"get_tournaments: {request}")
             try:
-                return await tournament_manager.get_tournaments()
+                return await tournament_manager.get_tournaments(request)
             except Exception as e:
                 self.logger.error(f"get_tournaments: {e}")
                 traceback.print_exc()
@@ -356,7 +383,9 @@ class FastApiApp:
                 message = message_json
                 UpdateTournamentRequestMessage.model_validate(message.model_dump())
                 self.logger.info(f"update_tournament: adding message to manager: {message}")
-                return await tournament_manager.update_tournament(message)
+                res = await tournament_manager.update_tournament(message)
+                self.notify_tournament_scheduler()
+                return res
             except Exception as e:
                 self.logger.error(f"update_tournament: {e}")
                 traceback.print_exc()
@@ -372,7 +401,9 @@ class FastApiApp:
                 message = message_json
                 AddFriendlyGameRequestMessage.model_validate(message.model_dump())
                 self.logger.info(f"add_friendly_game: adding message to manager: {message}")
-                return await tournament_manager.add_friendly_game(message)
+                res = await tournament_manager.add_friendly_game(message)
+                self.notify_tournament_scheduler()
+                return res
             except Exception as e:
                 self.logger.error(f"add_friendly_game: {e}")
                 traceback.print_exc()
@@ -471,14 +502,17 @@ class FastApiApp:
 
         @self.app.get("/runner/get_all", response_model=GetAllRunnersResponseMessage, tags=["Runner Management"])
         async def get_all_runners(
+            request: GetAllRunnersRequestMessage = Depends(),
             runner_manager: RunnerManager = Depends(get_runner_manager),
             api_key: str = Depends(get_api_key)
         ):
-            self.logger.info("get_all_runners")
+            self.logger.info(f"get_all_runners: {request}")
             try:
-                runners = await runner_manager.get_all_runners()
+                runners = await runner_manager.get_all_runners(request)
                 self.logger.info(f"get_all_runners: Retrieved {len(runners.runners)} runners")
                 return runners
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
                 self.logger.error(f"get_all_runners: {e}")
                 traceback.print_exc()
@@ -487,18 +521,22 @@ class FastApiApp:
         @self.app.get("/runner/get_log/{runner_id}", response_model=GetRunnerLogResponseMessage, tags=["Runner Management"])
         async def get_runner_log(
             runner_id: int,
+            request: GetRunnerLogRequestMessage = Depends(),
             runner_manager: RunnerManager = Depends(get_runner_manager),
             api_key: str = Depends(get_api_key)
         ):
-            self.logger.info(f"get_runner_log: {runner_id}")
+            self.logger.info(f"get_runner_log: {runner_id} {request}")
             try:
-                logs = await runner_manager.get_runner_logs(runner_id)
-                if not logs:
+                response = await runner_manager.get_runner_logs(runner_id, request)
+                # the page after the last one is empty, not missing
+                if not response.logs and not request.cursor:
                     raise HTTPException(status_code=404, detail="No logs found for the runner")
-                self.logger.info(f"get_runner_log: Retrieved {len(logs)} logs for runner {runner_id}")
-                return GetRunnerLogResponseMessage(logs=logs)
+                self.logger.info(f"get_runner_log: Retrieved {len(response.logs)} logs for runner {runner_id}")
+                return response
             except HTTPException as he:
                 raise he
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             except Exception as e:
                 self.logger.error(f"get_runner_log: {e}")
                 traceback.print_exc()
@@ -516,7 +554,7 @@ class FastApiApp:
             - If runner_ids is empty or contains invalid IDs, appropriate errors are returned.
             """
             self.logger.info(f"send_command: {command_request}")
-            valid_commands = ["stop", "pause", "resume", "hello"]
+            valid_commands = ["stop", "pause", "resume", "drain", "hello"]
             if command_request.command not in valid_commands:
                 self.logger.error(f"send_command: Invalid command: {command_request.command}")
                 return AnyResponseMessage(success=False, value="Invalid command.")
@@ -526,6 +564,7 @@ class FastApiApp:
                     runners_ids = [command_request.runner_ids]
                 
                 responses = await runner_manager.send_command_to_runners(runners_ids, command_request.command)
+                self.notify_game_dispatcher()
                 return AnyResponseMessage(success=True, value=responses, error=None)
             except Exception as e:
                 self.logger.exception(f"send_command: Unexpected error: {e}")
@@ -540,7 +579,7 @@ class FastApiApp:
         ):
             self.logger.info(f"game_started: {json}")
             try:
-                response = await runner_manager.handle_game_started(json)
+                response = await self.write_runner_update(runner_manager, lambda manager: manager.handle_game_started(json))
                 return response
             except Exception as e:
                 self.logger.error(f"game_started: {e}")
@@ -555,7 +594,10 @@ class FastApiApp:
         ):
             self.logger.info(f"game_finished: {json}")
             try:
-                response = await runner_manager.handle_game_finished(json)
+                response = await self.write_runner_update(runner_manager, lambda manager: manager.handle_game_finished(json))
+                # a rejected report (unknown runner or game) frees no slot
+                if self.game_dispatcher is not None and response.success:
+                    self.game_dispatcher.on_game_finished(json.runner_id)
                 return response
             except Exception as e:
                 self.logger.error(f"game_finished: {e}")
@@ -570,7 +612,9 @@ class FastApiApp:
         ):
             self.logger.info(f"runner_register: {json}")
             try:
-                return await runner_manager.register(json)
+                response = await runner_manager.register(json)
+                self.notify_game_dispatcher()
+                return response
             except Exception as e:
                 self.logger.error(f"runner_register: {e}")
                 traceback.print_exc()
@@ -584,25 +628,13 @@ class FastApiApp:
         ):
             self.logger.info(f"submit_runner_log: {log}")
             try:
-                # check if runner exists
-                runner = await runner_manager.get_runner(log.runner_id)
-                if not runner:
+                response = await self.write_runner_update(runner_manager, lambda manager: manager.add_log(log))
+                if response.error == "Runner not found":
                     self.logger.error(f"Runner with id {log.runner_id} not found")
                     raise HTTPException(status_code=404, detail="Runner not found")
 
-                # RunnerLogModel instance
-                new_log = RunnerLogModel(
-                    runner_id=log.runner_id,
-                    message=log.message,
-                    log_level=log.log_level,
-                    timestamp=datetime.fromisoformat(log.timestamp) # or datetime.utcnow()
-                )
-
-                runner_manager.db_session.add(new_log)
-                await runner_manager.db_session.commit()
-
                 self.logger.info(f"Log submitted for runner {log.runner_id}")
-                return ResponseMessage(success=True, error=None)
+                return response
             except HTTPException as he:
                 raise he
             except Exception as e:
@@ -618,7 +650,9 @@ class FastApiApp:
         ):
             self.logger.info(f"status_update: {status_message}")
             try:
-                response = await runner_manager.handle_status_update(status_message)
+                response = await self.write_runner_update(runner_manager,
+                                                          lambda manager: manager.handle_status_update(status_message))
+                self.notify_game_dispatcher()
                 if not response.success:
                     raise HTTPException(status_code=400, detail=response.error)
                 return response
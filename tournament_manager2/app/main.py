@@ -10,8 +10,9 @@ import signal
 from managers.database_manager import DatabaseManager
 from utils.rmq_message_sender import RmqMessageSender
 from storage.minio_client import MinioClient
-from managers.scheduler import Scheduler
-from managers.run_game_sender import run_game_sender_by_manager
+from managers.deadline_scheduler import DeadlineScheduler
+from managers.game_dispatcher import GameDispatcher
+from managers.database_writer import DatabaseWriter
 
 
 logging.warning("This is a warning message")
@@ -38,6 +39,15 @@ def get_args():
     parser.add_argument("--base-team-bucket-name", type=str, default="baseteam", help="Team bucket name")
     parser.add_argument("--team-config-bucket-name", type=str, default="teamconfig", help="Team config bucket name")
     parser.add_argument("--game-log-bucket-name", type=str, default="gamelog", help="Match bucket name")
+    parser.add_argument("--minio-upload-part-size-mb", type=int, default=16, help="Minio multipart upload part size in MB")
+    parser.add_argument("--minio-upload-parallelism", type=int, default=4, help="Number of parts uploaded in parallel")
+    parser.add_argument("--game-dispatch", type=str, default="queue", choices=["dispatcher", "queue"],
+                        help="dispatcher: send the games to the runners with free slots, queue: publish every game of a tournament to the to runner queue")
+    parser.add_argument("--runner-api-key", type=str, default="api-key", help="API key of the runners")
+    parser.add_argument("--dispatcher-resync-interval", type=float, default=60, help="Seconds after which the free slots of the runners are loaded again from the database")
+    parser.add_argument("--scheduler-max-sleep", type=float, default=3600, help="Seconds after which the tournament deadlines are reloaded even if nothing changed them through the API")
+    parser.add_argument("--db-busy-timeout", type=int, default=5000, help="Milliseconds a connection waits for a locked database before it fails")
+    parser.add_argument("--db-writer-max-batch", type=int, default=100, help="Runner updates committed together by the database writer, 0 commits every update in its own request")
     args, unknown = parser.parse_known_args()
     return args
 
@@ -61,9 +71,16 @@ async def main():
     database_path = os.path.abspath(os.path.join(args.data_dir, args.db))
     logging.info(f'{database_path=}')
 
-    database_manager = DatabaseManager('sqlite+aiosqlite:///{}'.format(f'{database_path}'))
+    database_manager = DatabaseManager('sqlite+aiosqlite:///{}'.format(f'{database_path}'),
+                                       sqlite_pragmas={'busy_timeout': args.db_busy_timeout})
     await database_manager.init_db()  # Initialize the database (create tables)
 
+    # one task commits the updates of the runners in batches
+    database_writer = None
+    if args.db_writer_max_batch > 0:
+        database_writer = DatabaseWriter(database_manager, max_batch=args.db_writer_max_batch)
+        database_writer.run()
+
     # Initialize MinioClient
     minio_client = None
     if args.minio_use:
@@ -75,36 +92,63 @@ async def main():
             server_bucket_name=args.server_bucket_name,
             base_team_bucket_name=args.base_team_bucket_name,
             team_config_bucket_name=args.team_config_bucket_name,
-            game_log_bucket_name=args.game_log_bucket_name
+            game_log_bucket_name=args.game_log_bucket_name,
+            upload_part_size=args.minio_upload_part_size_mb * 1024 * 1024,
+            upload_parallelism=args.minio_upload_parallelism
         )
         await minio_client.init()
         await minio_client.wait_to_connect()
         await minio_client.create_buckets()
         
-    if args.rabbitmq_use:
+    # the to runner queue is only used when the games are not sent by the game dispatcher
+    if args.rabbitmq_use and args.game_dispatch == "queue":
         rmq_message_sender = RmqMessageSender(args.rabbitmq_host, args.rabbitmq_port, args.to_runner_queue,
                                             args.rabbitmq_username,
                                             args.rabbitmq_password)
         await rmq_message_sender.connect()
 
+    # sends the queued games to the runners that have free slots, woken up when a game finishes
+    game_dispatcher = None
+    if args.game_dispatch == "dispatcher":
+        game_dispatcher = GameDispatcher(
+            db_manager=database_manager,
+            runner_api_key=args.runner_api_key,
+            resync_interval=args.dispatcher_resync_interval
+        )
+
+    # moves the tournaments to their next status at their deadlines, woken up by the api when one changes
+    scheduler = None
+    if game_dispatcher is not None:
+        scheduler = DeadlineScheduler(
+            db_manager=database_manager,
+            rabbitmq_manager=None,
+            max_sleep=args.scheduler_max_sleep,
+            game_dispatcher=game_dispatcher
+        )
+    elif args.rabbitmq_use:
+        scheduler = DeadlineScheduler(
+            db_manager=database_manager,
+            rabbitmq_manager=rmq_message_sender,
+            max_sleep=args.scheduler_max_sleep
+        )
+
     async def run_fastapi():
         logging.info('Starting FastAPI app')
         fast_api_app = FastApiApp(database_manager, minio_client, api_key, api_key_name, args.fast_api_port)
         fast_api_app.game_log_tmp_path = args.tmp_game_log_dir
+        fast_api_app.tournament_scheduler = scheduler
+        fast_api_app.game_dispatcher = game_dispatcher
+        fast_api_app.database_writer = database_writer
         await fast_api_app.run()
 
     async def running_game_sender():
         # Initialize and start the scheduler
-        if not args.rabbitmq_use:
-            logging.error("RabbitMQ is not used. Exiting...")
+        if scheduler is None:
+            logging.error("Neither the game dispatcher nor RabbitMQ is used. Exiting...")
             return
-        scheduler = Scheduler(
-            interval=10,  # Run every 10 seconds
-            function=run_game_sender_by_manager,
-            rabbitmq_manager=rmq_message_sender,
-            db_manager=database_manager
-        )
         scheduler.run()
+        if game_dispatcher is not None:
+            game_dispatcher.run()
 
     async def run_smart_contract():
         pass
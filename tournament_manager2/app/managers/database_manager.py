@@ -1,21 +1,40 @@
 # managers/database_manager.py
 
+import logging
+from sqlalchemy import inspect, text, event
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncEngine
 from sqlalchemy.orm import sessionmaker
 from models.base import Base
 from typing import AsyncGenerator, Optional
 
 class DatabaseManager:
-    def __init__(self, database_url: str):
+    # set on every new SQLite connection: readers do not block the writer (WAL), a commit does not wait for an
+    # fsync (synchronous=NORMAL is durable up to the last checkpoint in WAL mode), a locked database is waited
+    # for instead of failing with "database is locked", and a larger page cache and memory mapped reads
+    sqlite_pragmas = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,  # ms
+        'cache_size': -65536,  # KiB, 64 MiB
+        'mmap_size': 268435456,  # bytes, 256 MiB
+        'temp_store': 'MEMORY',
+    }
+
+    def __init__(self, database_url: str, sqlite_pragmas: dict = None):
         self.database_url = database_url
+        self.sqlite_pragmas = {**DatabaseManager.sqlite_pragmas, **(sqlite_pragmas or {})}
         self.engine: Optional[AsyncEngine] = None
         self.async_session: Optional[sessionmaker] = None
+        self.logger = logging.getLogger(__name__)
 
     async def init_db(self):
         # Create the async engine
         self.engine = create_async_engine(
             self.database_url, echo=False, future=True
         )
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine.sync_engine, 'connect', self.set_sqlite_pragmas)
 
         # Create the sessionmaker
         self.async_session = sessionmaker(
@@ -25,6 +44,50 @@ class DatabaseManager:
         # Create all tables
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            created = await conn.run_sync(DatabaseManager.create_missing_indexes)
+        if created:
+            self.logger.info(f"Created the indexes {created}")
+
+    def set_sqlite_pragmas(self, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in self.sqlite_pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    @staticmethod
+    def create_missing_indexes(connection: Connection) -> list[str]:
+        """
+        create_all creates the indexes of the tables it creates only, the indexes added to the models later are
+        created here in the existing database files. Returns the names of the created indexes.
+        """
+        inspector = inspect(connection)
+        created = []
+        for table in Base.metadata.sorted_tables:
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name not in existing:
+                    index.create(connection)
+                    created.append(index.name)
+        if created:
+            # the statistics the query planner chooses between the indexes with
+            connection.execute(text('ANALYZE'))
+        return created
+
+    @staticmethod
+    def drop_stale_indexes(connection: Connection) -> list[str]:
+        """
+        Drops the ix_ indexes of the model tables that the models no longer declare, indexes named any other way
+        are kept. Never called on startup, only by migrate_db.py --drop-stale-indexes. Returns the dropped names.
+        """
+        inspector = inspect(connection)
+        dropped = []
+        for table in Base.metadata.sorted_tables:
+            declared = {index.name for index in table.indexes}
+            for index in inspector.get_indexes(table.name):
+                if index['name'].startswith('ix_') and index['name'] not in declared:
+                    connection.execute(text(f'DROP INDEX "{index["name"]}"'))
+                    dropped.append(index['name'])
+        return sorted(dropped)
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         if self.async_session is None:
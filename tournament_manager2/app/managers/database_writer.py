@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from managers.database_manager import DatabaseManager
+
+
+class DatabaseWriter:
+    """
+    Runs the small write transactions of the runner callbacks (game_started, game_finished, status_update,
+    submit_log) one after the other in one task, and commits the writes waiting in its queue together: one
+    transaction and one commit for a batch instead of one per callback. The callbacks no longer compete
+    for the write lock of the database, so they do not fail with "database is locked" when many runners report
+    at once.
+    Every write runs in a savepoint of the batch, so a failing write is rolled back alone. The writes commit
+    with RunnerManager.commit and roll back with RunnerManager.rollback, which only release or roll back the
+    savepoint inside a batch.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, max_batch: int = 100):
+        self.logger = logging.getLogger(__name__)
+        self.db_manager = db_manager
+        self.max_batch = max_batch
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task = None
+
+    async def submit(self, write: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """Runs write(session) in the next batch, returns its result once the batch is committed."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((write, future))
+        return await future
+
+    async def get_batch(self) -> list[tuple[Callable, asyncio.Future]]:
+        # the writes that arrived while the previous batch was written, at least one
+        batch = [await self.queue.get()]
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def write_batch(self, session: AsyncSession, batch: list[tuple[Callable, asyncio.Future]]):
+        # the write lock for the whole batch up front, a deferred transaction could fail to upgrade to a write
+        await session.execute(text('BEGIN IMMEDIATE'))
+        results = []
+        for write, future in batch:
+            nested = await session.begin_nested()
+            try:
+                result = await write(session)
+            except Exception as e:
+                if nested.is_active:
+                    await nested.rollback()
+                results.append((future, None, e))
+                continue
+            if nested.is_active:
+                await nested.commit()
+            results.append((future, result, None))
+        await session.commit()
+        return results
+
+    async def start(self):
+        while True:
+            batch = await self.get_batch()
+            try:
+                async for session in self.db_manager.get_session():
+                    results = await self.write_batch(session, batch)
+            except Exception as e:
+                # the commit failed, none of the writes of the batch is stored
+                self.logger.error(f"Error in database writer, {len(batch)} writes lost: {e}")
+                results = [(future, None, e) for _, future in batch]
+            if len(batch) > 1:
+                self.logger.debug(f"Committed {len(batch)} writes together")
+            for future, result, error in results:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def run(self):
+        self.task = asyncio.create_task(self.start())
+
+    def cancel(self):
+        if self.task:
+            self.task.cancel()
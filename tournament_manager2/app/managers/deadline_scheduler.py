@@ -0,0 +1,120 @@
+import heapq
+import asyncio
+import logging
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from models.tournament_model import TournamentModel, TournamentStatus
+from managers.database_manager import DatabaseManager
+from managers.run_game_sender import run_game_sender_by_session
+from utils.rmq_message_sender import RmqMessageSender
+from managers.game_dispatcher import GameDispatcher
+
+
+class DeadlineScheduler:
+    """
+    Moves the tournaments to their next status at their deadlines instead of polling every few seconds.
+    The next deadline of every pending tournament (start_registration_at, end_registration_at or start_at,
+    depending on its status) is kept in a heap and the scheduler sleeps until the earliest one, then runs
+    the status updates of run_game_sender. notify() wakes it up early to reload the deadlines, it is called
+    when a tournament is created or its times are changed. max_sleep bounds the sleep in case the database
+    is changed by someone else.
+    Without rabbitmq_manager the games of the started tournaments are only queued and game_dispatcher is woken up.
+    """
+    # status -> the column holding the time the tournament leaves it
+    deadline_columns = {
+        TournamentStatus.WAIT_FOR_REGISTRATION: 'start_registration_at',
+        TournamentStatus.REGISTRATION: 'end_registration_at',
+        TournamentStatus.WAIT_FOR_START: 'start_at',
+    }
+
+    def __init__(self, db_manager: DatabaseManager, rabbitmq_manager: RmqMessageSender,
+                 max_sleep: float = 3600, retry_interval: float = 10, game_dispatcher: GameDispatcher = None):
+        self.logger = logging.getLogger(__name__)
+        self.db_manager = db_manager
+        self.rabbitmq_manager = rabbitmq_manager
+        self.max_sleep = max_sleep
+        self.retry_interval = retry_interval
+        self.game_dispatcher = game_dispatcher
+        self.deadlines: list[tuple[datetime, int]] = []  # heap of (deadline, tournament id)
+        self.wake_event = asyncio.Event()
+        self.loaded_at: float = None  # loop time of the last load of the deadlines
+        self.task = None
+
+    @staticmethod
+    async def load_deadlines(session: AsyncSession) -> list[tuple[datetime, int]]:
+        # one query for every pending tournament, only the columns the deadlines need
+        result = await session.execute(
+            select(TournamentModel.id, TournamentModel.status, TournamentModel.start_registration_at,
+                   TournamentModel.end_registration_at, TournamentModel.start_at)
+            .where(TournamentModel.status.in_(list(DeadlineScheduler.deadline_columns)))
+        )
+        deadlines = []
+        for row in result.all():
+            deadline = getattr(row, DeadlineScheduler.deadline_columns[row.status])
+            if deadline is not None:
+                deadlines.append((deadline, row.id))
+        heapq.heapify(deadlines)
+        return deadlines
+
+    def notify(self):
+        self.wake_event.set()
+
+    def get_next_deadline(self):
+        return self.deadlines[0][0] if self.deadlines else None
+
+    def is_due(self) -> bool:
+        deadline = self.get_next_deadline()
+        return deadline is not None and deadline <= datetime.utcnow()
+
+    def get_timeout(self) -> float:
+        deadline = self.get_next_deadline()
+        if deadline is None:
+            return self.max_sleep
+        return min(self.max_sleep, max(0.0, (deadline - datetime.utcnow()).total_seconds()))
+
+    async def run_once(self, run_due: bool):
+        async for session in self.db_manager.get_session():
+            if run_due:
+                await run_game_sender_by_session(self.rabbitmq_manager, session)
+                if self.game_dispatcher is not None:
+                    self.game_dispatcher.notify()
+            self.deadlines = await DeadlineScheduler.load_deadlines(session)
+        self.loaded_at = asyncio.get_running_loop().time()
+        self.logger.info(f"{len(self.deadlines)} tournaments waiting, next deadline: {self.get_next_deadline()}")
+
+    async def wait(self, timeout: float) -> bool:
+        # True if woken up by notify()
+        try:
+            await asyncio.wait_for(self.wake_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def start(self):
+        # the deadlines passed while the manager was down are handled right away
+        run_due = reload = True
+        while True:
+            failed = False
+            if run_due or reload:
+                # cleared before loading, a notify() during the load wakes the next wait up
+                self.wake_event.clear()
+                try:
+                    await self.run_once(run_due)
+                except Exception as e:
+                    self.logger.error(f"Error in deadline scheduler: {e}")
+                    failed = True
+            # a tournament still due after its update (or a failed run) is retried later, not in a busy loop
+            retry = failed or (run_due and self.is_due())
+            woken = await self.wait(self.retry_interval if retry else self.get_timeout())
+            # a timer may fire a few ms early, then the scheduler sleeps again without touching the database
+            run_due = failed or self.is_due()
+            reload = woken or self.loaded_at is None or \
+                asyncio.get_running_loop().time() - self.loaded_at >= self.max_sleep
+
+    def run(self):
+        self.task = asyncio.create_task(self.start())
+
+    def cancel(self):
+        if self.task:
+            self.task.cancel()
@@ -0,0 +1,239 @@
+import time
+import asyncio
+import logging
+import aiohttp
+from datetime import datetime
+from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from models.game_model import GameModel, GameStatusEnum
+from models.runner_model import RunnerModel
+from models.tournament_model import TournamentModel
+from managers.database_manager import DatabaseManager
+from managers.runner_manager import RunnerManager
+from managers.run_game_sender import create_game_info_message
+from utils.messages import GameStartedMessage, RunnerStatusMessageEnum, RunnerCommandMessageEnum
+
+
+class GameDispatcher:
+    """
+    Sends the queued games (IN_QUEUE, without a runner) to the runners that have a free slot, one game per slot,
+    over the runner api (/add_game), instead of publishing every game of a tournament to the shared to_runner queue.
+    The free slots of every runner are its available_games_count minus its running games, loaded from the database
+    and then kept up to date by the dispatcher itself: a slot is taken when a game is sent and given back by
+    on_game_finished. Only RUNNING runners without a pending pause, stop or drain command get games, so no game
+    waits on a paused or crashed runner, and the games go out in the order of the manager (tournament start, game id).
+    A runner that refuses a game or can not be reached gets no game for retry_interval seconds.
+    """
+    # the runner is full or not running, the game is not at fault
+    busy_errors = ('No available games', 'No available ports', 'Runner is ')
+    runner_api_key_name = 'api-key'  # the header the runner api reads its key from
+    dispatchable_commands = (RunnerCommandMessageEnum.NONE, RunnerCommandMessageEnum.RESUME,
+                             RunnerCommandMessageEnum.HELLO)
+
+    def __init__(self, db_manager: DatabaseManager, runner_api_key: str = 'api-key', max_attempts: int = 3,
+                 retry_interval: float = 10, resync_interval: float = 60, request_timeout: float = 600):
+        self.logger = logging.getLogger(__name__)
+        self.db_manager = db_manager
+        self.runner_api_key = runner_api_key
+        self.max_attempts = max_attempts
+        self.retry_interval = retry_interval
+        self.resync_interval = resync_interval
+        self.request_timeout = request_timeout
+        self.addresses: dict[int, str] = {}  # by runner id, only the runners that can take games
+        self.free_slots: dict[int, int] = {}  # by runner id
+        self.blocked_until: dict[int, float] = {}  # by runner id, monotonic time
+        self.in_flight: dict[int, int] = {}  # game id -> runner id, sent and not answered yet
+        self.attempts: dict[int, int] = {}  # by game id, the failed sends of a game
+        self.lock = asyncio.Lock()
+        self.wake_event = asyncio.Event()
+        self.reload = True
+        self.loaded_at: float = None
+        self.send_tasks: set[asyncio.Task] = set()
+        self.task = None
+
+    @staticmethod
+    async def load_runners(session: AsyncSession) -> dict[int, tuple[str, int]]:
+        """The runners that can take games, runner id -> (address, free slots)."""
+        running_games = func.count(GameModel.id)
+        result = await session.execute(
+            select(RunnerModel.id, RunnerModel.address, RunnerModel.available_games_count, running_games)
+            .outerjoin(GameModel, and_(GameModel.runner_id == RunnerModel.id,
+                                       GameModel.status == GameStatusEnum.RUNNING))
+            .where(RunnerModel.status == RunnerStatusMessageEnum.RUNNING,
+                   RunnerModel.requested_command.in_(GameDispatcher.dispatchable_commands))
+            .group_by(RunnerModel.id)
+        )
+        return {runner_id: (address, max(0, capacity - running))
+                for runner_id, address, capacity, running in result.all()}
+
+    @staticmethod
+    async def load_queued_games(session: AsyncSession, limit: int, exclude: list[int]) -> list[GameModel]:
+        # the oldest tournament first, its games in their order
+        result = await session.execute(
+            select(GameModel)
+            .join(TournamentModel, GameModel.tournament_id == TournamentModel.id)
+            .options(selectinload(GameModel.left_team), selectinload(GameModel.right_team))
+            .where(GameModel.status == GameStatusEnum.IN_QUEUE,
+                   GameModel.runner_id.is_(None),
+                   GameModel.id.notin_(exclude))
+            .order_by(TournamentModel.start_at, GameModel.id)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    def notify(self, reload: bool = False):
+        # reload: the runners changed (registered, paused, resumed...), their slots are loaded again
+        self.reload = self.reload or reload
+        self.wake_event.set()
+
+    def on_game_finished(self, runner_id: int):
+        if runner_id in self.free_slots:
+            self.free_slots[runner_id] += 1
+        self.notify()
+
+    def pick_runner(self):
+        # the runner with the most free slots spreads the games over the runners
+        now = time.monotonic()
+        runners = [runner_id for runner_id, free in self.free_slots.items()
+                   if free > 0 and self.blocked_until.get(runner_id, 0) <= now]
+        if not runners:
+            return None
+        return max(runners, key=lambda runner_id: self.free_slots[runner_id])
+
+    def get_free_slots(self) -> int:
+        now = time.monotonic()
+        return sum(free for runner_id, free in self.free_slots.items()
+                   if free > 0 and self.blocked_until.get(runner_id, 0) <= now)
+
+    def block(self, runner_id: int):
+        self.blocked_until[runner_id] = time.monotonic() + self.retry_interval
+
+    async def dispatch_once(self, session: AsyncSession) -> int:
+        """Sends as many queued games as there are free slots, returns the number of games sent."""
+        if self.reload or self.loaded_at is None or time.monotonic() - self.loaded_at >= self.resync_interval:
+            self.reload = False
+            runners = await GameDispatcher.load_runners(session)
+            self.addresses = {runner_id: address for runner_id, (address, _) in runners.items()}
+            # the games sent and not answered yet are not running in the database
+            self.free_slots = {runner_id: free for runner_id, (_, free) in runners.items()}
+            for runner_id in self.in_flight.values():
+                if runner_id in self.free_slots:
+                    self.free_slots[runner_id] = max(0, self.free_slots[runner_id] - 1)
+            self.loaded_at = time.monotonic()
+        free_slots = self.get_free_slots()
+        if free_slots == 0:
+            return 0
+        games = await GameDispatcher.load_queued_games(session, free_slots, list(self.in_flight))
+        sent = 0
+        for game in games:
+            runner_id = self.pick_runner()
+            if runner_id is None:
+                break
+            self.free_slots[runner_id] -= 1
+            self.in_flight[game.id] = runner_id
+            # the message is built here, the session is not used by the send task
+            message = create_game_info_message(game, game.left_team, game.right_team).model_dump()
+            task = asyncio.create_task(self.send_game(runner_id, game.id, message))
+            self.send_tasks.add(task)
+            task.add_done_callback(self.send_tasks.discard)
+            sent += 1
+        if sent:
+            self.logger.info(f"Dispatched {sent} games, {self.get_free_slots()} free slots left")
+        return sent
+
+    async def post_game(self, address: str, message: dict) -> dict:
+        # the runner checks (and downloads) the artifacts of the game before it answers
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with aiohttp.ClientSession(timeout=timeout) as client:
+            async with client.post(f"http://{address}/add_game", json=message,
+                                   headers={GameDispatcher.runner_api_key_name: self.runner_api_key}) as resp:
+                if resp.status != 200:
+                    raise RuntimeError(f"Runner returned status code {resp.status}")
+                return await resp.json()
+
+    async def send_game(self, runner_id: int, game_id: int, message: dict):
+        try:
+            res = await self.post_game(self.addresses[runner_id], message)
+        except Exception as e:
+            res = None
+            error = f"{type(e).__name__}: {e}"
+        else:
+            error = res.get('error') or 'Unknown error'
+        try:
+            async with self.lock:
+                async for session in self.db_manager.get_session():
+                    await self.on_send_result(session, runner_id, game_id, res, error)
+        except Exception as e:
+            self.logger.error(f"Game {game_id}: can not record the dispatch to runner {runner_id}: {e}")
+        finally:
+            self.in_flight.pop(game_id, None)
+            self.notify()
+
+    async def on_send_result(self, session: AsyncSession, runner_id: int, game_id: int, res: dict, error: str):
+        if res is not None and res.get('success'):
+            self.attempts.pop(game_id, None)
+            self.logger.info(f"Game {game_id} started on runner {runner_id} port {res.get('port')}")
+            await RunnerManager(session).handle_game_started(GameStartedMessage(
+                game_id=game_id, success=True, runner_id=runner_id, port=res.get('port')))
+            return
+        if res is None or error.startswith(GameDispatcher.busy_errors):
+            # unreachable, full or paused: the game stays queued for another runner
+            self.logger.warning(f"Runner {runner_id} did not take game {game_id}: {error}")
+            if runner_id in self.free_slots:
+                self.free_slots[runner_id] = 0 if res is not None else self.free_slots[runner_id] + 1
+            self.block(runner_id)
+            self.reload = True
+            return
+        if runner_id in self.free_slots:
+            self.free_slots[runner_id] += 1
+        attempts = self.attempts[game_id] = self.attempts.get(game_id, 0) + 1
+        self.logger.error(f"Runner {runner_id} rejected game {game_id} ({attempts}/{self.max_attempts}): {error}")
+        if attempts < self.max_attempts:
+            return
+        self.attempts.pop(game_id, None)
+        result = await session.execute(select(GameModel).where(GameModel.id == game_id))
+        game = result.scalars().first()
+        if game is not None and game.status == GameStatusEnum.IN_QUEUE:
+            game.status = GameStatusEnum.ERROR
+            game.end_time = datetime.utcnow()
+            await session.commit()
+
+    def get_timeout(self) -> float:
+        # the end of the earliest block, when free slots are waiting for it
+        now = time.monotonic()
+        timeout = self.resync_interval
+        for runner_id, blocked_until in self.blocked_until.items():
+            if blocked_until > now and self.free_slots.get(runner_id, 0) > 0:
+                timeout = min(timeout, blocked_until - now)
+        return timeout
+
+    async def wait(self, timeout: float):
+        try:
+            await asyncio.wait_for(self.wake_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def start(self):
+        while True:
+            self.wake_event.clear()
+            try:
+                async with self.lock:
+                    async for session in self.db_manager.get_session():
+                        await self.dispatch_once(session)
+            except Exception as e:
+                self.logger.error(f"Error in game dispatcher: {e}")
+                self.reload = True
+                await asyncio.sleep(self.retry_interval)
+                continue
+            await self.wait(self.get_timeout())
+
+    def run(self):
+        self.task = asyncio.create_task(self.start())
+
+    def cancel(self):
+        if self.task:
+            self.task.cancel()
+        for task in list(self.send_tasks):
+            task.cancel()
@@ -4,8 +4,8 @@ import asyncio
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import exists
-from sqlalchemy.orm import selectinload
+from sqlalchemy import exists, update
+from sqlalchemy.orm import selectinload, aliased
 from models.tournament_model import TournamentModel, TournamentStatus
 from models.game_model import GameModel, GameStatusEnum
 from models.team_model import TeamModel
@@ -87,53 +87,98 @@ async def update_tournament_status_to_wait_for_start(
         await create_all_games(session, tournament_ids)
     
 
+def select_game_info_rows(tournament_id: int):
+    # the games of the tournament joined with both teams, only the columns of GameInfoMessage
+    left_team = aliased(TeamModel)
+    right_team = aliased(TeamModel)
+    return (
+        select(GameModel.id,
+               left_team.name.label('left_team_name'),
+               left_team.config_encoded.label('left_team_config_encoded'),
+               left_team.base_team.label('left_base_team'),
+               right_team.name.label('right_team_name'),
+               right_team.config_encoded.label('right_team_config_encoded'),
+               right_team.base_team.label('right_base_team'))
+        .join(left_team, GameModel.left_team_id == left_team.id)
+        .join(right_team, GameModel.right_team_id == right_team.id)
+        .where(GameModel.tournament_id == tournament_id, GameModel.status == GameStatusEnum.PENDING)
+        .order_by(GameModel.id)
+    )
+
+
+def create_game_info_message_from_row(row) -> GameInfoMessage:
+    return GameInfoMessage(
+        game_id=row.id,
+        left_team_name=row.left_team_name,
+        right_team_name=row.right_team_name,
+        left_team_config_json_encoded=row.left_team_config_encoded,
+        right_team_config_json_encoded=row.right_team_config_encoded,
+        left_base_team_name=row.left_base_team,
+        right_base_team_name=row.right_base_team,
+        server_config=""
+    )
+
+
 async def update_tournament_status_to_in_progress(
     session: AsyncSession,
     rabbitmq_manager: RmqMessageSender = None,
-    game_list: list[GameInfoMessage] = None
+    game_list: list[GameInfoMessage] = None,
+    batch_size: int = 500
 ):
     current_time = datetime.utcnow()
     result = await session.execute(
-        select(TournamentModel)
-        .options(selectinload(TournamentModel.games))
+        select(TournamentModel.id, TournamentModel.name)
         .where(
             TournamentModel.status == TournamentStatus.WAIT_FOR_START,
-            TournamentModel.start_at <= current_time,
-            TournamentModel.status != TournamentStatus.IN_PROGRESS
+            TournamentModel.start_at <= current_time
         )
     )
-    tournaments = result.scalars().all()
-    for tournament in tournaments:
-        tournament.status = TournamentStatus.IN_PROGRESS
+    tournaments = result.all()
+    if not tournaments:
+        logger.info("Updated 0 tournaments to IN_PROGRESS status")
+        return
+    tournament_ids = [tournament.id for tournament in tournaments]
+    await session.execute(
+        update(TournamentModel)
+        .where(TournamentModel.id.in_(tournament_ids))
+        .values(status=TournamentStatus.IN_PROGRESS)
+    )
     await session.commit()
     logger.info(f"Updated {len(tournaments)} tournaments to IN_PROGRESS status")
-    
+
+    if rabbitmq_manager is None and game_list is None:
+        # queued in the manager, the game dispatcher sends them to the runners with free slots
+        await session.execute(
+            update(GameModel)
+            .where(GameModel.tournament_id.in_(tournament_ids), GameModel.status == GameStatusEnum.PENDING)
+            .values(status=GameStatusEnum.IN_QUEUE)
+        )
+        await session.commit()
+        return
+
     for tournament in tournaments:
-        # Process each tournament
         logger.info(f"Processing tournament: {tournament.name}")
-        games: list[GameModel] = tournament.games
-        for game in games:
-            # load left and right team
-            game_model = await session.execute(
-                select(GameModel)
-                .where(GameModel.id == game.id)
-                .options(selectinload(GameModel.left_team), selectinload(GameModel.right_team))
+        # one streamed query for all the games, the writer is only taken by the status updates at the end
+        game_ids = []
+        result = await session.stream(select_game_info_rows(tournament.id).execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            for row in rows:
+                game_info_message = create_game_info_message_from_row(row)
+                if rabbitmq_manager is not None:
+                    await rabbitmq_manager.publish_message(
+                        message=game_info_message.model_dump(),
+                    )
+                else:
+                    game_list.append(game_info_message)
+                game_ids.append(row.id)
+        for i in range(0, len(game_ids), batch_size):
+            await session.execute(
+                update(GameModel)
+                .where(GameModel.id.in_(game_ids[i:i + batch_size]))
+                .values(status=GameStatusEnum.IN_QUEUE)
             )
-            game_model = game_model.scalars().first()
-
-            left_team = game_model.left_team
-            right_team = game_model.right_team
-            logger.info(f"Sending game: {left_team.name} vs {right_team.name} to runner")
-            game_info_message = create_game_info_message(game_model, left_team, right_team)
-            logger.info(f"Game info message: {game_info_message}")
-            if rabbitmq_manager is not None:
-                await rabbitmq_manager.publish_message(
-                    message=game_info_message.model_dump(),
-                )
-            else:
-                game_list.append(game_info_message)
-            game.status = GameStatusEnum.IN_QUEUE
         await session.commit()
+        logger.info(f"Sent {len(game_ids)} games of tournament {tournament.name} to the runners")
         
         
 async def run_game_sender_by_session(
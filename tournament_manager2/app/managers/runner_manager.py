@@ -2,12 +2,14 @@
 
 from typing import List, Optional, Union, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import selectinload
 from models.runner_model import RunnerModel
 from models.game_model import GameModel, GameStatusEnum
 from models.runner_log_model import RunnerLogModel, LogLevelEnum
 from models.tournament_model import TournamentModel, TournamentStatus
+from managers.standings_manager import StandingsManager
+from utils.pagination import Pagination
 import logging
 import traceback
 from utils.message_sender import MessageSender
@@ -23,6 +25,21 @@ class RunnerManager:
         self.logger.info('RunnerManager created')
         self.db_session = db_session
 
+    async def commit(self):
+        # in a DatabaseWriter batch only the savepoint of the write is released, the writer commits the batch
+        nested = self.db_session.get_nested_transaction()
+        if nested is not None:
+            await nested.commit()
+        else:
+            await self.db_session.commit()
+
+    async def rollback(self):
+        nested = self.db_session.get_nested_transaction()
+        if nested is not None:
+            await nested.rollback()
+        else:
+            await self.db_session.rollback()
+
     async def get_runner_model(self, runner_id: int) -> Optional[RunnerModel]:
         self.logger.info(f"get_runner_model: {runner_id}")
         try:
@@ -69,12 +86,19 @@ class RunnerManager:
             self.logger.error(f"Unexpected error in get_runner: {e}")
             return ResponseMessage(success=False, error=str(e))
 
-    async def get_all_runners(self) -> Union[GetAllRunnersResponseMessage, ResponseMessage]:
-        self.logger.info("get_all_runners")
+    async def get_all_runners(self, request: GetAllRunnersRequestMessage = None) -> Union[GetAllRunnersResponseMessage, ResponseMessage]:
+        request = request or GetAllRunnersRequestMessage()
+        self.logger.info(f"get_all_runners: {request}")
+        limit = Pagination.get_limit(request.limit)
+        stmt = select(RunnerModel).order_by(RunnerModel.id).limit(limit + 1)
+        if request.cursor:
+            last_id, = Pagination.decode_cursor(request.cursor)
+            stmt = stmt.where(RunnerModel.id > int(last_id))
+        if request.status is not None:
+            stmt = stmt.where(RunnerModel.status == request.status)
         try:
-            stmt = select(RunnerModel)
             result = await self.db_session.execute(stmt)
-            runners = result.scalars().all()
+            runners, next_cursor = Pagination.get_page(result.scalars().all(), limit, lambda runner: (runner.id,))
 
             runners_list = []
             for runner in runners:
@@ -88,7 +112,7 @@ class RunnerManager:
                     requested_command=runner.requested_command
                 ))
 
-            return GetAllRunnersResponseMessage(runners=runners_list)
+            return GetAllRunnersResponseMessage(runners=runners_list, next_cursor=next_cursor)
         except SQLAlchemyError as e:
             self.logger.error(f"Database error in get_all_runners: {e}")
             return ResponseMessage(success=False, error="Database error occurred")
@@ -96,12 +120,28 @@ class RunnerManager:
             self.logger.error(f"Unexpected error in get_all_runners: {e}")
             return ResponseMessage(success=False, error=str(e))
 
-    async def get_runner_logs(self, runner_id: int) -> List[RunnerLog]:
-        self.logger.info(f"get_runner_logs: {runner_id}")
+    async def get_runner_logs(self, runner_id: int, request: GetRunnerLogRequestMessage = None) -> GetRunnerLogResponseMessage:
+        """A page of the logs of a runner, the newest first. Raises ValueError for an invalid cursor."""
+        request = request or GetRunnerLogRequestMessage()
+        self.logger.info(f"get_runner_logs: {runner_id} {request}")
+        limit = Pagination.get_limit(request.limit)
+        # (runner_id, timestamp) is indexed, every page is a range of the index read backwards
+        stmt = select(RunnerLogModel).where(RunnerLogModel.runner_id == runner_id).order_by(
+            RunnerLogModel.timestamp.desc(), RunnerLogModel.id.desc()).limit(limit + 1)
+        if request.cursor:
+            last_timestamp, last_id = Pagination.decode_cursor(request.cursor, 2)
+            stmt = stmt.where(tuple_(RunnerLogModel.timestamp, RunnerLogModel.id) <
+                              tuple_(datetime.fromisoformat(last_timestamp), int(last_id)))
+        if request.log_level is not None:
+            stmt = stmt.where(RunnerLogModel.log_level == LogLevelEnum(request.log_level.value))
+        if request.since is not None:
+            stmt = stmt.where(RunnerLogModel.timestamp >= request.since)
+        if request.until is not None:
+            stmt = stmt.where(RunnerLogModel.timestamp < request.until)
         try:
-            stmt = select(RunnerLogModel).where(RunnerLogModel.runner_id == runner_id).order_by(RunnerLogModel.timestamp.desc())
             result = await self.db_session.execute(stmt)
-            logs = result.scalars().all()
+            logs, next_cursor = Pagination.get_page(result.scalars().all(), limit,
+                                                    lambda log: (log.timestamp.isoformat(), log.id))
 
             logs_list = []
             for log in logs:
@@ -114,14 +154,37 @@ class RunnerManager:
                     new_status=log.new_status.value if log.new_status else None
                 ))
 
-            return logs_list
+            return GetRunnerLogResponseMessage(logs=logs_list, next_cursor=next_cursor)
         except SQLAlchemyError as e:
             self.logger.error(f"Database error in get_runner_logs: {e}")
-            return []
+            return GetRunnerLogResponseMessage(logs=[])
         except Exception as e:
             self.logger.error(f"Unexpected error in get_runner_logs: {e}")
-            return []
-          
+            return GetRunnerLogResponseMessage(logs=[])
+
+    async def add_log(self, log: SubmitRunnerLog) -> ResponseMessage:
+        self.logger.info(f"add_log: {log.runner_id}")
+        try:
+            runner = await self.get_runner_model(log.runner_id)
+            if not runner:
+                return ResponseMessage(success=False, error="Runner not found")
+            self.db_session.add(RunnerLogModel(
+                runner_id=log.runner_id,
+                message=log.message,
+                log_level=log.log_level,
+                timestamp=datetime.fromisoformat(log.timestamp) if log.timestamp else datetime.utcnow()
+            ))
+            await self.commit()
+            return ResponseMessage(success=True, error=None)
+        except SQLAlchemyError as e:
+            await self.rollback()
+            self.logger.error(f"Database error in add_log: {e}")
+            return ResponseMessage(success=False, error="Database error occurred")
+        except Exception as e:
+            await self.rollback()
+            self.logger.error(f"Unexpected error in add_log: {e}")
+            return ResponseMessage(success=False, error=str(e))
+
     async def handle_game_started(self, json: GameStartedMessage) -> ResponseMessage:
         self.logger.info(f"handle_game_started: {json}")
         try:
@@ -165,15 +228,15 @@ class RunnerManager:
             game.runner = runner
 
             # Commit Changes
-            await self.db_session.commit()
+            await self.commit()
             self.logger.info(f"Game {json.game_id} started by Runner {json.runner_id}")
             return ResponseMessage(success=True, error=None)
         except SQLAlchemyError as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Database error in handle_game_started: {e}")
             return ResponseMessage(success=False, error="Database error occurred")
         except Exception as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Unexpected error in handle_game_started: {e}")
             return ResponseMessage(success=False, error=str(e))
 
@@ -205,11 +268,23 @@ class RunnerManager:
                 self.logger.error(f"Game with id {json.game_id} not found")
                 return ResponseMessage(success=False, error="Game not found")
 
+            # the result of a finished game is in the standings, a repeated or late report must not change it
+            if game.status == GameStatusEnum.FINISHED:
+                self.logger.warning(f"Game {json.game_id} is already finished, the report of Runner {json.runner_id} is ignored")
+                return ResponseMessage(success=False, error="Game already finished")
+
             # Finish the game
             # self.logger.debug("Updating game status to FINISHED and recording scores...")
-            game.status = GameStatusEnum.FINISHED
-            game.left_score = json.left_score
-            game.right_score = json.right_score
+            if json.success is False:
+                # the runner could not finish the game (e.g. killed by its watchdog), no result to record
+                self.logger.error(f"Game {json.game_id} failed on Runner {json.runner_id}: {json.error}")
+                game.status = GameStatusEnum.ERROR
+            else:
+                game.status = GameStatusEnum.FINISHED
+                game.left_score = json.left_score
+                game.right_score = json.right_score
+                # in the transaction of the game, the standings never miss or repeat a game
+                await StandingsManager(self.db_session).apply_game(game)
             game.end_time = datetime.utcnow()
             
             # Remove game from runner
@@ -225,21 +300,22 @@ class RunnerManager:
             ).where(TournamentModel.id == game.tournament.id)
             result_tournament = await self.db_session.execute(stmt_tournament)
             tournament = result_tournament.scalars().first()
-            if all(g.status == GameStatusEnum.FINISHED for g in tournament.games):
+            # a failed game is final too, it is not played again
+            if all(g.status in (GameStatusEnum.FINISHED, GameStatusEnum.ERROR) for g in tournament.games):
                 # self.logger.debug("All games finished. Updating tournament status to FINISHED...")
                 tournament.done = True
                 tournament.status = TournamentStatus.FINISHED
 
             # Commit Changes
-            await self.db_session.commit()
+            await self.commit()
             self.logger.info(f"Game {json.game_id} finished by Runner {json.runner_id}")
             return ResponseMessage(success=True, error=None)
         except SQLAlchemyError as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Database error in handle_game_finished: {e}")
             return ResponseMessage(success=False, error="Database error occurred")
         except Exception as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Unexpected error in handle_game_finished: {e}")
             return ResponseMessage(success=False, error=str(e))
 
@@ -263,7 +339,7 @@ class RunnerManager:
                 existing_runner.available_games_count = json.available_games_count  # Optionally update this field
 
                 # Commit Changes
-                await self.db_session.commit()
+                await self.commit()
                 self.logger.info(f"Runner with address {address} successfully updated to RUNNING.")
                 return ResponseMessage(success=True, error=None, value=str(existing_runner.id))
             else:
@@ -279,16 +355,16 @@ class RunnerManager:
                     last_updated = datetime.utcnow()
                 )
                 self.db_session.add(new_runner)
-                await self.db_session.commit()
+                await self.commit()
                 await self.db_session.refresh(new_runner)
                 self.logger.info(f"Registered new runner with id: {new_runner.id} and address: {new_runner.address}")
                 return ResponseMessage(success=True, error=None, value=str(new_runner.id))
         except SQLAlchemyError as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Database error in register: {e}")
             return ResponseMessage(success=False, error="Database error occurred")
         except Exception as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Unexpected error in register: {e}")
             return ResponseMessage(success=False, error=str(e))
 
@@ -357,7 +433,7 @@ class RunnerManager:
                     self.logger.info(f"Command '{command}' successfully sent to runner {runner_id}")
                     self.logger.debug("Updating runner's requested_command in the database...")
                     runner.requested_command = command
-                    await self.db_session.commit()
+                    await self.commit()
                     self.logger.info(f"Runner {runner_id} requested_command updated to '{command}'")
                     res = ResponseMessage(
                             success=response_data.get("success"),
@@ -403,18 +479,18 @@ class RunnerManager:
             self.logger.info(f"Runner ID {runner.id} requested_command reset to '{runner.requested_command}'.")
 
             # Commit the transaction
-            await self.db_session.commit()
+            await self.commit()
 
             self.logger.info(f"Runner ID {runner.id} status updated successfully.")
             return ResponseMessage(success=True, value="Runner status updated successfully.", error=None)
         
         except SQLAlchemyError as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Database error in handle_status_update: {e}")
             return ResponseMessage(success=False, error="Database error occurred.")
         
         except Exception as e:
-            await self.db_session.rollback()
+            await self.rollback()
             self.logger.error(f"Unexpected error in handle_status_update: {e}")
             traceback.print_exc()
             return ResponseMessage(success=False, error=str(e))
@@ -0,0 +1,106 @@
+import logging
+from sqlalchemy import select, delete, func, literal, case, union_all
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.game_model import GameModel, GameStatusEnum
+from models.team_model import TeamModel
+from models.standing_model import StandingModel
+from models.association_table import tournament_team_association
+from utils.messages import TournamentTeamResultMessage
+
+
+class StandingsManager:
+    """
+    The standings of the tournaments, kept in tournament_standings instead of being computed from all the games
+    of a tournament on every read. apply_game adds a finished game to the standings of both of its teams in the
+    transaction that finishes the game, get_results reads the standings of a tournament with one indexed query
+    and rebuild computes them again from the finished games.
+    """
+    win_point = 3
+    draw_point = 1
+    counters = ('win', 'draw', 'lose', 'scored_goal', 'received_goal', 'point')
+
+    def __init__(self, db_session: AsyncSession):
+        self.logger = logging.getLogger(__name__)
+        self.db_session = db_session
+
+    @staticmethod
+    def get_team_result(scored_goal: int, received_goal: int) -> dict:
+        win = int(scored_goal > received_goal)
+        draw = int(scored_goal == received_goal)
+        return {'win': win, 'draw': draw, 'lose': int(scored_goal < received_goal),
+                'scored_goal': scored_goal, 'received_goal': received_goal,
+                'point': win * StandingsManager.win_point + draw * StandingsManager.draw_point}
+
+    async def apply_game(self, game: GameModel):
+        """Adds a finished game to the standings, the caller commits it with the game."""
+        left_score = game.left_score or 0
+        right_score = game.right_score or 0
+        rows = [
+            {'tournament_id': game.tournament_id, 'team_id': game.left_team_id,
+             **StandingsManager.get_team_result(left_score, right_score)},
+            {'tournament_id': game.tournament_id, 'team_id': game.right_team_id,
+             **StandingsManager.get_team_result(right_score, left_score)},
+        ]
+        for row in rows:
+            stmt = insert(StandingModel).values(**row)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[StandingModel.tournament_id, StandingModel.team_id],
+                set_={name: getattr(StandingModel, name) + stmt.excluded[name] for name in StandingsManager.counters}
+            )
+            await self.db_session.execute(stmt)
+
+    async def rebuild(self, tournament_id: int = None) -> int:
+        """Computes the standings of a tournament (of all tournaments without tournament_id) from its finished
+        games, returns the number of standings written."""
+        finished = GameModel.status == GameStatusEnum.FINISHED
+        if tournament_id is not None:
+            finished = finished & (GameModel.tournament_id == tournament_id)
+        # every game once from the side of each of its teams
+        sides = union_all(
+            select(GameModel.tournament_id, GameModel.left_team_id.label('team_id'),
+                   GameModel.left_score.label('scored'), GameModel.right_score.label('received')).where(finished),
+            select(GameModel.tournament_id, GameModel.right_team_id.label('team_id'),
+                   GameModel.right_score.label('scored'), GameModel.left_score.label('received')).where(finished),
+        ).subquery()
+        win = func.sum(case((sides.c.scored > sides.c.received, 1), else_=0))
+        draw = func.sum(case((sides.c.scored == sides.c.received, 1), else_=0))
+        lose = func.sum(case((sides.c.scored < sides.c.received, 1), else_=0))
+        aggregate = select(
+            sides.c.tournament_id, sides.c.team_id, win, draw, lose,
+            func.sum(sides.c.scored), func.sum(sides.c.received),
+            win * literal(StandingsManager.win_point) + draw * literal(StandingsManager.draw_point)
+        ).group_by(sides.c.tournament_id, sides.c.team_id)
+
+        stmt = delete(StandingModel)
+        if tournament_id is not None:
+            stmt = stmt.where(StandingModel.tournament_id == tournament_id)
+        await self.db_session.execute(stmt)
+        result = await self.db_session.execute(
+            insert(StandingModel).from_select(['tournament_id', 'team_id', *StandingsManager.counters], aggregate)
+        )
+        await self.db_session.commit()
+        self.logger.info(f"Rebuilt {result.rowcount} standings of tournament {tournament_id or 'all'}")
+        return result.rowcount
+
+    async def get_results(self, tournament_id: int) -> list[TournamentTeamResultMessage]:
+        """The ranked standings of the registered teams, the teams without a finished game have zeros."""
+        counters = {name: func.coalesce(getattr(StandingModel, name), 0).label(name)
+                    for name in StandingsManager.counters}
+        goal_difference = func.coalesce(StandingModel.scored_goal - StandingModel.received_goal, 0)
+        result = await self.db_session.execute(
+            select(TeamModel.id, TeamModel.name, *counters.values())
+            .select_from(tournament_team_association)
+            .join(TeamModel, TeamModel.id == tournament_team_association.c.team_id)
+            .outerjoin(StandingModel, (StandingModel.tournament_id == tournament_team_association.c.tournament_id) &
+                       (StandingModel.team_id == tournament_team_association.c.team_id))
+            .where(tournament_team_association.c.tournament_id == tournament_id)
+            .order_by(counters['point'].desc(), goal_difference.desc(), counters['scored_goal'].desc(), TeamModel.id)
+        )
+        return [
+            TournamentTeamResultMessage(team_id=row.id, team_name=row.name, win=row.win, lose=row.lose,
+                                        draw=row.draw, scored_goal=row.scored_goal, received_goal=row.received_goal,
+                                        goal_difference=row.scored_goal - row.received_goal, point=row.point,
+                                        rank=rank)
+            for rank, row in enumerate(result.all(), start=1)
+        ]
@@ -5,6 +5,7 @@ from models.team_model import TeamModel
 from models.user_model import UserModel
 from models.game_model import GameModel, GameStatusEnum
 from models.message_convertor import MessageConvertor
+from utils.pagination import Pagination
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select, exists, and_
 import asyncio
@@ -199,16 +200,24 @@ class TeamManager:
         except Exception as e:
             return None
 
-    async def get_teams(self) -> GetTeamsResponseMessage:
+    async def get_teams(self, request: GetTeamsRequestMessage = None) -> GetTeamsResponseMessage:
         """
-        Retrieve all teams.
+        Retrieve a page of the teams, ordered by id, optionally of one user.
         """
-        self.logger.info(f"Getting all teams")
+        request = request or GetTeamsRequestMessage()
+        self.logger.info(f"Getting teams: {request}")
         session = self.db_session
 
-        stmt = select(TeamModel)
+        limit = Pagination.get_limit(request.limit)
+        stmt = select(TeamModel.id, TeamModel.name, TeamModel.base_team, TeamModel.user_id
+                      ).order_by(TeamModel.id).limit(limit + 1)
+        if request.cursor:
+            last_id, = Pagination.decode_cursor(request.cursor)
+            stmt = stmt.where(TeamModel.id > int(last_id))
+        if request.user_id is not None:
+            stmt = stmt.where(TeamModel.user_id == request.user_id)
         result = await session.execute(stmt)
-        teams = result.scalars().all()
+        teams, next_cursor = Pagination.get_page(result.all(), limit, lambda team: (team.id,))
 
         team_messages = []
         for team in teams:
@@ -220,6 +229,6 @@ class TeamManager:
             )
             team_messages.append(team_message)
 
-        response = GetTeamsResponseMessage(teams=team_messages)
-        self.logger.info(f"Teams retrieved: {response}")
+        response = GetTeamsResponseMessage(teams=team_messages, next_cursor=next_cursor)
+        self.logger.info(f"Teams retrieved: {len(team_messages)}")
         return response
\ No newline at end of file
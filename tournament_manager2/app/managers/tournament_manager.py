@@ -3,10 +3,13 @@ from utils.messages import *
 from models.tournament_model import TournamentModel, TournamentStatus
 from models.team_model import TeamModel
 from models.game_model import GameModel, GameStatusEnum
+from models.association_table import tournament_team_association
 from models.user_model import UserModel
 from models.message_convertor import MessageConvertor
+from managers.standings_manager import StandingsManager
+from utils.pagination import Pagination
 from sqlalchemy.orm import selectinload
-from sqlalchemy import select, exists, and_
+from sqlalchemy import select, exists, and_, insert, func
 import asyncio
 import logging
 from storage.minio_client import MinioClient
@@ -72,25 +75,55 @@ class TournamentManager:
         if not tournament:
             return None
 
-        tournament_message = MessageConvertor.convert_tournament_model_to_tournament_message(tournament)
+        tournament_results = await StandingsManager(session).get_results(tournament_id)
+        tournament_message = MessageConvertor.convert_tournament_model_to_tournament_message(tournament, tournament_results)
         self.logger.info(f"get_tournament: {tournament_message}")
         return tournament_message
 
-    async def get_tournaments(self) -> GetTournamentsResponseMessage:
-        self.logger.info(f"get_tournaments")
+    async def get_tournaments(self, request: GetTournamentsRequestMessage = None) -> GetTournamentsResponseMessage:
+        request = request or GetTournamentsRequestMessage()
+        self.logger.info(f"get_tournaments: {request}")
         session = self.db_session
 
-        stmt = select(TournamentModel).options(
-            selectinload(TournamentModel.teams),
-            selectinload(TournamentModel.games)
-        )
+        # the counts are aggregated in the database for the tournaments of the page only, no team or game row is loaded
+        team_count = select(func.count()).where(
+            tournament_team_association.c.tournament_id == TournamentModel.id
+        ).scalar_subquery()
+        game_count = select(func.count()).where(GameModel.tournament_id == TournamentModel.id).scalar_subquery()
+        finished_game_count = select(func.count()).where(
+            GameModel.tournament_id == TournamentModel.id,
+            GameModel.status == GameStatusEnum.FINISHED
+        ).scalar_subquery()
+
+        limit = Pagination.get_limit(request.limit)
+        stmt = select(
+            TournamentModel.id,
+            TournamentModel.name,
+            TournamentModel.start_at,
+            TournamentModel.start_registration_at,
+            TournamentModel.end_registration_at,
+            TournamentModel.status,
+            team_count.label('team_count'),
+            game_count.label('game_count'),
+            finished_game_count.label('finished_game_count')
+        ).order_by(TournamentModel.id).limit(limit + 1)
+        if request.cursor:
+            last_id, = Pagination.decode_cursor(request.cursor)
+            stmt = stmt.where(TournamentModel.id > int(last_id))
+        if request.status is not None:
+            stmt = stmt.where(TournamentModel.status == request.status)
+        if request.owner_id is not None:
+            stmt = stmt.where(TournamentModel.owner_id == request.owner_id)
+        if request.start_from is not None:
+            stmt = stmt.where(TournamentModel.start_at >= request.start_from)
+        if request.start_to is not None:
+            stmt = stmt.where(TournamentModel.start_at < request.start_to)
 
         result = await session.execute(stmt)
-        tournaments = result.scalars().all()
-        
-        tournament_messages = GetTournamentsResponseMessage()
-        tournament_messages.tournaments = [MessageConvertor.convert_tournament_model_to_tournament_summary_message(tournament) for tournament in tournaments]
-        self.logger.info(f"get_tournaments: {tournament_messages}")
+        rows, next_cursor = Pagination.get_page(result.all(), limit, lambda row: (row.id,))
+        tournament_messages = GetTournamentsResponseMessage(next_cursor=next_cursor)
+        tournament_messages.tournaments = [MessageConvertor.convert_tournament_row_to_tournament_summary_message(row) for row in rows]
+        self.logger.info(f"get_tournaments: {len(tournament_messages.tournaments)} tournaments")
         return tournament_messages
 
     async def run_smart_contract(self):
@@ -244,24 +277,29 @@ class TournamentManager:
         await self.db_session.commit()
 
         return ResponseMessage(success=True, error=None)
-    async def create_all_games(self, tournament_id: int):
-        # Get all teams in the tournament
-        stmt = select(TeamModel).options(
-            selectinload(TeamModel.tournaments)
-            ).filter(TeamModel.tournaments.any(id=tournament_id))
-        teams = await self.db_session.execute(stmt)
-        teams = teams.scalars().all()
-        
-        # Create all games
-        for i in range(len(teams)):
-            for j in range(i + 1, len(teams)):
-                game = GameModel(
-                    left_team_id=teams[i].id,
-                    right_team_id=teams[j].id,
-                    tournament_id=tournament_id
-                )
-                self.db_session.add(game)
+    @staticmethod
+    def get_round_robin_rows(tournament_id: int, team_ids: list[int]) -> list[dict]:
+        # one game for every pair of teams, the lower id on the left
+        return [
+            {'tournament_id': tournament_id, 'left_team_id': left_team_id, 'right_team_id': right_team_id,
+             'status': GameStatusEnum.PENDING}
+            for i, left_team_id in enumerate(team_ids)
+            for right_team_id in team_ids[i + 1:]
+        ]
+
+    async def create_all_games(self, tournament_id: int) -> int:
+        # only the team ids are needed, a round robin of 200 teams is 19,900 games, inserted with one executemany
+        # instead of as many ORM objects in the unit of work
+        stmt = select(tournament_team_association.c.team_id).where(
+            tournament_team_association.c.tournament_id == tournament_id
+        ).order_by(tournament_team_association.c.team_id)
+        team_ids = (await self.db_session.execute(stmt)).scalars().all()
+
+        rows = TournamentManager.get_round_robin_rows(tournament_id, team_ids)
+        if rows:
+            await self.db_session.execute(insert(GameModel), rows)
         await self.db_session.commit()
+        return len(rows)
 
     # Use self.minio_client in your methods
     async def download_log_file(self, game_id: int, file_path: str):
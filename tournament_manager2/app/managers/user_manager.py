@@ -2,6 +2,7 @@ from datetime import datetime
 from utils.messages import *
 from models.user_model import UserModel
 from models.message_convertor import MessageConvertor
+from utils.pagination import Pagination
 from sqlalchemy.orm import selectinload
 from sqlalchemy import select, exists, and_
 import asyncio
@@ -156,17 +157,22 @@ class UserManager:
         self.logger.info(f"User info retrieved: {user_message}")
         return user_message
     
-    async def get_users(self) -> GetUsersResponseMessage:
+    async def get_users(self, request: PageRequestMessage = None) -> GetUsersResponseMessage:
         """
-        Retrieves all the users in the database.
+        Retrieves a page of the users, ordered by id.
         """
-        self.logger.info(f"Retrieving all users")
+        request = request or PageRequestMessage()
+        self.logger.info(f"Retrieving users: {request}")
         session = self.db_session
 
-        stmt = select(UserModel)
+        limit = Pagination.get_limit(request.limit)
+        stmt = select(UserModel.id, UserModel.name).order_by(UserModel.id).limit(limit + 1)
+        if request.cursor:
+            last_id, = Pagination.decode_cursor(request.cursor)
+            stmt = stmt.where(UserModel.id > int(last_id))
         result = await session.execute(stmt)
-        users = result.scalars().all()
-        
+        users, next_cursor = Pagination.get_page(result.all(), limit, lambda user: (user.id,))
+
         user_messages = []
         for user in users:
             user_message = GetUserResponseMessage(
@@ -174,7 +180,7 @@ class UserManager:
                 user_name=user.name
             )
             user_messages.append(user_message)
-        
-        self.logger.info(f"Users retrieved: {user_messages}")
-        return GetUsersResponseMessage(users=user_messages)
+
+        self.logger.info(f"Users retrieved: {len(user_messages)}")
+        return GetUsersResponseMessage(users=user_messages, next_cursor=next_cursor)
     
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# Brings an existing database file up to the models: creates the missing tables and the missing indexes.
+# The tournament manager does the same when it starts, this runs it ahead of a deployment so a large database
+# is not indexed while the manager starts.
+# With --drop-stale-indexes it also drops the ix_ indexes the models no longer declare, the manager never does.
+# Usage (from tournament_manager2/app):
+#   python migrate_db.py --data-dir ../data --db example.db
+#   python migrate_db.py --data-dir ../data --db example.db --drop-stale-indexes
+import os
+import sys
+import asyncio
+import logging
+import argparse
+from sqlalchemy import inspect
+from managers.database_manager import DatabaseManager
+from models.base import Base
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Create the missing tables and indexes of a database file")
+    parser.add_argument('--data-dir', type=str, default='../data', help='Directory of the database')
+    parser.add_argument('--db', default='example.db', help='Database file name')
+    parser.add_argument('--drop-stale-indexes', action='store_true',
+                        help='Drop the ix_ indexes that the models no longer declare')
+    return parser.parse_args()
+
+
+async def main():
+    args = get_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', force=True)
+    database_path = os.path.abspath(os.path.join(args.data_dir, args.db))
+    if not os.path.exists(database_path):
+        logging.error(f'{database_path} does not exist')
+        return 1
+    database_manager = DatabaseManager(f'sqlite+aiosqlite:///{database_path}')
+    await database_manager.init_db()
+    if args.drop_stale_indexes:
+        async with database_manager.engine.begin() as conn:
+            dropped = await conn.run_sync(DatabaseManager.drop_stale_indexes)
+        logging.info(f'Dropped the indexes {dropped}' if dropped else 'No stale index to drop')
+    async with database_manager.engine.connect() as conn:
+        indexes = await conn.run_sync(lambda sync_conn: {
+            table.name: [index['name'] for index in inspect(sync_conn).get_indexes(table.name)]
+            for table in Base.metadata.sorted_tables
+        })
+    for table_name, index_names in indexes.items():
+        logging.info(f'{table_name}: {", ".join(index_names) or "-"}')
+    await database_manager.engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
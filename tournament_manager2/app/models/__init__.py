@@ -5,5 +5,5 @@ from .user_model import UserModel
 from .runner_log_model import RunnerLogModel
 from .runner_model import RunnerModel
 from .association_table import tournament_team_association
+from .standing_model import StandingModel
 # TODO: add the missing imports or why they are not needed.
-# TODO: why we are not using index = true? 
\ No newline at end of file
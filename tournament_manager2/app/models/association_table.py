@@ -5,6 +5,7 @@ tournament_team_association = Table(
     'tournament_team_association',
     Base.metadata,
     Column('tournament_id', Integer, ForeignKey('tournaments.id', ondelete='CASCADE')),
-    Column('team_id', Integer, ForeignKey('teams.id', ondelete='CASCADE')),
+    # uix_tournament_team serves the lookups by tournament_id, the lookups by team_id need their own index
+    Column('team_id', Integer, ForeignKey('teams.id', ondelete='CASCADE'), index=True),
     UniqueConstraint('tournament_id', 'team_id', name='uix_tournament_team')
 )
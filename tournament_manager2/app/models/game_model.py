@@ -1,6 +1,6 @@
 # game_model.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from .base import Base
 from enum import Enum
@@ -14,10 +14,16 @@ class GameStatusEnum(str, Enum):
 
 class GameModel(Base):
     __tablename__ = 'games'
+    __table_args__ = (
+        # the games of a tournament in a status (start, standings, counts)
+        Index('ix_games_tournament_id_status', 'tournament_id', 'status'),
+        # the running games of a runner, and the queued games without a runner (runner_id IS NULL)
+        Index('ix_games_runner_id_status', 'runner_id', 'status'),
+    )
 
     id = Column(Integer, primary_key=True)
-    left_team_id = Column(Integer, ForeignKey('teams.id'))
-    right_team_id = Column(Integer, ForeignKey('teams.id'))
+    left_team_id = Column(Integer, ForeignKey('teams.id'), index=True)
+    right_team_id = Column(Integer, ForeignKey('teams.id'), index=True)
     tournament_id = Column(Integer, ForeignKey('tournaments.id'))
     runner_id = Column(Integer, ForeignKey('runners.id', ondelete='SET NULL'), nullable=True)
     status = Column(SQLEnum(GameStatusEnum, native_enum=False), default=GameStatusEnum.PENDING, nullable=False)
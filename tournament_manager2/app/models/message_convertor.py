@@ -33,48 +33,9 @@ class MessageConvertor:
                            left_team_score=game.left_score, right_team_score=game.right_score)
 
     @staticmethod
-    def create_tournament_team_result_message(team: TeamModel, games: list[GameModel]) -> TournamentTeamResultMessage:
-        tournament_team_result = TournamentTeamResultMessage(team_id=team.id, team_name=team.name,
-                                                             win=0, lose=0, draw=0,
-                                                             scored_goal=0, received_goal=0, goal_difference=0,
-                                                             point=0, rank=-1)
-        for game in games:
-            if game.left_team_id == team.id:
-                tournament_team_result.scored_goal += game.left_score
-                tournament_team_result.received_goal += game.right_score
-                if game.left_score > game.right_score:
-                    tournament_team_result.win += 1
-                elif game.left_score < game.right_score:
-                    tournament_team_result.lose += 1
-                else:
-                    tournament_team_result.draw += 1
-            elif game.right_team_id == team.id:
-                tournament_team_result.scored_goal += game.right_score
-                tournament_team_result.received_goal += game.left_score
-                if game.left_score < game.right_score:
-                    tournament_team_result.win += 1
-                elif game.left_score > game.right_score:
-                    tournament_team_result.lose += 1
-                else:
-                    tournament_team_result.draw += 1
-        tournament_team_result.goal_difference = tournament_team_result.scored_goal - tournament_team_result.received_goal
-        tournament_team_result.point = tournament_team_result.win * 3 + tournament_team_result.draw
-        return tournament_team_result
-
-    @staticmethod
-    def set_tournament_rank(tournament_results: list[TournamentTeamResultMessage]) -> list[TournamentTeamResultMessage]:
-        sorted_tournament_results = sorted(tournament_results, key=lambda x: (x.point, x.goal_difference, x.scored_goal), reverse=True)
-        for i, team in enumerate(sorted_tournament_results):
-            team.rank = i + 1
-        return sorted_tournament_results
-
-    @staticmethod
-    def convert_tournament_model_to_tournament_message(tournament: TournamentModel) -> TournamentMessage:
-        tournament_results: list[TournamentTeamResultMessage] = []
-        for team in tournament.teams:
-            tournament_results.append(MessageConvertor.create_tournament_team_result_message(team, tournament.games))
-        tournament_results = MessageConvertor.set_tournament_rank(tournament_results)
-
+    def convert_tournament_model_to_tournament_message(tournament: TournamentModel,
+                                                       tournament_results: list[TournamentTeamResultMessage]) -> TournamentMessage:
+        # tournament_results: the ranked standings of StandingsManager.get_results
         return TournamentMessage(tournament_id=tournament.id, 
                                  tournament_name=tournament.name, 
                                  start_at=tournament.start_at,
@@ -88,11 +49,14 @@ class MessageConvertor:
                                  results=tournament_results)
         
     @staticmethod
-    def convert_tournament_model_to_tournament_summary_message(tournament: TournamentModel) -> TournamentSummaryMessage:
-        return TournamentSummaryMessage(tournament_id=tournament.id, 
-                                        tournament_name=tournament.name, 
-                                        start_at=tournament.start_at,
-                                        start_registration_at=tournament.start_registration_at,
-                                        end_registration_at=tournament.end_registration_at,
-                                        done=tournament.done,
-                                        status=TournamentStatus.convert_to_str(tournament.status))
+    def convert_tournament_row_to_tournament_summary_message(row) -> TournamentSummaryMessage:
+        # a row of TournamentManager.get_tournaments: the tournament columns and the counts of its teams and games
+        return TournamentSummaryMessage(tournament_id=row.id, 
+                                        tournament_name=row.name, 
+                                        start_at=row.start_at,
+                                        start_registration_at=row.start_registration_at,
+                                        end_registration_at=row.end_registration_at,
+                                        status=TournamentStatus.convert_to_str(row.status),
+                                        team_count=row.team_count,
+                                        game_count=row.game_count,
+                                        finished_game_count=row.finished_game_count)
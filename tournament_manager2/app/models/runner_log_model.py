@@ -1,6 +1,6 @@
 # models/runner_log_model.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum as SqlEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, Enum as SqlEnum
 from sqlalchemy.orm import relationship
 from .base import Base
 from .runner_model import RunnerStatusMessageEnum  
@@ -16,6 +16,8 @@ class LogLevelEnum(Enum):
 
 class RunnerLogModel(Base):
     __tablename__ = 'runner_logs'
+    # the logs of a runner are read newest first, page by page
+    __table_args__ = (Index('ix_runner_logs_runner_id_timestamp', 'runner_id', 'timestamp'),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     runner_id = Column(Integer, ForeignKey('runners.id', ondelete='CASCADE'), nullable=False)
@@ -12,7 +12,7 @@ class RunnerModel(Base):
     __tablename__ = 'runners'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    status = Column(SQLEnum(RunnerStatusMessageEnum, native_enum=False), default=RunnerStatusMessageEnum.UNKNOWN, nullable=False)
+    status = Column(SQLEnum(RunnerStatusMessageEnum, native_enum=False), default=RunnerStatusMessageEnum.UNKNOWN, nullable=False, index=True)
     address = Column(String, nullable=False, unique=True)
     available_games_count = Column(Integer, default=0, nullable=False)
     start_time = Column(DateTime, nullable=True)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from .base import Base
+
+
+class StandingModel(Base):
+    # the standing of a team in a tournament, updated with every finished game (managers/standings_manager.py)
+    __tablename__ = 'tournament_standings'
+
+    # the primary key starts with tournament_id, the standings of a tournament are one index range
+    tournament_id = Column(Integer, ForeignKey('tournaments.id', ondelete='CASCADE'), primary_key=True)
+    team_id = Column(Integer, ForeignKey('teams.id', ondelete='CASCADE'), primary_key=True)
+    win = Column(Integer, default=0, nullable=False)
+    draw = Column(Integer, default=0, nullable=False)
+    lose = Column(Integer, default=0, nullable=False)
+    scored_goal = Column(Integer, default=0, nullable=False)
+    received_goal = Column(Integer, default=0, nullable=False)
+    point = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return (f"<StandingModel(tournament_id={self.tournament_id}, team_id={self.team_id}, win={self.win}, "
+                f"draw={self.draw}, lose={self.lose}, point={self.point})>")
@@ -6,8 +6,8 @@ class TeamModel(Base):
     __tablename__ = 'teams'
 
     id = Column(Integer, primary_key=True)
-    name = Column(String)
-    user_id = Column(Integer, ForeignKey('users.id'))
+    name = Column(String, index=True)
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
     base_team = Column(String)
     config = Column(String)
     config_encoded = Column(String)
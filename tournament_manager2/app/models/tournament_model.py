@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -33,10 +33,16 @@ tournament_participants_association = Table(
 
 class TournamentModel(Base):
     __tablename__ = 'tournaments'
+    # the tournaments in a status whose deadline has passed, one index per deadline column
+    __table_args__ = (
+        Index('ix_tournaments_status_start_registration_at', 'status', 'start_registration_at'),
+        Index('ix_tournaments_status_end_registration_at', 'status', 'end_registration_at'),
+        Index('ix_tournaments_status_start_at', 'status', 'start_at'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String)
-    owner_id = Column(Integer, ForeignKey('users.id'))  # Correct ForeignKey for the owner
+    owner_id = Column(Integer, ForeignKey('users.id'), index=True)  # Correct ForeignKey for the owner
     start_at = Column(DateTime)
     start_registration_at = Column(DateTime)
     end_registration_at = Column(DateTime)
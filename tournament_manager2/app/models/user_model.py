@@ -7,7 +7,7 @@ class UserModel(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String)
-    code = Column(String)
+    code = Column(String, index=True)  # every request looks its user up by code
 
     # Relationships
     teams = relationship('TeamModel', back_populates='user', cascade='all, delete-orphan')
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# Computes the tournament_standings table again from the finished games, for a database created before the
+# standings were stored or after games were changed by hand.
+# Usage (from tournament_manager2/app):
+#   python rebuild_standings.py --data-dir ../data --db example.db
+#   python rebuild_standings.py --data-dir ../data --db example.db --tournament-id 3
+import os
+import sys
+import asyncio
+import logging
+import argparse
+from managers.database_manager import DatabaseManager
+from managers.standings_manager import StandingsManager
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Rebuild the tournament standings from the finished games")
+    parser.add_argument('--data-dir', type=str, default='../data', help='Directory of the database')
+    parser.add_argument('--db', default='example.db', help='Database file name')
+    parser.add_argument('--tournament-id', type=int, help='Rebuild only this tournament (default: all of them)')
+    return parser.parse_args()
+
+
+async def main():
+    args = get_args()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', force=True)
+    database_path = os.path.abspath(os.path.join(args.data_dir, args.db))
+    if not os.path.exists(database_path):
+        logging.error(f'{database_path} does not exist')
+        return 1
+    database_manager = DatabaseManager(f'sqlite+aiosqlite:///{database_path}')
+    await database_manager.init_db()  # creates tournament_standings in an older database
+    async for session in database_manager.get_session():
+        await StandingsManager(session).rebuild(args.tournament_id)
+    await database_manager.engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
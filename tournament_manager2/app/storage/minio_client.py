@@ -2,10 +2,16 @@
 
 import aiobotocore.session
 import asyncio
+import base64
+import hashlib
 import logging
+import math
+import os
 from botocore.exceptions import ClientError, EndpointConnectionError
 from typing import Optional
 
+MIN_PART_SIZE = 5 * 1024 * 1024  # S3 minimum size of every part except the last one
+
 class MinioClient:
     def __init__(
         self,
@@ -16,7 +22,10 @@ class MinioClient:
         server_bucket_name: str = None,
         base_team_bucket_name: str = None,
         team_config_bucket_name: str = None,
-        game_log_bucket_name: str = None
+        game_log_bucket_name: str = None,
+        upload_part_size: int = 16 * 1024 * 1024,
+        upload_parallelism: int = 4,
+        upload_retries: int = 3
     ):
         self.endpoint_url = endpoint_url
         self.access_key = access_key
@@ -31,6 +40,11 @@ class MinioClient:
         self.team_config_bucket_name = team_config_bucket_name
         self.game_log_bucket_name = game_log_bucket_name
 
+        # Multipart upload
+        self.upload_part_size = max(upload_part_size, MIN_PART_SIZE)
+        self.upload_parallelism = max(upload_parallelism, 1)
+        self.upload_retries = max(upload_retries, 1)
+
     async def init(self):
         # Initialize the aiobotocore session
         self.session = aiobotocore.session.get_session()
@@ -53,12 +67,65 @@ class MinioClient:
 
     async def upload_file(self, bucket_name: str, file_path: str, object_name: str):
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            await self.client.put_object(Bucket=bucket_name, Key=object_name, Body=data)
+            file_size = await asyncio.to_thread(os.path.getsize, file_path)
+            if file_size <= self.upload_part_size:
+                data = await asyncio.to_thread(self.read_part, file_path, 0, file_size)
+                await self.client.put_object(Bucket=bucket_name, Key=object_name, Body=data,
+                                             ContentMD5=self.content_md5(data))
+            else:
+                await self.upload_file_multipart(bucket_name, file_path, object_name, file_size)
             logging.info(f"'{file_path}' is successfully uploaded as '{object_name}' in '{bucket_name}' bucket.")
+            return True
         except Exception as e:
             logging.error(f"Error occurred while uploading: {e}")
+            return False
+
+    async def upload_file_multipart(self, bucket_name: str, file_path: str, object_name: str, file_size: int):
+        part_count = math.ceil(file_size / self.upload_part_size)
+        logging.debug(f"Uploading '{file_path}' in {part_count} parts of {self.upload_part_size} bytes, "
+                      f"{self.upload_parallelism} in parallel")
+        response = await self.client.create_multipart_upload(Bucket=bucket_name, Key=object_name)
+        upload_id = response['UploadId']
+        semaphore = asyncio.Semaphore(self.upload_parallelism)
+
+        async def upload_part(part_number: int):
+            async with semaphore:
+                return await self.upload_part(bucket_name, file_path, object_name, upload_id, part_number)
+
+        try:
+            parts = await asyncio.gather(*[upload_part(part_number) for part_number in range(1, part_count + 1)])
+            await self.client.complete_multipart_upload(Bucket=bucket_name, Key=object_name, UploadId=upload_id,
+                                                        MultipartUpload={'Parts': parts})
+        except BaseException:
+            await self.client.abort_multipart_upload(Bucket=bucket_name, Key=object_name, UploadId=upload_id)
+            raise
+
+    async def upload_part(self, bucket_name: str, file_path: str, object_name: str, upload_id: str, part_number: int):
+        data = await asyncio.to_thread(self.read_part, file_path, (part_number - 1) * self.upload_part_size,
+                                       self.upload_part_size)
+        # the server rejects the part (BadDigest) if it does not match ContentMD5
+        content_md5 = self.content_md5(data)
+        for attempt in range(1, self.upload_retries + 1):
+            try:
+                response = await self.client.upload_part(Bucket=bucket_name, Key=object_name, UploadId=upload_id,
+                                                         PartNumber=part_number, Body=data, ContentMD5=content_md5)
+                return {'ETag': response['ETag'], 'PartNumber': part_number}
+            except Exception as e:
+                if attempt == self.upload_retries:
+                    raise
+                logging.warning(f"Uploading part {part_number} of '{object_name}' failed ({e}), "
+                                f"retry {attempt}/{self.upload_retries - 1}")
+                await asyncio.sleep(2 ** (attempt - 1))
+
+    @staticmethod
+    def read_part(file_path: str, offset: int, size: int) -> bytes:
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(size)
+
+    @staticmethod
+    def content_md5(data: bytes) -> str:
+        return base64.b64encode(hashlib.md5(data).digest()).decode()
 
     async def download_file(self, bucket_name: str, object_name: str, file_path: str):
         try:
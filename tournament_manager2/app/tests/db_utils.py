@@ -17,6 +17,14 @@ async def get_db_session():
     
     return async_session()
 
+class SessionDbManager:
+    # DatabaseManager.get_session over the session of the test
+    def __init__(self, session):
+        self.session = session
+
+    async def get_session(self):
+        yield self.session
+
 async def add_user_to_db(session, user_name, user_code):
     try:
         user_model = UserModel()
@@ -46,3 +46,21 @@ def test_add_user(test_app):
 
     # Assert success and check the response
     assert json_response["success"] is True
+
+def test_send_drain_command(test_app, monkeypatch):
+    sent = []
+
+    async def send_command_to_runners(self, runner_ids, command):
+        sent.append((runner_ids, command))
+        return [{"runner_id": runner_id, "success": True} for runner_id in runner_ids]
+
+    monkeypatch.setattr("managers.runner_manager.RunnerManager.send_command_to_runners", send_command_to_runners)
+
+    # a rolling upgrade drains the runners one after the other
+    response = test_app.post("/runner/send_command", json={"command": "drain", "runner_ids": 1},
+                             headers={"api_key": "test-api-key"})
+    assert response.status_code == 200
+    json_response = response.json()
+
+    assert json_response["success"] is True
+    assert sent == [([1], "drain")]
@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import text, inspect, select
+from managers.database_manager import DatabaseManager
+from models import UserModel, GameModel
+from models.game_model import GameStatusEnum
+
+
+async def get_index_names(database_manager, table_name):
+    async with database_manager.engine.connect() as conn:
+        indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes(table_name))
+    return {index['name'] for index in indexes}
+
+
+async def get_query_plan(database_manager, stmt):
+    async with database_manager.engine.connect() as conn:
+        sql = str(stmt.compile(conn.sync_engine, compile_kwargs={"literal_binds": True}))
+        result = await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+        return ' '.join(row[-1] for row in result.all())
+
+
+@pytest.mark.asyncio
+async def test_init_db_creates_missing_indexes(tmp_path):
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'old.db'}"
+    database_manager = DatabaseManager(database_url)
+    await database_manager.init_db()
+    # a database file created before the indexes were declared
+    async with database_manager.engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_users_code"))
+        await conn.execute(text("DROP INDEX ix_games_tournament_id_status"))
+    await database_manager.engine.dispose()
+    assert "ix_users_code" not in await get_index_names(database_manager, "users")
+
+    database_manager = DatabaseManager(database_url)
+    await database_manager.init_db()
+    try:
+        assert "ix_users_code" in await get_index_names(database_manager, "users")
+        assert "ix_games_tournament_id_status" in await get_index_names(database_manager, "games")
+        # nothing is left to create
+        async with database_manager.engine.begin() as conn:
+            assert await conn.run_sync(DatabaseManager.create_missing_indexes) == []
+
+        plan = await get_query_plan(database_manager, select(UserModel).where(UserModel.code == "123456"))
+        assert "USING INDEX ix_users_code" in plan
+        plan = await get_query_plan(database_manager, select(GameModel).where(
+            GameModel.tournament_id == 1, GameModel.status == GameStatusEnum.PENDING))
+        assert "USING INDEX ix_games_tournament_id_status" in plan
+    finally:
+        await database_manager.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_drop_stale_indexes(tmp_path):
+    database_manager = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'stale.db'}")
+    await database_manager.init_db()
+    try:
+        # an index of an earlier version of the models, and one made by hand
+        async with database_manager.engine.begin() as conn:
+            await conn.execute(text("CREATE INDEX ix_tournaments_status ON tournaments (status)"))
+            await conn.execute(text("CREATE INDEX tournaments_name ON tournaments (name)"))
+        await database_manager.engine.dispose()
+
+        # the manager keeps them on startup
+        database_manager = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'stale.db'}")
+        await database_manager.init_db()
+        assert {"ix_tournaments_status", "tournaments_name"} <= await get_index_names(database_manager, "tournaments")
+
+        async with database_manager.engine.begin() as conn:
+            assert await conn.run_sync(DatabaseManager.drop_stale_indexes) == ["ix_tournaments_status"]
+        tournament_indexes = await get_index_names(database_manager, "tournaments")
+        assert "ix_tournaments_status" not in tournament_indexes
+        assert "tournaments_name" in tournament_indexes
+        assert "ix_tournaments_status_start_at" in tournament_indexes
+        async with database_manager.engine.begin() as conn:
+            assert await conn.run_sync(DatabaseManager.drop_stale_indexes) == []
+    finally:
+        await database_manager.engine.dispose()
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from datetime import datetime
+from sqlalchemy import event, select, text
+from managers.database_manager import DatabaseManager
+from managers.database_writer import DatabaseWriter
+from managers.runner_manager import RunnerManager
+from models import RunnerModel, RunnerLogModel
+from utils.messages import RunnerStatusMessageEnum, SubmitRunnerLog, LogLevelMessageEnum
+
+
+async def get_database_manager(tmp_path):
+    database_manager = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}")
+    await database_manager.init_db()
+    async with database_manager.async_session() as session:
+        session.add(RunnerModel(status=RunnerStatusMessageEnum.RUNNING, address="r1:8082", available_games_count=2))
+        await session.commit()
+    return database_manager
+
+
+def count_commits(database_manager):
+    commits = []
+    event.listen(database_manager.engine.sync_engine, "commit", lambda conn: commits.append(1))
+    return commits
+
+
+async def get_log_messages(database_manager):
+    async with database_manager.async_session() as session:
+        result = await session.execute(select(RunnerLogModel.message).order_by(RunnerLogModel.id))
+        return result.scalars().all()
+
+
+def submit_log(writer, runner_id, message):
+    log = SubmitRunnerLog(runner_id=runner_id, message=message, log_level=LogLevelMessageEnum.INFO,
+                          timestamp=datetime.utcnow().isoformat())
+    return writer.submit(lambda session: RunnerManager(session).add_log(log))
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas(tmp_path):
+    database_manager = await get_database_manager(tmp_path)
+    try:
+        async with database_manager.engine.connect() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+    finally:
+        await database_manager.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_writer_commits_waiting_writes_together(tmp_path):
+    database_manager = await get_database_manager(tmp_path)
+    writer = DatabaseWriter(database_manager)
+    writer.run()
+    try:
+        commits = count_commits(database_manager)
+        responses = await asyncio.gather(*[submit_log(writer, 1, f"log{i}") for i in range(20)])
+
+        assert all(response.success for response in responses)
+        assert len(commits) == 1
+        assert await get_log_messages(database_manager) == [f"log{i}" for i in range(20)]
+    finally:
+        writer.cancel()
+        await asyncio.gather(writer.task, return_exceptions=True)
+        await database_manager.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_writer_rolls_back_failed_write_alone(tmp_path):
+    database_manager = await get_database_manager(tmp_path)
+    writer = DatabaseWriter(database_manager)
+    writer.run()
+
+    async def failing_write(session):
+        session.add(RunnerLogModel(runner_id=1, message="lost"))
+        await session.flush()
+        raise RuntimeError("failed")
+
+    try:
+        results = await asyncio.gather(
+            submit_log(writer, 1, "first"),
+            writer.submit(failing_write),
+            submit_log(writer, 2, "unknown runner"),
+            submit_log(writer, 1, "last"),
+            return_exceptions=True
+        )
+
+        assert results[0].success and results[3].success
+        assert isinstance(results[1], RuntimeError)
+        assert results[2].error == "Runner not found"
+        assert await get_log_messages(database_manager) == ["first", "last"]
+    finally:
+        writer.cancel()
+        await asyncio.gather(writer.task, return_exceptions=True)
+        await database_manager.engine.dispose()
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from managers.deadline_scheduler import DeadlineScheduler
+from models.tournament_model import TournamentModel, TournamentStatus
+from tests.db_utils import *
+
+
+async def get_status(session, tournament_id):
+    session.expunge_all()
+    result = await session.execute(select(TournamentModel).where(TournamentModel.id == tournament_id))
+    return result.scalars().first().status
+
+
+@pytest.mark.asyncio
+async def test_load_deadlines():
+    session = await get_db_session()
+    user = await add_user_to_db(session, "U1", "123456")
+    now = datetime.utcnow()
+    t1 = await add_tournament_to_db(session, user.id, "T1", start_at=now + timedelta(days=3),
+                                    start_registration_at=now + timedelta(days=1),
+                                    end_registration_at=now + timedelta(days=2),
+                                    status=TournamentStatus.WAIT_FOR_REGISTRATION)
+    t2 = await add_tournament_to_db(session, user.id, "T2", start_at=now + timedelta(hours=3),
+                                    start_registration_at=now - timedelta(hours=2),
+                                    end_registration_at=now + timedelta(hours=2),
+                                    status=TournamentStatus.REGISTRATION)
+    t3 = await add_tournament_to_db(session, user.id, "T3", start_at=now + timedelta(hours=1),
+                                    start_registration_at=now - timedelta(hours=3),
+                                    end_registration_at=now - timedelta(hours=2),
+                                    status=TournamentStatus.WAIT_FOR_START)
+    await add_tournament_to_db(session, user.id, "T4", start_at=now - timedelta(hours=1),
+                               start_registration_at=now - timedelta(hours=3),
+                               end_registration_at=now - timedelta(hours=2),
+                               status=TournamentStatus.FINISHED)
+
+    deadlines = await DeadlineScheduler.load_deadlines(session)
+
+    assert sorted(deadlines) == [(t3.start_at, t3.id), (t2.end_registration_at, t2.id),
+                                 (t1.start_registration_at, t1.id)]
+    assert deadlines[0] == (t3.start_at, t3.id)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_fires_at_deadline():
+    session = await get_db_session()
+    user = await add_user_to_db(session, "U1", "123456")
+    now = datetime.utcnow()
+    tournament = await add_tournament_to_db(session, user.id, "T1", start_at=now + timedelta(days=2),
+                                            start_registration_at=now + timedelta(seconds=0.3),
+                                            end_registration_at=now + timedelta(days=1),
+                                            status=TournamentStatus.WAIT_FOR_REGISTRATION)
+    scheduler = DeadlineScheduler(SessionDbManager(session), None, retry_interval=60)
+    scheduler.run()
+    try:
+        await asyncio.sleep(0.1)
+        assert await get_status(session, tournament.id) == TournamentStatus.WAIT_FOR_REGISTRATION
+        assert scheduler.get_next_deadline() == tournament.start_registration_at
+        await asyncio.sleep(0.5)
+        assert await get_status(session, tournament.id) == TournamentStatus.REGISTRATION
+        # the next deadline of the tournament is its end of registration
+        assert scheduler.get_next_deadline() == tournament.end_registration_at
+    finally:
+        scheduler.cancel()
+        await asyncio.gather(scheduler.task, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_wakes_up_on_notify():
+    session = await get_db_session()
+    user = await add_user_to_db(session, "U1", "123456")
+    scheduler = DeadlineScheduler(SessionDbManager(session), None, max_sleep=3600, retry_interval=60)
+    scheduler.run()
+    try:
+        await asyncio.sleep(0.1)
+        assert scheduler.get_next_deadline() is None
+        now = datetime.utcnow()
+        tournament = await add_tournament_to_db(session, user.id, "T1", start_at=now + timedelta(days=2),
+                                                start_registration_at=now,
+                                                end_registration_at=now + timedelta(days=1),
+                                                status=TournamentStatus.WAIT_FOR_REGISTRATION)
+        scheduler.notify()
+        await asyncio.sleep(0.2)
+        assert await get_status(session, tournament.id) == TournamentStatus.REGISTRATION
+    finally:
+        scheduler.cancel()
+        await asyncio.gather(scheduler.task, return_exceptions=True)
@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from managers.game_dispatcher import GameDispatcher
+from models.game_model import GameModel, GameStatusEnum
+from models.tournament_model import TournamentStatus
+from utils.messages import RunnerStatusMessageEnum, RunnerCommandMessageEnum
+from tests.db_utils import *
+
+
+class FakeRunnersDispatcher(GameDispatcher):
+    # answers /add_game like the runners at the given addresses would
+    def __init__(self, db_manager, answers: dict, **kwargs):
+        super().__init__(db_manager, **kwargs)
+        self.answers = answers
+        self.sent: list[tuple[str, int]] = []
+
+    async def post_game(self, address: str, message: dict) -> dict:
+        self.sent.append((address, message['game_id']))
+        answer = self.answers[address]
+        if isinstance(answer, Exception):
+            raise answer
+        return {'success': answer is None, 'error': answer, 'port': 6000 + len(self.sent)}
+
+
+async def add_queued_games(session, count, start_at=None):
+    user = await add_user_to_db(session, "U1", "123456")
+    team1 = await add_team_to_db(session, user.id, "team1")
+    team2 = await add_team_to_db(session, user.id, "team2")
+    now = start_at or datetime.utcnow()
+    tournament = await add_tournament_to_db(session, user.id, "T1", now, now - timedelta(hours=2),
+                                            now - timedelta(hours=1), TournamentStatus.IN_PROGRESS)
+    return [await add_game_to_db(session, tournament.id, team1.id, team2.id, GameStatusEnum.IN_QUEUE)
+            for _ in range(count)]
+
+
+async def dispatch(dispatcher, session):
+    sent = await dispatcher.dispatch_once(session)
+    await asyncio.gather(*dispatcher.send_tasks)
+    session.expunge_all()
+    return sent
+
+
+async def get_games(session):
+    result = await session.execute(select(GameModel).order_by(GameModel.id))
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_load_runners_counts_free_slots():
+    session = await get_db_session()
+    running = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "r1:8082", 3, datetime.now(), None)
+    await add_runner_to_db(session, RunnerStatusMessageEnum.PAUSED, "r2:8082", 3, datetime.now(), None)
+    await add_runner_to_db(session, RunnerStatusMessageEnum.CRASHED, "r3:8082", 3, datetime.now(), None)
+    draining = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "r4:8082", 3, datetime.now(), None)
+    draining.requested_command = RunnerCommandMessageEnum.DRAIN
+    games = await add_queued_games(session, 2)
+    games[0].status = GameStatusEnum.RUNNING
+    games[0].runner_id = running.id
+    await session.commit()
+
+    runners = await GameDispatcher.load_runners(session)
+
+    assert runners == {running.id: ("r1:8082", 2)}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_only_fills_free_slots_in_order():
+    session = await get_db_session()
+    r1 = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "r1:8082", 2, datetime.now(), None)
+    r2 = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "r2:8082", 1, datetime.now(), None)
+    await add_runner_to_db(session, RunnerStatusMessageEnum.PAUSED, "r3:8082", 5, datetime.now(), None)
+    games = await add_queued_games(session, 5)
+    dispatcher = FakeRunnersDispatcher(SessionDbManager(session), {"r1:8082": None, "r2:8082": None})
+
+    assert await dispatch(dispatcher, session) == 3
+    assert [game_id for _, game_id in dispatcher.sent] == [game.id for game in games[:3]]
+    assert "r3:8082" not in [address for address, _ in dispatcher.sent]
+    statuses = [(game.status, game.runner_id) for game in await get_games(session)]
+    assert sorted(statuses[:3]) == sorted([(GameStatusEnum.RUNNING, r1.id), (GameStatusEnum.RUNNING, r1.id),
+                                           (GameStatusEnum.RUNNING, r2.id)])
+    assert statuses[3:] == [(GameStatusEnum.IN_QUEUE, None)] * 2
+
+    # no free slot, nothing is sent until a game finishes
+    assert await dispatch(dispatcher, session) == 0
+    dispatcher.on_game_finished(r2.id)
+    assert await dispatch(dispatcher, session) == 1
+    assert dispatcher.sent[-1] == ("r2:8082", games[3].id)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_skips_busy_and_unreachable_runners():
+    session = await get_db_session()
+    await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "r1:8082", 1, datetime.now(), None)
+    await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "r2:8082", 1, datetime.now(), None)
+    games = await add_queued_games(session, 2)
+    dispatcher = FakeRunnersDispatcher(SessionDbManager(session),
+                                       {"r1:8082": "Runner is paused", "r2:8082": ConnectionError("refused")},
+                                       retry_interval=60)
+
+    assert await dispatch(dispatcher, session) == 2
+    # both games stay queued and the runners get no game until retry_interval passes
+    assert [game.status for game in await get_games(session)] == [GameStatusEnum.IN_QUEUE] * 2
+    assert await dispatch(dispatcher, session) == 0
+    assert len(dispatcher.sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_game_fails_after_max_attempts():
+    session = await get_db_session()
+    await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "r1:8082", 1, datetime.now(), None)
+    games = await add_queued_games(session, 1)
+    dispatcher = FakeRunnersDispatcher(SessionDbManager(session), {"r1:8082": "Unknown server preset"},
+                                       max_attempts=2)
+
+    assert await dispatch(dispatcher, session) == 1
+    assert (await get_games(session))[0].status == GameStatusEnum.IN_QUEUE
+    assert await dispatch(dispatcher, session) == 1
+    assert (await get_games(session))[0].status == GameStatusEnum.ERROR
+    assert await dispatch(dispatcher, session) == 0
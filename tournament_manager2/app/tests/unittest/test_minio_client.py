@@ -0,0 +1,108 @@
+import pytest
+from storage.minio_client import MinioClient, MIN_PART_SIZE
+
+
+class FakeS3Client:
+    def __init__(self, fail_part_number=None, fail_times=0):
+        self.fail_part_number = fail_part_number
+        self.fail_times = fail_times
+        self.objects = {}
+        self.uploads = {}
+        self.aborted = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def put_object(self, Bucket, Key, Body, ContentMD5):
+        assert ContentMD5 == MinioClient.content_md5(Body)
+        self.objects[(Bucket, Key)] = Body
+
+    async def create_multipart_upload(self, Bucket, Key):
+        upload_id = f'upload-{len(self.uploads) + 1}'
+        self.uploads[upload_id] = {}
+        return {'UploadId': upload_id}
+
+    async def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, ContentMD5):
+        assert ContentMD5 == MinioClient.content_md5(Body)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if PartNumber == self.fail_part_number and self.fail_times > 0:
+                self.fail_times -= 1
+                raise ConnectionError('connection reset')
+            self.uploads[UploadId][PartNumber] = Body
+            return {'ETag': f'"etag-{PartNumber}"'}
+        finally:
+            self.in_flight -= 1
+
+    async def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = MultipartUpload['Parts']
+        assert [p['PartNumber'] for p in parts] == list(range(1, len(parts) + 1))
+        self.objects[(Bucket, Key)] = b''.join(self.uploads[UploadId][p['PartNumber']] for p in parts)
+
+    async def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(UploadId)
+
+
+def get_minio_client(fake_client, parallelism=2):
+    minio_client = MinioClient('localhost:9000', 'access', 'secret', secure=False,
+                               game_log_bucket_name='gamelog', upload_part_size=MIN_PART_SIZE,
+                               upload_parallelism=parallelism, upload_retries=3)
+    minio_client.client = fake_client
+    return minio_client
+
+
+@pytest.mark.asyncio
+async def test_upload_small_file_single_put(tmp_path):
+    file_path = tmp_path / '1.zip'
+    file_path.write_bytes(b'game log')
+    fake_client = FakeS3Client()
+    minio_client = get_minio_client(fake_client)
+
+    assert await minio_client.upload_file('gamelog', str(file_path), '1.zip')
+    assert fake_client.objects[('gamelog', '1.zip')] == b'game log'
+    assert fake_client.uploads == {}
+
+
+@pytest.mark.asyncio
+async def test_upload_large_file_multipart(tmp_path):
+    data = bytes(range(256)) * (MIN_PART_SIZE * 3 // 256 + 100)
+    file_path = tmp_path / '2.zip'
+    file_path.write_bytes(data)
+    fake_client = FakeS3Client()
+    minio_client = get_minio_client(fake_client, parallelism=2)
+
+    assert await minio_client.upload_file('gamelog', str(file_path), '2.zip')
+    assert fake_client.objects[('gamelog', '2.zip')] == data
+    assert len(fake_client.uploads['upload-1']) == 4
+    assert fake_client.max_in_flight <= 2
+
+
+@pytest.mark.asyncio
+async def test_upload_multipart_retries_failed_part(tmp_path, monkeypatch):
+    monkeypatch.setattr('asyncio.sleep', _no_sleep)
+    data = b'x' * (MIN_PART_SIZE + 10)
+    file_path = tmp_path / '3.zip'
+    file_path.write_bytes(data)
+    fake_client = FakeS3Client(fail_part_number=2, fail_times=2)
+    minio_client = get_minio_client(fake_client)
+
+    assert await minio_client.upload_file('gamelog', str(file_path), '3.zip')
+    assert fake_client.objects[('gamelog', '3.zip')] == data
+    assert fake_client.aborted == []
+
+
+@pytest.mark.asyncio
+async def test_upload_multipart_aborts_after_retries(tmp_path, monkeypatch):
+    monkeypatch.setattr('asyncio.sleep', _no_sleep)
+    file_path = tmp_path / '4.zip'
+    file_path.write_bytes(b'x' * (MIN_PART_SIZE + 10))
+    fake_client = FakeS3Client(fail_part_number=1, fail_times=3)
+    minio_client = get_minio_client(fake_client)
+
+    assert not await minio_client.upload_file('gamelog', str(file_path), '4.zip')
+    assert ('gamelog', '4.zip') not in fake_client.objects
+    assert fake_client.aborted == ['upload-1']
+
+
+async def _no_sleep(delay):
+    pass
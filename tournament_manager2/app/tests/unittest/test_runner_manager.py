@@ -9,7 +9,7 @@ from models.base import Base
 from models.user_model import UserModel
 from models.team_model import TeamModel
 from models.runner_model import RunnerModel, RunnerStatusMessageEnum
-from models.runner_log_model import RunnerLogModel
+from models.runner_log_model import RunnerLogModel, LogLevelEnum
 from managers.team_manager import TeamManager
 from managers.user_manager import UserManager
 from managers.runner_manager import RunnerManager
@@ -332,3 +332,113 @@ async def test_handle_game_finished_success():
     assert len(tournament.games) == 1
     assert tournament.done == True
     assert len(tournament.teams) == 2
+
+@pytest.mark.asyncio
+async def test_handle_game_finished_error():
+    session = await get_db_session()
+    runner_model = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "127.0.0.1:8000", 10, datetime.now(), None)
+    user_model = await add_user_to_db(session, "user1", "code1")
+    team_model1 = await add_team_to_db(session, user_model.id, "team1")
+    team_model2 = await add_team_to_db(session, user_model.id, "team2")
+    tournament_model = await add_tournament_to_db(session, user_model.id, "tournament1", datetime.now(), datetime.now(), datetime.now(), TournamentStatus.IN_PROGRESS, [team_model1, team_model2])
+    game_model1 = await add_game_to_db(session, tournament_model.id, team_model1.id, team_model2.id, GameStatusEnum.RUNNING, runner_model.id)
+
+    session.expunge_all()
+
+    runner_manager = RunnerManager(session)
+    response = await runner_manager.handle_game_finished(GameFinishedMessage(
+        runner_id=runner_model.id,
+        game_id=game_model1.id,
+        left_score=-1,
+        right_score=-1,
+        success=False,
+        error="Killed by watchdog: game stalled at cycle 1200 for 60s"
+    ))
+
+    assert response is not None
+    assert response.success == True
+
+    session.expunge_all()
+
+    stmt = select(RunnerModel).options(selectinload(RunnerModel.games)).where(RunnerModel.id == runner_model.id)
+    result = await session.execute(stmt)
+    runner = result.scalars().first()
+    assert len(runner.games) == 0
+
+    stmt = select(GameModel).where(GameModel.id == game_model1.id)
+    result = await session.execute(stmt)
+    game: GameModel = result.scalars().first()
+    assert game.status == GameStatusEnum.ERROR
+    assert game.left_score == 0
+
+    # the failed game was the only one, it ends the tournament
+    stmt = select(TournamentModel).where(TournamentModel.id == tournament_model.id)
+    result = await session.execute(stmt)
+    tournament: TournamentModel = result.scalars().first()
+    assert tournament.status == TournamentStatus.FINISHED
+    assert tournament.done == True
+
+@pytest.mark.asyncio
+async def test_handle_game_finished_tournament_finished_with_failed_game():
+    session = await get_db_session()
+    runner_model = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "127.0.0.1:8000", 10, datetime.now(), None)
+    user_model = await add_user_to_db(session, "user1", "code1")
+    teams = [await add_team_to_db(session, user_model.id, f"team{i}") for i in range(3)]
+    tournament_model = await add_tournament_to_db(session, user_model.id, "tournament1", datetime.now(), datetime.now(), datetime.now(), TournamentStatus.IN_PROGRESS, teams)
+    games = [await add_game_to_db(session, tournament_model.id, teams[i].id, teams[j].id, GameStatusEnum.RUNNING, runner_model.id)
+             for i, j in [(0, 1), (0, 2), (1, 2)]]
+
+    session.expunge_all()
+
+    runner_manager = RunnerManager(session)
+    response = await runner_manager.handle_game_finished(GameFinishedMessage(
+        runner_id=runner_model.id, game_id=games[0].id, left_score=0, right_score=0, success=False,
+        error="Killed by watchdog"))
+    assert response.success == True
+    for game in games[1:]:
+        session.expunge_all()
+        response = await runner_manager.handle_game_finished(GameFinishedMessage(
+            runner_id=runner_model.id, game_id=game.id, left_score=1, right_score=0))
+        assert response.success == True
+
+    session.expunge_all()
+
+    stmt = select(TournamentModel).options(selectinload(TournamentModel.games)).where(TournamentModel.id == tournament_model.id)
+    result = await session.execute(stmt)
+    tournament: TournamentModel = result.scalars().first()
+    assert sorted(game.status for game in tournament.games) == sorted([GameStatusEnum.ERROR, GameStatusEnum.FINISHED, GameStatusEnum.FINISHED])
+    assert tournament.status == TournamentStatus.FINISHED
+    assert tournament.done == True
+
+
+@pytest.mark.asyncio
+async def test_get_runner_logs_pages():
+    session = await get_db_session()
+    runner = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "127.0.0.1:8000", 10, datetime.now(), None)
+    other = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "127.0.0.1:9000", 10, datetime.now(), None)
+    start = datetime(2024, 7, 1)
+    # two logs share every timestamp, the id orders them
+    for i in range(6):
+        session.add(RunnerLogModel(runner_id=runner.id, message=f"log{i}", timestamp=start + timedelta(seconds=i // 2),
+                                   log_level=LogLevelEnum.ERROR if i % 2 else LogLevelEnum.INFO))
+    session.add(RunnerLogModel(runner_id=other.id, message="other", timestamp=start))
+    await session.commit()
+    session.expunge_all()
+
+    runner_manager = RunnerManager(session)
+    messages = []
+    request = GetRunnerLogRequestMessage(limit=4)
+    while True:
+        response = await runner_manager.get_runner_logs(runner.id, request)
+        messages.append([log.message for log in response.logs])
+        if response.next_cursor is None:
+            break
+        request = GetRunnerLogRequestMessage(limit=4, cursor=response.next_cursor)
+    assert messages == [["log5", "log4", "log3", "log2"], ["log1", "log0"]]
+
+    response = await runner_manager.get_runner_logs(runner.id, GetRunnerLogRequestMessage(
+        log_level=LogLevelMessageEnum.ERROR, since=start + timedelta(seconds=1), until=start + timedelta(seconds=3)))
+    assert [log.message for log in response.logs] == ["log5", "log3"]
+
+    with pytest.raises(ValueError):
+        await runner_manager.get_runner_logs(runner.id, GetRunnerLogRequestMessage(cursor=response.next_cursor or "WzFd"))
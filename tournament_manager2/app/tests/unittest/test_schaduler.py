@@ -223,3 +223,49 @@ async def test_update_tournament_status_to_in_progress():
     assert len(tournament.games) == 3
 
     assert len(game_list) == 3
+
+
+async def add_started_tournament(session, team_names):
+    user_model = await add_user_to_db(session, "U1", "123456")
+    teams = [await add_team_to_db(session, user_model.id, name) for name in team_names]
+    now = datetime.utcnow()
+    tournament_model = await add_tournament_to_db(session, user_model.id, "Tournament1", start_at=now,
+                                                  start_registration_at=now, end_registration_at=now,
+                                                  status=TournamentStatus.WAIT_FOR_START, teams=teams)
+    await TournamentManager(session, None).create_all_games(tournament_model.id)
+    session.expunge_all()
+    return tournament_model, teams
+
+
+async def get_game_statuses(session, tournament_id):
+    session.expunge_all()
+    result = await session.execute(select(GameModel.status).where(GameModel.tournament_id == tournament_id))
+    return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_update_tournament_status_to_in_progress_messages():
+    session = await get_db_session()
+    tournament_model, teams = await add_started_tournament(session, ["A", "B", "C", "D"])
+
+    game_list = []
+    await update_tournament_status_to_in_progress(session, game_list=game_list, batch_size=2)
+
+    names = [team.name for team in teams]
+    assert [(m.left_team_name, m.right_team_name) for m in game_list] == \
+        [(names[i], names[j]) for i in range(4) for j in range(i + 1, 4)]
+    assert all(m.left_base_team_name == m.left_team_name for m in game_list)
+    assert await get_game_statuses(session, tournament_model.id) == [GameStatusEnum.IN_QUEUE] * 6
+
+
+@pytest.mark.asyncio
+async def test_update_tournament_status_to_in_progress_without_sender():
+    session = await get_db_session()
+    tournament_model, _ = await add_started_tournament(session, ["A", "B", "C"])
+
+    # the game dispatcher sends the games, they are only queued
+    await update_tournament_status_to_in_progress(session)
+
+    result = await session.execute(select(TournamentModel.status).where(TournamentModel.id == tournament_model.id))
+    assert result.scalar() == TournamentStatus.IN_PROGRESS
+    assert await get_game_statuses(session, tournament_model.id) == [GameStatusEnum.IN_QUEUE] * 3
@@ -0,0 +1,114 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import select
+from managers.runner_manager import RunnerManager
+from managers.standings_manager import StandingsManager
+from managers.tournament_manager import TournamentManager
+from models.game_model import GameModel, GameStatusEnum
+from models.standing_model import StandingModel
+from models.tournament_model import TournamentStatus
+from tests.db_utils import *
+from utils.messages import *
+
+
+async def add_tournament_with_games(session, team_count):
+    runner = await add_runner_to_db(session, RunnerStatusMessageEnum.RUNNING, "127.0.0.1:8000", 10, datetime.now(), None)
+    user = await add_user_to_db(session, "user1", "code1")
+    teams = [await add_team_to_db(session, user.id, f"team{i}") for i in range(team_count)]
+    tournament = await add_tournament_to_db(session, user.id, "tournament1", datetime.now(), datetime.now(),
+                                            datetime.now(), TournamentStatus.IN_PROGRESS, teams)
+    games = [await add_game_to_db(session, tournament.id, teams[i].id, teams[j].id, GameStatusEnum.RUNNING, runner.id)
+             for i in range(team_count) for j in range(i + 1, team_count)]
+    session.expunge_all()
+    return runner, tournament, teams, games
+
+
+async def finish_game(session, runner, game, left_score, right_score, success=True):
+    response = await RunnerManager(session).handle_game_finished(GameFinishedMessage(
+        runner_id=runner.id, game_id=game.id, left_score=left_score, right_score=right_score, success=success))
+    session.expunge_all()
+    return response
+
+
+async def get_standings(session, tournament_id):
+    result = await session.execute(select(StandingModel).where(StandingModel.tournament_id == tournament_id)
+                                   .order_by(StandingModel.team_id))
+    return [(s.team_id, s.win, s.draw, s.lose, s.scored_goal, s.received_goal, s.point) for s in result.scalars().all()]
+
+
+@pytest.mark.asyncio
+async def test_standings_follow_finished_games():
+    session = await get_db_session()
+    runner, tournament, teams, games = await add_tournament_with_games(session, 3)
+    t0, t1, t2 = [team.id for team in teams]
+
+    assert (await finish_game(session, runner, games[0], 2, 1)).success  # t0 - t1
+    assert (await finish_game(session, runner, games[1], 1, 1)).success  # t0 - t2
+    # a failed game and a repeated report do not count
+    assert (await finish_game(session, runner, games[2], 0, 3, success=False)).success  # t1 - t2
+    assert not (await finish_game(session, runner, games[0], 2, 1)).success
+
+    assert await get_standings(session, tournament.id) == [
+        (t0, 1, 1, 0, 3, 2, 4),
+        (t1, 0, 0, 1, 1, 2, 0),
+        (t2, 0, 1, 0, 1, 1, 1),
+    ]
+
+    results = await StandingsManager(session).get_results(tournament.id)
+    assert [(r.team_id, r.rank, r.point, r.goal_difference) for r in results] == [(t0, 1, 4, 1), (t2, 2, 1, 0), (t1, 3, 0, -1)]
+
+    tournament_message = await TournamentManager(session, None).get_tournament(tournament.id)
+    assert [r.team_id for r in tournament_message.results] == [t0, t2, t1]
+
+
+@pytest.mark.asyncio
+async def test_results_include_teams_without_games():
+    session = await get_db_session()
+    _, tournament, teams, _ = await add_tournament_with_games(session, 2)
+
+    results = await StandingsManager(session).get_results(tournament.id)
+
+    assert [(r.team_id, r.win, r.draw, r.lose, r.point, r.rank) for r in results] == \
+        [(teams[0].id, 0, 0, 0, 0, 1), (teams[1].id, 0, 0, 0, 0, 2)]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental_standings():
+    session = await get_db_session()
+    runner, tournament, teams, games = await add_tournament_with_games(session, 4)
+    for game, (left_score, right_score) in zip(games, [(3, 0), (1, 1), (0, 2), (4, 4), (2, 1)]):
+        await finish_game(session, runner, game, left_score, right_score)
+    incremental = await get_standings(session, tournament.id)
+
+    assert await StandingsManager(session).rebuild(tournament.id) == 4
+    session.expunge_all()
+
+    assert await get_standings(session, tournament.id) == incremental
+
+
+async def get_game(session, game_id):
+    result = await session.execute(select(GameModel).where(GameModel.id == game_id))
+    game = result.scalars().first()
+    return game.status, game.left_score, game.right_score
+
+
+@pytest.mark.asyncio
+async def test_report_of_finished_game_is_refused():
+    session = await get_db_session()
+    runner, tournament, teams, games = await add_tournament_with_games(session, 3)
+    assert (await finish_game(session, runner, games[0], 2, 1)).success
+    assert (await finish_game(session, runner, games[1], 0, 0)).success
+    standings = await get_standings(session, tournament.id)
+
+    # a late failure and a report with other scores leave the game and the standings as they are
+    response = await finish_game(session, runner, games[0], 0, 0, success=False)
+    assert response.error == "Game already finished"
+    response = await finish_game(session, runner, games[1], 3, 0)
+    assert response.error == "Game already finished"
+
+    assert await get_game(session, games[0].id) == (GameStatusEnum.FINISHED, 2, 1)
+    assert await get_game(session, games[1].id) == (GameStatusEnum.FINISHED, 0, 0)
+    assert await get_standings(session, tournament.id) == standings
+    await StandingsManager(session).rebuild(tournament.id)
+    session.expunge_all()
+    assert await get_standings(session, tournament.id) == standings
@@ -8,7 +8,7 @@ from managers.team_manager import TeamManager
 from managers.user_manager import UserManager
 from models.user_model import UserModel
 from models.team_model import TeamModel
-from utils.messages import AddTeamRequestMessage, AddUserRequestMessage, GetTeamRequestMessage, GetTeamResponseMessage, GetUserRequestMessage, RemoveTeamRequestMessage, ResponseMessage, UpdateTeamRequestMessage
+from utils.messages import AddTeamRequestMessage, AddUserRequestMessage, GetTeamRequestMessage, GetTeamsRequestMessage, GetTeamResponseMessage, GetUserRequestMessage, RemoveTeamRequestMessage, ResponseMessage, UpdateTeamRequestMessage
 from tests.db_utils import add_team_to_db, add_user_to_db, get_db_manager_and_session, get_db_session
 
 async def make_user(session, user_name="U1", user_code="123456"):
@@ -323,4 +323,24 @@ async def test_get_teams():
         
         
        
-       
\ No newline at end of file
+       
+
+
+@pytest.mark.asyncio
+async def test_get_teams_of_user_pages():
+    session = await get_db_session()
+    user1 = await add_user_to_db(session, "U1", "123456")
+    user2 = await add_user_to_db(session, "U2", "654321")
+    user1_id, user2_id = user1.id, user2.id
+    for i in range(3):
+        await add_team_to_db(session, user1_id, f"A{i}")
+        await add_team_to_db(session, user2_id, f"B{i}")
+    session.expire_all()
+
+    tm = TeamManager(db_session=session)
+    response = await tm.get_teams(GetTeamsRequestMessage(user_id=user2_id, limit=2))
+    assert [team.team_name for team in response.teams] == ["B0", "B1"]
+    assert response.next_cursor is not None
+    response = await tm.get_teams(GetTeamsRequestMessage(user_id=user2_id, limit=2, cursor=response.next_cursor))
+    assert [team.team_name for team in response.teams] == ["B2"]
+    assert response.next_cursor is None
@@ -11,6 +11,7 @@ from models.team_model import TeamModel
 from managers.team_manager import TeamManager
 from managers.user_manager import UserManager
 from models.tournament_model import TournamentModel, TournamentStatus
+from models.game_model import GameModel, GameStatusEnum
 from tests.db_utils import *
 from utils.messages import *
 from sqlalchemy.orm import selectinload
@@ -508,4 +509,79 @@ async def test_update_team_success():
     assert new_team is not None
     assert new_team.name == "T1"
     assert new_team.base_team == "cyrus"
-    assert new_team.config == "{}"
\ No newline at end of file
+    assert new_team.config == "{}"
+
+@pytest.mark.asyncio
+async def test_create_all_games_bulk():
+    session = await get_db_session()
+    user_model = await add_user_to_db(session, "U1", "123456")
+    tournament1 = await add_tournament_to_db(session, user_model.id, "T1", now(), now(), now(), TournamentStatus.WAIT_FOR_START)
+    tournament2 = await add_tournament_to_db(session, user_model.id, "T2", now(), now(), now(), TournamentStatus.WAIT_FOR_START)
+    teams = [await add_team_to_db(session, user_model.id, f"T{i}", tournament1) for i in range(5)]
+    await add_team_to_db(session, user_model.id, "Other", tournament2)
+
+    session.expunge_all()
+
+    tm = TournamentManager(db_session=session, minio_client=None)
+    assert await tm.create_all_games(tournament1.id) == 10
+
+    result = await session.execute(select(GameModel).where(GameModel.tournament_id == tournament1.id))
+    games = result.scalars().all()
+    team_ids = [team.id for team in teams]
+    assert sorted((g.left_team_id, g.right_team_id) for g in games) == \
+        [(team_ids[i], team_ids[j]) for i in range(5) for j in range(i + 1, 5)]
+    assert all(g.status == GameStatusEnum.PENDING and g.left_score == 0 and g.runner_id is None for g in games)
+    # a single team has no opponent
+    assert await tm.create_all_games(tournament2.id) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_tournaments_counts():
+    session = await get_db_session()
+    user_model = await add_user_to_db(session, "U1", "123456")
+    tournament1 = await add_tournament_to_db(session, user_model.id, "T1", now(), now(), now(), TournamentStatus.IN_PROGRESS)
+    await add_tournament_to_db(session, user_model.id, "T2", now(), now(), now(), TournamentStatus.REGISTRATION)
+    teams = [await add_team_to_db(session, user_model.id, f"T{i}", tournament1) for i in range(3)]
+    await add_game_to_db(session, tournament1.id, teams[0].id, teams[1].id, GameStatusEnum.FINISHED)
+    await add_game_to_db(session, tournament1.id, teams[0].id, teams[2].id, GameStatusEnum.FINISHED)
+    await add_game_to_db(session, tournament1.id, teams[1].id, teams[2].id, GameStatusEnum.RUNNING)
+
+    session.expunge_all()
+
+    tm = TournamentManager(db_session=session, minio_client=None)
+    response = await tm.get_tournaments()
+
+    assert [(t.tournament_name, t.status, t.team_count, t.game_count, t.finished_game_count)
+            for t in response.tournaments] == [("T1", TournamentStatus.IN_PROGRESS, 3, 3, 2),
+                                               ("T2", TournamentStatus.REGISTRATION, 0, 0, 0)]
+
+
+
+@pytest.mark.asyncio
+async def test_get_tournaments_filters_and_pages():
+    session = await get_db_session()
+    user1 = await add_user_to_db(session, "U1", "123456")
+    user2 = await add_user_to_db(session, "U2", "654321")
+    start = now()
+    for i in range(4):
+        await add_tournament_to_db(session, user1.id, f"A{i}", start + timedelta(days=i), start, start,
+                                   TournamentStatus.IN_PROGRESS if i % 2 else TournamentStatus.REGISTRATION)
+    await add_tournament_to_db(session, user2.id, "B0", start, start, start, TournamentStatus.IN_PROGRESS)
+    session.expunge_all()
+
+    tm = TournamentManager(db_session=session, minio_client=None)
+    response = await tm.get_tournaments(GetTournamentsRequestMessage(status=TournamentStatus.IN_PROGRESS))
+    assert [t.tournament_name for t in response.tournaments] == ["A1", "A3", "B0"]
+    response = await tm.get_tournaments(GetTournamentsRequestMessage(owner_id=user1.id, start_from=start + timedelta(days=1),
+                                                                     start_to=start + timedelta(days=3)))
+    assert [t.tournament_name for t in response.tournaments] == ["A1", "A2"]
+
+    names = []
+    request = GetTournamentsRequestMessage(limit=2)
+    while True:
+        response = await tm.get_tournaments(request)
+        names += [t.tournament_name for t in response.tournaments]
+        if response.next_cursor is None:
+            break
+        request = GetTournamentsRequestMessage(limit=2, cursor=response.next_cursor)
+    assert names == ["A0", "A1", "A2", "A3", "B0"]
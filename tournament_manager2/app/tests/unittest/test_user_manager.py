@@ -4,7 +4,7 @@ from sqlalchemy.orm import sessionmaker
 from models.base import Base
 from managers.user_manager import UserManager
 from models import TournamentModel, UserModel
-from utils.messages import AddUserRequestMessage, GetUserRequestMessage, ResponseMessage
+from utils.messages import AddUserRequestMessage, GetUserRequestMessage, PageRequestMessage, ResponseMessage
 from pytest import raises
 from sqlalchemy import select, exists, and_
 from tests.db_utils import add_user_to_db, get_db_session
@@ -212,4 +212,25 @@ async def test_get_users2():
     assert len(users.users) == 2
     assert users.users[0].user_name == "Test User"
     assert users.users[1].user_name == "Test User2"
-        
\ No newline at end of file
+        
+
+
+@pytest.mark.asyncio
+async def test_get_users_pages():
+    session = await get_db_session()
+    for i in range(5):
+        await add_user_to_db(session, f"User{i}", f"code{i}")
+    session.expire_all()
+
+    user_manager = UserManager(db_session=session)
+    names = []
+    cursor = None
+    for _ in range(3):
+        users = await user_manager.get_users(PageRequestMessage(limit=2, cursor=cursor))
+        names.append([user.user_name for user in users.users])
+        cursor = users.next_cursor
+    assert names == [["User0", "User1"], ["User2", "User3"], ["User4"]]
+    assert cursor is None
+
+    with raises(ValueError):
+        await user_manager.get_users(PageRequestMessage(cursor="not a cursor"))
@@ -20,6 +20,7 @@ class LogLevelMessageEnum(str, Enum):
 class RunnerStatusMessageEnum(str, Enum): # used by runner_manager.py and runner_model.py
     RUNNING = 'running'
     PAUSED = 'paused'
+    DRAINING = 'draining'
     STOPPED = 'stopped'
     UNKNOWN = 'unknown'
     CRASHED = 'crashed'
@@ -28,6 +29,7 @@ class RunnerCommandMessageEnum(str, Enum): # used by send_command for runners
     RESUME = 'resume'
     PAUSE = 'pause'
     STOP = 'stop'
+    DRAIN = 'drain'
     HELLO = 'hello'
     NONE = 'none'
 
@@ -98,6 +100,7 @@ class GameFinishedMessage(BaseModel):
     right_penalty: Optional[int] = Field(None, example=-1)
     runner_id: Optional[int] = Field(None, example=1)
     success: bool = Field(None, example=True)
+    error: Optional[str] = Field(None, example="")
 
 class GetGamesResponse(BaseModel):
     games: list[GameFinishedMessage] = Field(None, example=[{"game_id": 1, "status": "starting", "port": 12345}])
@@ -171,9 +174,24 @@ class TournamentSummaryMessage(BaseModel):
     end_registration_at: datetime = Field(None, example="2024-06-30 00:00:00")
     start_at: datetime = Field(None, example="2024-07-01 00:00:00")
     status: str = Field(None, example="pending")
+    team_count: Optional[int] = Field(None, example=16)
+    game_count: Optional[int] = Field(None, example=120)
+    finished_game_count: Optional[int] = Field(None, example=45)
     
+class PageRequestMessage(BaseModel):
+    # keyset pagination of the list endpoints, the limit is clamped by the server
+    limit: Optional[int] = Field(None, ge=1, example=50)
+    cursor: Optional[str] = Field(None, example="WzUwXQ")
+
+class GetTournamentsRequestMessage(PageRequestMessage):
+    status: Optional[str] = Field(None, example="in_progress")
+    owner_id: Optional[int] = Field(None, example=1)
+    start_from: Optional[datetime] = Field(None, example="2024-07-01 00:00:00")
+    start_to: Optional[datetime] = Field(None, example="2024-08-01 00:00:00")
+
 class GetTournamentsResponseMessage(BaseModel):
     tournaments: list[TournamentSummaryMessage] = Field(None, example=[{"tournament_id": 1, "tournament_name": "RoboCup 2024"}])
+    next_cursor: Optional[str] = Field(None, example="WzUwXQ")
     
 class AddTournamentResponseMessage(BaseModel):
     tournament_id: Optional[int] = Field(None, example=1)
@@ -237,8 +255,12 @@ class GetTeamResponseMessage(BaseModel):
     team_config_json: Optional[str] = Field(None, example='"{\"version\":1, \"formation_name\":\"433\"}"')
     team_config_json_encoded: Optional[str] = Field(None, example='{@qq@version@qq@:1@c@@qq@formation_name@qq@:@qq@433@qq@}')
 
+class GetTeamsRequestMessage(PageRequestMessage):
+    user_id: Optional[int] = Field(None, example=1)
+
 class GetTeamsResponseMessage(BaseModel):
     teams: list[TeamMessage] = Field(None, example=[{"team_id": 1, "team_name": "team1", "base_team_name": "cyrus"}])
+    next_cursor: Optional[str] = Field(None, example="WzUwXQ")
     
 class RegisterUserRequestMessage(BaseModel):
     user_code: str = Field(None, example="123456")
@@ -275,6 +297,7 @@ class GetUserResponseMessage(BaseModel):
     
 class GetUsersResponseMessage(BaseModel):
     users: list[GetUserResponseMessage] = Field(None, example=[{"user_id": 1, "user_name": "user1"}])
+    next_cursor: Optional[str] = Field(None, example="WzUwXQ")
         
 class ResponseMessage(BaseModel):
     success: bool = Field(None, example=True)
@@ -292,8 +315,12 @@ class GetRunnerResponseMessage(BaseModel):
     available_games_count: int
     requested_command: Optional[RunnerCommandMessageEnum] = None
 
+class GetAllRunnersRequestMessage(PageRequestMessage):
+    status: Optional[RunnerStatusMessageEnum] = Field(None, example="running")
+
 class GetAllRunnersResponseMessage(BaseModel):
     runners: List[GetRunnerResponseMessage]
+    next_cursor: Optional[str] = None
 
 class RunnerLog(BaseModel):
     log_id: int
@@ -301,8 +328,14 @@ class RunnerLog(BaseModel):
     timestamp: datetime
     log_level: LogLevelMessageEnum
 
+class GetRunnerLogRequestMessage(PageRequestMessage):
+    log_level: Optional[LogLevelMessageEnum] = Field(None, example="ERROR")
+    since: Optional[datetime] = Field(None, example="2024-07-01 00:00:00")
+    until: Optional[datetime] = Field(None, example="2024-07-02 00:00:00")
+
 class GetRunnerLogResponseMessage(BaseModel):
     logs: List[RunnerLog]
+    next_cursor: Optional[str] = None
     
 class SubmitRunnerLog(BaseModel):
     runner_id: int = Field(..., example=1)
@@ -318,7 +351,7 @@ class UpdateTournamentRequestMessage(BaseModel):
 
 class SendCommandRequest(BaseModel):
     runner_ids: Optional[Union[int, List[int]]] = Field(None,examples=[1,2],description="Runner ID (int) or list of runner IDs to send the command to.")
-    command: RunnerCommandMessageEnum = Field(..., examples=['resume', 'pause', 'stop', 'hello'],description="Command to send to the runner.")
+    command: RunnerCommandMessageEnum = Field(..., examples=['resume', 'pause', 'stop', 'drain', 'hello'],description="Command to send to the runner.")
 
 class RequestedCommandToRunnerMessage(BaseModel):
     command: RunnerCommandMessageEnum = Field(..., example="resume", description="Command to be sent to the runner.")
@@ -0,0 +1,44 @@
+import json
+import base64
+from typing import Callable, Optional
+
+
+class Pagination:
+    """
+    Keyset pagination of the list endpoints. A page is read with the key of the last row of the previous page
+    (WHERE key > cursor ORDER BY key LIMIT limit + 1), so every page costs the same indexed range read however
+    deep it is, unlike OFFSET. The cursor given to the client is the key of the last row of the page, encoded,
+    and the limit is clamped to max_limit so the size of a response does not grow with the database.
+    """
+    default_limit = 50
+    max_limit = 500
+
+    @staticmethod
+    def get_limit(limit: Optional[int]) -> int:
+        if limit is None:
+            return Pagination.default_limit
+        return max(1, min(limit, Pagination.max_limit))
+
+    @staticmethod
+    def encode_cursor(*key) -> str:
+        data = json.dumps(list(key), default=str, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str, size: int = 1) -> list:
+        """The key of the cursor, raises ValueError if it is not a cursor of a key of size values."""
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        except Exception:
+            raise ValueError('Invalid cursor')
+        if not isinstance(key, list) or len(key) != size:
+            raise ValueError('Invalid cursor')
+        return key
+
+    @staticmethod
+    def get_page(rows: list, limit: int, get_key: Callable) -> tuple[list, Optional[str]]:
+        # the query reads limit + 1 rows, the extra row tells if there is a next page
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, Pagination.encode_cursor(*get_key(rows[-1]))
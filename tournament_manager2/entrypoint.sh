@@ -20,6 +20,10 @@
 : "${TEAM_CONFIG_BUCKET_NAME:=teamconfig}"
 : "${GAME_LOG_BUCKET_NAME:=gamelog}"
 : "${TMP_GAME_LOG_DIR:=/app/tmp_game_log}"
+: "${GAME_DISPATCH:=queue}"
+: "${RUNNER_API_KEY:=api-key}"
+: "${DB_BUSY_TIMEOUT:=5000}"
+: "${DB_WRITER_MAX_BATCH:=100}"
 
 cd app
 
@@ -41,4 +45,8 @@ exec python -m main \
     --base-team-bucket-name "$BASE_TEAM_BUCKET_NAME" \
     --team-config-bucket-name "$TEAM_CONFIG_BUCKET_NAME" \
     --game-log-bucket-name "$GAME_LOG_BUCKET_NAME" \
-    --tmp-game-log-dir "$TMP_GAME_LOG_DIR"
\ No newline at end of file
+    --tmp-game-log-dir "$TMP_GAME_LOG_DIR" \
+    --game-dispatch "$GAME_DISPATCH" \
+    --runner-api-key "$RUNNER_API_KEY" \
+    --db-busy-timeout "$DB_BUSY_TIMEOUT" \
+    --db-writer-max-batch "$DB_WRITER_MAX_BATCH"
\ No newline at end of file